@@ -0,0 +1,30 @@
+"""add chat_conversations.summary and summary_message_id for bounded chat context
+
+Revision ID: add_chat_summary
+Revises: add_user_reply_voice
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "add_chat_summary"
+down_revision = "add_user_reply_voice"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    cols = [c["name"] for c in inspector.get_columns("chat_conversations")]
+    if "summary" not in cols:
+        op.add_column("chat_conversations", sa.Column("summary", sa.Text(), nullable=True))
+    if "summary_message_id" not in cols:
+        op.add_column("chat_conversations", sa.Column("summary_message_id", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("chat_conversations", "summary_message_id")
+    op.drop_column("chat_conversations", "summary")
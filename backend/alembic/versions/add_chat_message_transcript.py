@@ -0,0 +1,27 @@
+"""add chat_messages.transcript so voice message history keeps its text
+
+Revision ID: add_chat_transcript
+Revises: add_chat_summary
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "add_chat_transcript"
+down_revision = "add_chat_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    cols = [c["name"] for c in inspector.get_columns("chat_messages")]
+    if "transcript" not in cols:
+        op.add_column("chat_messages", sa.Column("transcript", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("chat_messages", "transcript")
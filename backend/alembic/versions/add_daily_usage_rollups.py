@@ -0,0 +1,38 @@
+"""add daily_usage_rollups table for precomputed admin dashboard counts
+
+Revision ID: add_usage_rollups
+Revises: add_chat_transcript
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "add_usage_rollups"
+down_revision = "add_chat_transcript"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if "daily_usage_rollups" not in inspector.get_table_names():
+        op.create_table(
+            "daily_usage_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("metric", sa.String(length=50), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("day", "metric", name="uq_daily_usage_rollups_day_metric"),
+        )
+        op.create_index("ix_daily_usage_rollups_id", "daily_usage_rollups", ["id"])
+        op.create_index("ix_daily_usage_rollups_day", "daily_usage_rollups", ["day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_usage_rollups_day", table_name="daily_usage_rollups")
+    op.drop_index("ix_daily_usage_rollups_id", table_name="daily_usage_rollups")
+    op.drop_table("daily_usage_rollups")
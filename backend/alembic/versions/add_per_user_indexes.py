@@ -0,0 +1,78 @@
+"""add indexes for per-user and per-session lookups
+
+Revision ID: add_per_user_indexes
+Revises: add_usage_rollups
+Create Date: 2026-10-16
+
+Indexes are built (and the superseded ix_tasks_user_id dropped) CONCURRENTLY on
+PostgreSQL so large tables stay writable while the migration runs.
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+revision = "add_per_user_indexes"
+down_revision = "add_usage_rollups"
+branch_labels = None
+depends_on = None
+
+# (table, index name, columns)
+INDEXES = [
+    ("resumes", "ix_resumes_user_id_created_at", ["user_id", "created_at"]),
+    ("cover_letters", "ix_cover_letters_user_id_created_at", ["user_id", "created_at"]),
+    ("tasks", "ix_tasks_user_id_created_at", ["user_id", "created_at"]),
+    ("interview_sessions", "ix_interview_sessions_user_id_created_at", ["user_id", "created_at"]),
+    ("interview_questions", "ix_interview_questions_session_id", ["session_id"]),
+    ("interview_answers", "ix_interview_answers_session_id_question_id", ["session_id", "question_id"]),
+    ("user_performance", "ix_user_performance_user_id", ["user_id"]),
+    ("signatures", "ix_signatures_user_id", ["user_id"]),
+    ("invoices", "ix_invoices_user_id_created_at", ["user_id", "created_at"]),
+    ("comments", "ix_comments_discussion_id", ["discussion_id"]),
+    ("subscriptions", "ix_subscriptions_user_id_is_active", ["user_id", "is_active"]),
+]
+
+# Single-column indexes made redundant by a composite above that leads with the same column
+REDUNDANT_INDEXES = [
+    ("tasks", "ix_tasks_user_id", ["user_id"]),
+]
+
+
+def _existing_indexes(conn, table):
+    inspector = inspect(conn)
+    if table not in inspector.get_table_names():
+        return None
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    concurrently = conn.dialect.name == "postgresql"
+    missing = []
+    for table, name, columns in INDEXES:
+        existing = _existing_indexes(conn, table)
+        if existing is not None and name not in existing:
+            missing.append((table, name, columns))
+    redundant = []
+    for table, name, _ in REDUNDANT_INDEXES:
+        existing = _existing_indexes(conn, table)
+        if existing and name in existing:
+            redundant.append((table, name))
+
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for table, name, columns in missing:
+            op.create_index(name, table, columns, postgresql_concurrently=concurrently)
+        # Only after the composites exist, so lookups never lose their index
+        for table, name in redundant:
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table, name, columns in REDUNDANT_INDEXES:
+        existing = _existing_indexes(conn, table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+    for table, name, _ in reversed(INDEXES):
+        existing = _existing_indexes(conn, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
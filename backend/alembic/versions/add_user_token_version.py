@@ -0,0 +1,30 @@
+"""add users.token_version for revoking all of a user's access tokens
+
+Revision ID: add_user_token_version
+Revises: add_per_user_indexes
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "add_user_token_version"
+down_revision = "add_per_user_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    cols = [c["name"] for c in inspector.get_columns("users")]
+    if "token_version" not in cols:
+        op.add_column(
+            "users",
+            sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
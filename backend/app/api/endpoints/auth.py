@@ -5,15 +5,19 @@ from datetime import timedelta
 
 from app.db.session import get_db
 from app.core.auth import (
-    verify_password, 
+    verify_and_update_password, 
     get_password_hash,
     create_access_token, 
-    get_current_active_user
+    get_current_active_user,
+    oauth2_scheme,
+    revoke_access_token
 )
+from app.core.principal_cache import principal_cache
 from app.core.config import settings
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token, UserLogin, UserUpdate
 from app.services.ai_credits_service import AICreditService
+from app.services.password_hash_service import record_login
 from app.db.utils import db_retry
 
 router = APIRouter()
@@ -45,7 +49,7 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     # Create access token
     access_token = create_access_token(
-        data={"sub": str(db_user.id)},
+        data={"sub": str(db_user.id), "ver": db_user.token_version or 0},
         expires_delta=timedelta(minutes=60*24*7)  # 7 days
     )
     
@@ -86,6 +90,7 @@ def login_json(
         
         # Check if user exists
         if not user:
+            record_login(success=False)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found",
@@ -93,17 +98,24 @@ def login_json(
             )
         
         # Check password
-        if not verify_password(password, user.password):
+        valid, new_hash = verify_and_update_password(password, user.password)
+        if not valid:
+            record_login(success=False)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if new_hash:
+            # Stored hash used an older work factor
+            user.password = new_hash
+            db.commit()
+        record_login(success=True)
         
         
         # Create access token
         access_token = create_access_token(
-            data={"sub": str(user.id)},
+            data={"sub": str(user.id), "ver": user.token_version or 0},
             expires_delta=timedelta(minutes=60*24*7)  # 7 days
         )
         
@@ -152,15 +164,22 @@ def login_form(
     user = db.query(User).filter(User.email == email).first()
     
     # Verify user exists and password is correct
-    if not user or not verify_password(password, user.password):
+    valid, new_hash = verify_and_update_password(password, user.password) if user else (False, None)
+    if not valid:
+        record_login(success=False)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored hash used an older work factor
+        user.password = new_hash
+        db.commit()
+    record_login(success=True)
     # Create access token
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data={"sub": str(user.id), "ver": user.token_version or 0},
         expires_delta=timedelta(minutes=60*24*7)  # 7 days
     )
     
@@ -185,11 +204,22 @@ def login_form(
     }
 
 @router.post("/logout")
-def logout(current_user: User = Depends(get_current_active_user)):
-    """Logout user - client should discard the token"""
+def logout(
+    all_devices: bool = Query(False, description="Also sign out every other session of this user"),
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Logout user - the token is revoked until it expires"""
+    revoke_access_token(token)
+    if all_devices:
+        # Tokens carry the version they were issued with, so bumping it revokes all of them
+        current_user.token_version = (current_user.token_version or 0) + 1
+        db.commit()
+        principal_cache.invalidate(current_user.id)
     return {
         "message": "Successfully logged out",
-        "detail": "Please discard your authentication token"
+        "detail": "Your authentication token has been revoked"
     }
 
 @router.get("/me", response_model=UserResponse)
@@ -215,6 +245,7 @@ def update_current_user_profile(
 
     db.commit()
     db.refresh(current_user)
+    principal_cache.invalidate(current_user.id)
     return current_user
 
 @router.get("/credits")
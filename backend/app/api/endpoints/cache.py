@@ -206,9 +206,8 @@ async def list_cache_keys(
         )
     
     try:
-        keys = cache.redis_client.keys(pattern)
         # Limit to first 100 keys to avoid overwhelming response
-        keys = keys[:100]
+        keys = cache.scan_keys(pattern, limit=100)
         
         key_info = []
         for key in keys:
@@ -3,10 +3,11 @@ import uuid
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request, Form
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app.core.config import settings
 from app.core.auth import get_current_active_user, get_current_user_optional
 from app.models.user import User
@@ -22,9 +23,11 @@ from app.schemas.chat import (
 )
 from anthropic import NotFoundError as AnthropicNotFoundError
 from app.services.claude_chat_service import ClaudeChatService
-from app.services.speech_to_text_service import transcribe_audio
+from app.services.chat_context_service import ChatContextManager
+from app.services.speech_to_text_service import atranscribe_audio, TranscriptionBusyError
 from app.services.text_to_speech_service import TextToSpeechService
 from app.core.auth import create_access_token
+from app.utils.streaming import format_sse, SSE_HEADERS
 from jose import jwt, JWTError
 from datetime import timedelta
 
@@ -50,6 +53,7 @@ def _verify_playback_token(token: str, message_id: int) -> bool:
 
 router = APIRouter()
 claude_service = ClaudeChatService()
+chat_context = ChatContextManager(claude_service)
 
 
 def _title_from_message(text: str, max_len: int = 80) -> str:
@@ -158,16 +162,10 @@ def delete_conversation(
     return None
 
 
-@router.post("/message", response_model=ChatSendResponse)
-@router.post("/message/", response_model=ChatSendResponse)
-def send_message(
-    body: ChatMessageCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-):
+def _start_text_turn(body: ChatMessageCreate, db: Session, current_user: User):
     """
-    Send a text message. If conversation_id is provided, append to that conversation;
-    otherwise create a new conversation.
+    Resolve or create the conversation, persist the user's text message and build the
+    bounded Claude context. Returns (conversation, user_message, claude_messages, summary, is_first_exchange).
     """
     if body.conversation_id:
         convo = (
@@ -199,37 +197,48 @@ def send_message(
     db.commit()
     db.refresh(user_msg)
 
-    # Build message history for Claude; user voice messages have content=URL -> use placeholder
-    existing = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.conversation_id == convo.id)
-        .order_by(ChatMessage.created_at.asc())
-        .all()
-    )
-    claude_messages = [
-        {"role": m.role, "content": "[Voice message]" if (m.role == "user" and m.content.startswith("http")) else m.content}
-        for m in existing
-    ]
+    # Recent messages verbatim plus the rolling summary of older ones
+    claude_messages, summary = chat_context.build(db, convo)
+    is_first_exchange = convo.summary_message_id is None and len(claude_messages) <= 1
+    return convo, user_msg, claude_messages, summary, is_first_exchange
+
+
+def _chat_error_detail(e: Exception) -> str:
+    """Short client-facing message for a failed Claude call"""
+    if isinstance(e, AnthropicNotFoundError):
+        return "Claude model not found. Set CLAUDE_MODEL in backend .env to a valid model (e.g. claude-sonnet-4-6, claude-opus-4-6, claude-haiku-4-5)."
+    detail = str(e)
+    # Keep message short for client; avoid leaking internals
+    if "api_key" in detail.lower() or "auth" in detail.lower():
+        detail = "Invalid or missing chat API key. Check backend .env ANTHROPIC_API_KEY."
+    return f"Chat assistant error: {detail}"
+
+
+@router.post("/message", response_model=ChatSendResponse)
+@router.post("/message/", response_model=ChatSendResponse)
+def send_message(
+    body: ChatMessageCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Send a text message. If conversation_id is provided, append to that conversation;
+    otherwise create a new conversation.
+    """
+    convo, user_msg, claude_messages, summary, is_first_exchange = _start_text_turn(body, db, current_user)
 
     try:
-        assistant_text = claude_service.chat(claude_messages)
+        assistant_text = claude_service.chat(claude_messages, summary=summary)
     except ValueError as e:
         # e.g. ANTHROPIC_API_KEY not set
         logger.warning("Chat config: %s", e)
         raise HTTPException(status_code=503, detail=str(e))
     except AnthropicNotFoundError as e:
         logger.warning("Claude model not found: %s", e)
-        raise HTTPException(
-            status_code=502,
-            detail="Claude model not found. Set CLAUDE_MODEL in backend .env to a valid model (e.g. claude-sonnet-4-6, claude-opus-4-6, claude-haiku-4-5).",
-        )
+        raise HTTPException(status_code=502, detail=_chat_error_detail(e))
     except Exception as e:
         logger.exception("Claude chat failed")
-        detail = str(e)
-        # Keep message short for client; avoid leaking internals
-        if "api_key" in detail.lower() or "auth" in detail.lower():
-            detail = "Invalid or missing chat API key. Check backend .env ANTHROPIC_API_KEY."
-        raise HTTPException(status_code=502, detail=f"Chat assistant error: {detail}")
+        raise HTTPException(status_code=502, detail=_chat_error_detail(e))
 
     assistant_msg = ChatMessage(
         conversation_id=convo.id,
@@ -238,7 +247,7 @@ def send_message(
     )
     db.add(assistant_msg)
     # Update conversation title if it's still the default and this is first exchange
-    if convo.title == "New Chat" and len(existing) <= 1:
+    if convo.title == "New Chat" and is_first_exchange:
         convo.title = _title_from_message(body.message)
     db.commit()
     db.refresh(assistant_msg)
@@ -251,6 +260,79 @@ def send_message(
     )
 
 
+def _save_assistant_message(conversation_id: int, text: str, title: Optional[str]) -> ChatMessageResponse:
+    """Persist a streamed assistant reply with its own session (the request session is closed by then)"""
+    db = SessionLocal()
+    try:
+        assistant_msg = ChatMessage(
+            conversation_id=conversation_id,
+            role="assistant",
+            content=text,
+        )
+        db.add(assistant_msg)
+        if title:
+            convo = db.query(ChatConversation).filter(ChatConversation.id == conversation_id).first()
+            if convo and convo.title == "New Chat":
+                convo.title = title
+        db.commit()
+        db.refresh(assistant_msg)
+        return ChatMessageResponse.model_validate(assistant_msg)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@router.post("/message/stream")
+@router.post("/message/stream/")
+def send_message_stream(
+    body: ChatMessageCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Send a text message and stream the assistant's reply as server-sent events.
+    Events: "start" (conversation_id and the saved user message), "delta" (text as it
+    arrives), "done" (the saved assistant message) and "error".
+    The reply is generated on the event loop with the async Claude client and saved once complete.
+    """
+    try:
+        # Fail fast with a proper status code if chat is not configured
+        claude_service._get_async_client()
+    except (ValueError, ImportError) as e:
+        logger.warning("Chat config: %s", e)
+        raise HTTPException(status_code=503, detail=str(e))
+
+    convo, user_msg, claude_messages, summary, is_first_exchange = _start_text_turn(body, db, current_user)
+    conversation_id = convo.id
+    user_message = ChatMessageResponse.model_validate(user_msg)
+    title = _title_from_message(body.message) if is_first_exchange else None
+
+    async def event_stream():
+        yield format_sse("start", {
+            "conversation_id": conversation_id,
+            "user_message": user_message.model_dump(mode="json"),
+        })
+        chunks = []
+        try:
+            async for text in claude_service.astream_chat(claude_messages, summary=summary):
+                chunks.append(text)
+                yield format_sse("delta", {"text": text})
+            assistant_message = await run_in_threadpool(
+                _save_assistant_message, conversation_id, "".join(chunks), title
+            )
+            yield format_sse("done", {
+                "conversation_id": conversation_id,
+                "assistant_message": assistant_message.model_dump(mode="json"),
+            })
+        except Exception as e:
+            logger.exception("Claude chat stream failed")
+            yield format_sse("error", {"detail": _chat_error_detail(e)})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 def _get_message_and_verify_access(
     message_id: int, db: Session, user: User
 ) -> ChatMessage:
@@ -354,7 +436,11 @@ async def send_audio(
         raise HTTPException(status_code=400, detail="Empty audio file")
 
     try:
-        transcribed_text = transcribe_audio(raw, filename=audio.filename)
+        # Runs on the shared whisper pool so the event loop keeps serving other requests
+        transcribed_text = await atranscribe_audio(raw, filename=audio.filename)
+    except TranscriptionBusyError as e:
+        logger.warning("Transcription pool saturated: %s", e)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.exception("Transcription failed")
         raise HTTPException(status_code=502, detail=f"Transcription error: {str(e)}")
@@ -371,13 +457,13 @@ async def send_audio(
             if storage:
                 key = f"chat_audio/{uuid.uuid4().hex}.webm"
                 try:
-                    audio_s3_url = storage.upload_file_content(
-                        raw, key=key, content_type="audio/webm", public_read=True
+                    audio_s3_url = await run_in_threadpool(
+                        storage.upload_file_content, raw, key=key, content_type="audio/webm", public_read=True
                     )
                 except Exception as acl_err:
                     logger.debug("Upload with public-read failed, storing private: %s", acl_err)
-                    audio_s3_url = storage.upload_file_content(
-                        raw, key=key, content_type="audio/webm", public_read=False
+                    audio_s3_url = await run_in_threadpool(
+                        storage.upload_file_content, raw, key=key, content_type="audio/webm", public_read=False
                     )
         except Exception as e:
             logger.warning("Failed to store voice recording: %s", e)
@@ -406,33 +492,24 @@ async def send_audio(
         db.commit()
         db.refresh(convo)
 
-    # Create user message: role=user, content=audio S3 URL
+    # Create user message: role=user, content=audio S3 URL, transcript kept for later turns
     user_msg = ChatMessage(
         conversation_id=convo.id,
         role="user",
         content=audio_s3_url,
+        transcript=transcribed_text.strip(),
     )
     db.add(user_msg)
     db.commit()
     db.refresh(user_msg)
 
-    # Build Claude history: previous user voice messages (content=URL) -> "[Voice message]"; current turn -> transcribed text
-    existing = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.conversation_id == convo.id)
-        .order_by(ChatMessage.created_at.asc())
-        .all()
-    )
-    claude_messages = []
-    for i, m in enumerate(existing):
-        if m.role == "user" and m.content.strip().startswith("http"):
-            content_for_claude = transcribed_text.strip() if (i == len(existing) - 1) else "[Voice message]"
-        else:
-            content_for_claude = m.content
-        claude_messages.append({"role": m.role, "content": content_for_claude})
+    # Build Claude context: user voice messages (content=URL) -> their stored transcript.
+    # Building may compact history with a summarize call, so it runs off the event loop like the chat call
+    claude_messages, summary = await run_in_threadpool(chat_context.build, db, convo)
+    is_first_exchange = convo.summary_message_id is None and len(claude_messages) <= 1
 
     try:
-        assistant_text = claude_service.chat(claude_messages)
+        assistant_text = await run_in_threadpool(claude_service.chat, claude_messages, summary=summary)
     except ValueError as e:
         logger.warning("Chat config: %s", e)
         raise HTTPException(status_code=503, detail=str(e))
@@ -453,24 +530,23 @@ async def send_audio(
     if assistant_text and settings.USE_S3_STORAGE:
         voice = (getattr(current_user, "reply_voice", None) or "male").strip().lower()
         polly_voice = CHAT_RESPONSE_VOICE_MALE if voice == "male" else CHAT_RESPONSE_VOICE_FEMALE
-        text_for_tts = assistant_text[:3000] if len(assistant_text) > 3000 else assistant_text
         try:
             tts_service = TextToSpeechService()
             audio_bytes = await tts_service.synthesize_speech(
-                text_for_tts, lang="en", voice_id=polly_voice
+                assistant_text, lang="en", voice_id=polly_voice
             )
             from app.utils.storage import get_storage
             storage = get_storage()
             if storage and audio_bytes:
                 key = f"chat_audio/assistant_{uuid.uuid4().hex}.mp3"
                 try:
-                    assistant_audio_url = storage.upload_file_content(
-                        audio_bytes, key=key, content_type="audio/mpeg", public_read=True
+                    assistant_audio_url = await run_in_threadpool(
+                        storage.upload_file_content, audio_bytes, key=key, content_type="audio/mpeg", public_read=True
                     )
                 except Exception as acl_err:
                     logger.debug("Upload assistant audio with public-read failed: %s", acl_err)
-                    assistant_audio_url = storage.upload_file_content(
-                        audio_bytes, key=key, content_type="audio/mpeg", public_read=False
+                    assistant_audio_url = await run_in_threadpool(
+                        storage.upload_file_content, audio_bytes, key=key, content_type="audio/mpeg", public_read=False
                     )
         except Exception as e:
             logger.warning("TTS for chat assistant failed (continuing without audio): %s", e)
@@ -482,7 +558,7 @@ async def send_audio(
         audio_url=assistant_audio_url,
     )
     db.add(assistant_msg)
-    if convo.title == "New Chat" and len(existing) <= 1:
+    if convo.title == "New Chat" and is_first_exchange:
         convo.title = _title_from_message(transcribed_text.strip())
     db.commit()
     db.refresh(assistant_msg)
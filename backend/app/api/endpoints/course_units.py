@@ -7,6 +7,7 @@ from app.models.user import User
 from app.models.course_unit import CourseUnit
 from app.schemas.course_unit import CourseUnitCreate, CourseUnitUpdate, CourseUnitResponse
 from app.schemas.pagination import PaginatedResponse
+from app.utils.cache import cache, async_cache, CacheKeys, CacheTags, clear_course_unit_cache
 
 router = APIRouter()
 
@@ -21,6 +22,7 @@ async def create_course_unit(
     db.add(db_unit)
     db.commit()
     db.refresh(db_unit)
+    clear_course_unit_cache()
     return db_unit
 
 @router.get("/", response_model=PaginatedResponse[CourseUnitResponse])
@@ -35,6 +37,14 @@ async def list_course_units(
     db: Session = Depends(get_db)
 ):
     """List all course units with filtering and sorting"""
+    cache_key = cache._generate_key(
+        f"{CacheKeys.UNIT}:list", skip=skip, limit=limit, module_id=module_id,
+        min_points=min_points, max_points=max_points, sort_by=sort_by, order=order
+    )
+    cached_result = await async_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
     query = db.query(CourseUnit)
 
     # Apply filters
@@ -54,12 +64,14 @@ async def list_course_units(
     total = query.count()
     units = query.offset(skip).limit(limit).all()
 
-    return {
+    result = {
         "total": total,
-        "items": units,
+        "items": [CourseUnitResponse.model_validate(unit).model_dump(mode="json") for unit in units],
         "page": skip // limit + 1,
         "size": limit
     }
+    await async_cache.set(cache_key, result, tags=[CacheTags.course_units()])
+    return result
 
 @router.get("/{unit_id}", response_model=CourseUnitResponse)
 async def get_course_unit(
@@ -67,10 +79,17 @@ async def get_course_unit(
     db: Session = Depends(get_db)
 ):
     """Get a specific course unit by ID"""
+    cache_key = f"{CacheKeys.UNIT}:{unit_id}"
+    cached_result = await async_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
     unit = db.query(CourseUnit).filter(CourseUnit.id == unit_id).first()
     if not unit:
         raise HTTPException(status_code=404, detail="Course unit not found")
-    return unit
+    result = CourseUnitResponse.model_validate(unit).model_dump(mode="json")
+    await async_cache.set(cache_key, result, tags=[CacheTags.course_units()])
+    return result
 
 @router.put("/{unit_id}", response_model=CourseUnitResponse)
 async def update_course_unit(
@@ -88,6 +107,7 @@ async def update_course_unit(
     
     db.commit()
     db.refresh(db_unit)
+    clear_course_unit_cache()
     return db_unit
 
 @router.delete("/{unit_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -102,4 +122,5 @@ async def delete_course_unit(
     
     db.delete(db_unit)
     db.commit()
+    clear_course_unit_cache()
     return None
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db, SessionLocal
 from app.core.auth import get_current_active_user
 from app.models.user import User
 from app.models.cover_letter import CoverLetter
@@ -15,16 +18,18 @@ from app.schemas.cover_letter import (
 from app.utils.storage import get_storage
 from app.services.pdf_service import pdf_service
 from app.services.ai_service import ai_service
+from app.services.aws_ai_base import run_until_disconnected
 from app.services.ai_credits_service import AICreditService
 from app.services.subscription_service import SubscriptionService, SubscriptionLimitError
 from app.models.resume import Resume
 from app.utils.data_migration import migrate_cover_letter_data
+from app.utils.streaming import format_sse, SSE_HEADERS
 
 router = APIRouter()
 storage = get_storage()
 
 @router.post("/migrate-data", response_model=CoverLetterMigrationResponse)
-async def migrate_cover_letter_data_endpoint(
+def migrate_cover_letter_data_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -53,12 +58,14 @@ async def migrate_cover_letter_data_endpoint(
 async def get_my_cover_letters(
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all user's cover letters"""
     try:
-        cover_letters = db.query(CoverLetter).filter(CoverLetter.user_id == current_user.id).offset(skip).limit(limit).all()
+        cover_letters = (await db.execute(
+            select(CoverLetter).where(CoverLetter.user_id == current_user.id).offset(skip).limit(limit)
+        )).scalars().all()
         return CoverLetterListResponse(
             success=True,
             data=cover_letters,
@@ -73,15 +80,17 @@ async def get_my_cover_letters(
 @router.get("/{cover_letter_id}", response_model=CoverLetterSingleResponse)
 async def get_cover_letter(
     cover_letter_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific cover letter by ID"""
     try:
-        cover_letter = db.query(CoverLetter).filter(
-            CoverLetter.id == cover_letter_id,
-            CoverLetter.user_id == current_user.id
-        ).first()
+        cover_letter = (await db.execute(
+            select(CoverLetter).where(
+                CoverLetter.id == cover_letter_id,
+                CoverLetter.user_id == current_user.id
+            )
+        )).scalars().first()
         
         if not cover_letter:
             raise HTTPException(
@@ -105,7 +114,7 @@ async def get_cover_letter(
 @router.post("/", response_model=CoverLetterSingleResponse)
 async def create_cover_letter(
     cover_letter_in: CoverLetterCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new cover letter"""
@@ -131,7 +140,7 @@ async def create_cover_letter(
         
         # Check user subscription and limits
         try:
-            SubscriptionService.validate_cover_letter_creation(db, current_user.id)
+            await db.run_sync(SubscriptionService.validate_cover_letter_creation, current_user.id)
         except SubscriptionLimitError as e:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -154,8 +163,8 @@ async def create_cover_letter(
         )
         
         db.add(db_cover_letter)
-        db.commit()
-        db.refresh(db_cover_letter)
+        await db.commit()
+        await db.refresh(db_cover_letter)
         
         return CoverLetterSingleResponse(
             success=True,
@@ -165,7 +174,7 @@ async def create_cover_letter(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating cover letter: {str(e)}"
@@ -175,15 +184,17 @@ async def create_cover_letter(
 async def update_cover_letter(
     cover_letter_id: int,
     cover_letter_in: CoverLetterUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update a cover letter"""
     try:
-        cover_letter = db.query(CoverLetter).filter(
-            CoverLetter.id == cover_letter_id,
-            CoverLetter.user_id == current_user.id
-        ).first()
+        cover_letter = (await db.execute(
+            select(CoverLetter).where(
+                CoverLetter.id == cover_letter_id,
+                CoverLetter.user_id == current_user.id
+            )
+        )).scalars().first()
         
         if not cover_letter:
             raise HTTPException(
@@ -222,8 +233,8 @@ async def update_cover_letter(
         for field, value in update_data.items():
             setattr(cover_letter, field, value)
         
-        db.commit()
-        db.refresh(cover_letter)
+        await db.commit()
+        await db.refresh(cover_letter)
         
         return CoverLetterSingleResponse(
             success=True,
@@ -233,7 +244,7 @@ async def update_cover_letter(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating cover letter: {str(e)}"
@@ -242,15 +253,17 @@ async def update_cover_letter(
 @router.delete("/{cover_letter_id}", response_model=CoverLetterDeleteResponse)
 async def delete_cover_letter(
     cover_letter_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Delete a cover letter"""
     try:
-        cover_letter = db.query(CoverLetter).filter(
-            CoverLetter.id == cover_letter_id,
-            CoverLetter.user_id == current_user.id
-        ).first()
+        cover_letter = (await db.execute(
+            select(CoverLetter).where(
+                CoverLetter.id == cover_letter_id,
+                CoverLetter.user_id == current_user.id
+            )
+        )).scalars().first()
         
         if not cover_letter:
             raise HTTPException(
@@ -266,8 +279,8 @@ async def delete_cover_letter(
                 # Log the error but don't fail the deletion
                 print(f"Warning: Could not delete PDF file {cover_letter.pdf_url}: {e}")
         
-        db.delete(cover_letter)
-        db.commit()
+        await db.delete(cover_letter)
+        await db.commit()
         
         return CoverLetterDeleteResponse(
             success=True,
@@ -277,7 +290,7 @@ async def delete_cover_letter(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting cover letter: {str(e)}"
@@ -345,6 +358,7 @@ async def generate_cover_letter_ai_pdf(
 
 @router.post("/generate-ai", response_model=APIResponse[Dict[str, Any]])
 async def generate_cover_letter_with_ai(
+    request: Request,
     resume_id: int = Query(..., description="Resume ID to use for generating cover letter"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -368,7 +382,11 @@ async def generate_cover_letter_with_ai(
         
         # Generate structured cover letter with AI
         try:
-            cover_letter_data = await ai_service.generate_structured_cover_letter(resume)
+            cover_letter_data = await run_until_disconnected(
+                request, ai_service.generate_structured_cover_letter(resume)
+            )
+        except HTTPException:
+            raise
         except Exception as ai_error:
             # If AI generation fails completely, return a meaningful error
             raise HTTPException(
@@ -418,8 +436,84 @@ async def generate_cover_letter_with_ai(
             detail=f"Error generating cover letter with AI: {str(e)}"
         )
 
+@router.post("/generate-ai/stream")
+async def stream_cover_letter_with_ai(
+    resume_id: int = Query(..., description="Resume ID to use for generating cover letter"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Generate a structured cover letter with AI, streamed as server-sent events.
+    Events: "delta" (raw text), "section" (each top-level field as it completes),
+    "retry" (the text so far was unusable; discard it, generation restarts),
+    "done" (the saved cover letter data, same shape as /generate-ai) and "error".
+    """
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    # Check and deduct AI credits using the service
+    AICreditService.check_and_deduct_credits(db, current_user, 1)
+    user_id = current_user.id
+    # Reload the resume after the credit commit so its fields stay readable once the session closes
+    db.refresh(resume)
+    
+    async def event_stream():
+        try:
+            async for event, data in ai_service.stream_structured_cover_letter(resume):
+                if event != "done":
+                    yield format_sse(event, data)
+                    continue
+                
+                # The request-scoped session is closed once streaming starts, so save with a fresh one
+                stream_db = SessionLocal()
+                try:
+                    cover_letter = CoverLetter(
+                        user_id=user_id,
+                        cover_letter_title=data.get("cover_letter_title", "New Cover Letter"),
+                        cover_letter_type=data.get("cover_letter_type", "general"),
+                        cover_template_category=data.get("cover_template_category", "professional"),
+                        profile=data.get("profile"),
+                        recipient=data.get("recipient"),
+                        introduction=data.get("introduction"),
+                        body=data.get("body"),
+                        closing=data.get("closing"),
+                        cover_style=data.get("cover_style", {"font": "Arial", "color": "#000000"})
+                    )
+                    stream_db.add(cover_letter)
+                    stream_db.commit()
+                except Exception:
+                    stream_db.rollback()
+                    raise
+                finally:
+                    stream_db.close()
+                
+                yield format_sse("done", {
+                    "cover_letter_title": data.get("cover_letter_title"),
+                    "cover_letter_type": data.get("cover_letter_type"),
+                    "cover_template_category": data.get("cover_template_category"),
+                    "profile": data.get("profile"),
+                    "recipient": data.get("recipient"),
+                    "introduction": data.get("introduction"),
+                    "body": data.get("body"),
+                    "closing": data.get("closing")
+                })
+        except Exception as e:
+            print(f"Error streaming cover letter for resume {resume_id}: {str(e)}")
+            yield format_sse("error", {"detail": f"Error generating cover letter with AI: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/{cover_letter_id}/ai-improve", response_model=Dict[str, Any])
 async def improve_cover_letter_with_ai(
+    request: Request,
     cover_letter_id: int,
     section_name: str = Query(..., description="Section to improve: body, introduction, closing, profile, recipient"),
     db: Session = Depends(get_db),
@@ -533,7 +627,9 @@ async def improve_cover_letter_with_ai(
         }
         
         # Improve section with AI
-        improved_content = await ai_service.improve_cover_letter_section(section_name, content_str, cover_letter_data)
+        improved_content = await run_until_disconnected(
+            request, ai_service.improve_cover_letter_section(section_name, content_str, cover_letter_data)
+        )
         
         # Try to parse the improved content as JSON for structured response
         try:
@@ -579,7 +675,7 @@ async def improve_cover_letter_with_ai(
         )
 
 @router.post("/ai-enhance", response_model=Dict[str, Any])
-async def ai_enhance_cover_letter_content(
+def ai_enhance_cover_letter_content(
     request: CoverLetterAIEnhanceRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
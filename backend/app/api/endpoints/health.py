@@ -83,12 +83,20 @@ def detailed_health_check(
     except Exception as e:
         system_status = {"error": str(e)}
     
+    # PDF render pool load
+    try:
+        from app.services.pdf_service import pdf_render_pool
+        pdf_render_status = pdf_render_pool.get_stats()
+    except Exception as e:
+        pdf_render_status = {"error": str(e)}
+    
     return {
         "status": "up",
         "timestamp": datetime.utcnow(),
         "database": db_status,
         "ai_service": ai_status,
-        "system": system_status
+        "system": system_status,
+        "pdf_render": pdf_render_status
     }
 
 @router.get("/health/ai")
@@ -116,11 +124,16 @@ def ai_health_check():
         except:
             test_successful = False
         
+        from app.services.aws_ai_base import bedrock_executor
+        from app.services.bedrock_router import bedrock_router
+        
         return {
             "status": "healthy" if available_models and test_successful else "degraded",
             "message": f"Found {len(available_models)} available models" if available_models else "No models available",
             "available_models": available_models,
             "test_successful": test_successful,
+            "executor": bedrock_executor.get_stats(),
+            "models": bedrock_router.get_stats(),
             "timestamp": datetime.utcnow()
         }
     except Exception as e:
@@ -131,3 +144,18 @@ def ai_health_check():
             "test_successful": False,
             "timestamp": datetime.utcnow()
         }
+
+@router.get("/health/auth")
+def auth_health_check(
+    minutes: int = 15,
+    _: dict = Depends(get_current_admin_user)
+):
+    """Login rate and password hashing pool load (admin only)"""
+    from app.services.password_hash_service import password_hash_pool, get_login_rate
+    
+    return {
+        "status": "up",
+        "logins": get_login_rate(max(1, min(minutes, 60))),
+        "password_hashing": password_hash_pool.get_stats(),
+        "timestamp": datetime.utcnow()
+    }
@@ -6,6 +6,7 @@ from app.db.session import get_db
 from app.models.user import User
 from app.models.module import Module
 from app.schemas.module import ModuleCreate, ModuleUpdate, ModuleResponse
+from app.utils.cache import async_cache, CacheKeys, CacheTags, clear_module_cache
 
 router = APIRouter()
 
@@ -20,6 +21,7 @@ async def create_module(
     db.add(db_module)
     db.commit()
     db.refresh(db_module)
+    clear_module_cache()
     return db_module
 
 @router.get("/", response_model=List[ModuleResponse])
@@ -30,8 +32,15 @@ async def list_modules(
     current_user: User = Depends(get_current_active_user)
 ):
     """List all modules ordered by their order field"""
+    cache_key = f"{CacheKeys.MODULE}:list:skip:{skip}:limit:{limit}"
+    cached_result = await async_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
     modules = db.query(Module).order_by(Module.order.asc()).offset(skip).limit(limit).all()
-    return modules
+    result = [ModuleResponse.model_validate(module).model_dump(mode="json") for module in modules]
+    await async_cache.set(cache_key, result, tags=[CacheTags.modules()])
+    return result
 
 @router.get("/{module_id}", response_model=ModuleResponse)
 async def get_module(
@@ -40,10 +49,17 @@ async def get_module(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific module by ID"""
+    cache_key = f"{CacheKeys.MODULE}:{module_id}"
+    cached_result = await async_cache.get(cache_key)
+    if cached_result is not None:
+        return cached_result
+    
     module = db.query(Module).filter(Module.id == module_id).first()
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
-    return module
+    result = ModuleResponse.model_validate(module).model_dump(mode="json")
+    await async_cache.set(cache_key, result, tags=[CacheTags.modules()])
+    return result
 
 @router.put("/{module_id}", response_model=ModuleResponse)
 async def update_module(
@@ -62,6 +78,7 @@ async def update_module(
     
     db.commit()
     db.refresh(db_module)
+    clear_module_cache()
     return db_module
 
 @router.delete("/{module_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -77,4 +94,5 @@ async def delete_module(
     
     db.delete(db_module)
     db.commit()
+    clear_module_cache()
     return None
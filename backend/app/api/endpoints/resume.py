@@ -1,19 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body, Request
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Body, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any, Union
+import asyncio
 import json
 import uuid
 from pathlib import Path
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.core.auth import get_current_active_user
 from app.models.user import User
 from app.models.resume import Resume
 from app.schemas.resume import ResumeCreate, ResumeUpdate, ResumeResponse, ResumeDataCreate, PDFGenerationRequest, PDFGenerationResponse, AIEnhanceRequest
 from app.utils.storage import get_storage
-from app.utils.cache import cache, CacheKeys, clear_resume_cache
+from app.utils.cache import async_cache, CacheKeys, CacheTags, clear_resume_cache, clear_user_resume_list_cache
+from app.utils.streaming import format_sse, SSE_HEADERS
 from app.services.pdf_service import pdf_service
 from app.services.ai_service import ai_service
+from app.services.aws_ai_base import run_until_disconnected
 from app.services.ai_credits_service import AICreditService
 from app.services.subscription_service import SubscriptionService, SubscriptionLimitError
 from app.core.config import settings
@@ -29,23 +35,33 @@ def get_user_resumes_cache_key(user_id: int, skip: int, limit: int, nested: bool
     """Generate cache key for user resumes list"""
     return f"{CacheKeys.RESUME}:user:{user_id}:list:skip:{skip}:limit:{limit}:nested:{nested}"
 
+def get_resume_sections_for_ai(resume: Resume) -> Dict[str, Any]:
+    """Collect the non-empty resume sections sent to the AI for whole-resume improvement"""
+    section_names = [
+        'resume_title', 'profile', 'work_history', 'education', 'skills', 'summary',
+        'hobbies', 'certifications', 'languages', 'achievements', 'references', 'publications'
+    ]
+    return {name: getattr(resume, name) for name in section_names if getattr(resume, name)}
+
 @router.get("/", response_model=List[Dict[str, Any]])
 async def get_my_resumes(
     skip: int = 0,
     limit: int = 10,
     nested: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all user's resumes. Use ?nested=true for nested structure (default is flat)"""
     # Try to get from cache first
     cache_key = get_user_resumes_cache_key(current_user.id, skip, limit, nested)
-    cached_result = cache.get(cache_key)
+    cached_result = await async_cache.get(cache_key)
     if cached_result is not None:
         return cached_result
     
     # Get from database
-    resumes = db.query(Resume).filter(Resume.user_id == current_user.id).offset(skip).limit(limit).all()
+    resumes = (await db.execute(
+        select(Resume).where(Resume.user_id == current_user.id).offset(skip).limit(limit)
+    )).scalars().all()
     
     if nested:
         result = resumes
@@ -53,7 +69,10 @@ async def get_my_resumes(
         result = [format_structured_response(resume) for resume in resumes]
     
     # Cache the result
-    cache.set(cache_key, result, settings.CACHE_RESUME_TTL)
+    await async_cache.set(
+        cache_key, result, settings.CACHE_RESUME_TTL,
+        tags=[CacheTags.resume_list(current_user.id), CacheTags.user(current_user.id)]
+    )
     
     return result
 
@@ -61,21 +80,23 @@ async def get_my_resumes(
 async def get_resume(
     resume_id: int,
     nested: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific resume by ID. Use ?nested=true for nested structure (default is flat)"""
     # Try to get from cache first
     cache_key = get_resume_cache_key(resume_id, current_user.id, nested)
-    cached_result = cache.get(cache_key)
+    cached_result = await async_cache.get(cache_key)
     if cached_result is not None:
         return cached_result
     
     # Get from database
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    resume = (await db.execute(
+        select(Resume).where(
+            Resume.id == resume_id,
+            Resume.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not resume:
         raise HTTPException(
@@ -89,7 +110,10 @@ async def get_resume(
         result = format_structured_response(resume)
     
     # Cache the result
-    cache.set(cache_key, result, settings.CACHE_RESUME_TTL)
+    await async_cache.set(
+        cache_key, result, settings.CACHE_RESUME_TTL,
+        tags=[CacheTags.resume(resume_id), CacheTags.user(current_user.id)]
+    )
     
     return result
 
@@ -272,12 +296,12 @@ async def create_resume(
     db.refresh(db_resume)
     
     # Clear user's resume list cache
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    clear_user_resume_list_cache(current_user.id)
     
     return format_structured_response(db_resume)
 
 @router.post("/json", response_model=Dict[str, Any])
-async def create_resume_json(
+def create_resume_json(
     resume_data: ResumeDataCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -364,7 +388,7 @@ async def create_resume_json(
     db.refresh(db_resume)
     
     # Clear user's resume list cache
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    clear_user_resume_list_cache(current_user.id)
     
     return format_structured_response(db_resume)
 
@@ -505,22 +529,29 @@ async def create_resume_with_upload(
     db.refresh(db_resume)
     
     # Clear user's resume list cache
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    clear_user_resume_list_cache(current_user.id)
     
     return format_structured_response(db_resume)
 
+async def _aclear_resume_caches(resume_id: int, user_id: int):
+    """clear_resume_cache plus clear_user_resume_list_cache for the AsyncSession routes, without blocking the loop"""
+    await async_cache.delete(f"{CacheKeys.RESUME}:{resume_id}")
+    await async_cache.invalidate_tags(CacheTags.resume(resume_id), CacheTags.resume_list(user_id))
+
 @router.put("/{resume_id}", response_model=ResumeResponse)
 async def update_resume(
     resume_id: int,
     resume_in: ResumeUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update a resume"""
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    resume = (await db.execute(
+        select(Resume).where(
+            Resume.id == resume_id,
+            Resume.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not resume:
         raise HTTPException(
@@ -532,26 +563,27 @@ async def update_resume(
     for field, value in resume_in.dict(exclude_unset=True).items():
         setattr(resume, field, value)
     
-    db.commit()
-    db.refresh(resume)
+    await db.commit()
+    await db.refresh(resume)
     
-    # Clear cache for this resume
-    clear_resume_cache(resume_id)
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    # Clear cache for this resume and user's resume list
+    await _aclear_resume_caches(resume_id, current_user.id)
     
     return resume
 
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_resume(
     resume_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Delete a resume"""
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    resume = (await db.execute(
+        select(Resume).where(
+            Resume.id == resume_id,
+            Resume.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not resume:
         raise HTTPException(
@@ -561,14 +593,13 @@ async def delete_resume(
     
     # Delete PDF if exists
     if resume.pdf_url:
-        storage.delete_file(resume.pdf_url)
+        await asyncio.to_thread(storage.delete_file, resume.pdf_url)
     
-    db.delete(resume)
-    db.commit()
+    await db.delete(resume)
+    await db.commit()
     
     # Clear cache for this resume and user's resume list
-    clear_resume_cache(resume_id)
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    await _aclear_resume_caches(resume_id, current_user.id)
     
     return None
 
@@ -638,6 +669,7 @@ async def generate_resume_ai_pdf(
 
 @router.post("/{resume_id}/ai-improve", response_model=Dict[str, Any])
 async def improve_resume_with_ai(
+    request: Request,
     resume_id: int,
     section_name: str,
     db: Session = Depends(get_db),
@@ -767,7 +799,9 @@ async def improve_resume_with_ai(
             content_str = str(section_content)
         
         # Improve section with AI
-        improved_content = await ai_service.improve_resume_section(section_name, content_str)
+        improved_content = await run_until_disconnected(
+            request, ai_service.improve_resume_section(section_name, content_str)
+        )
         
         # Try to parse the improved content as JSON for structured response
         try:
@@ -808,6 +842,7 @@ async def improve_resume_with_ai(
 
 @router.post("/{resume_id}/ai-improve-all", response_model=Dict[str, Any])
 async def improve_entire_resume_with_ai(
+    request: Request,
     resume_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -829,33 +864,7 @@ async def improve_entire_resume_with_ai(
         AICreditService.check_and_deduct_credits(db, current_user, 5)
         
         # Prepare resume data for improvement
-        resume_dict = {}
-        
-        # Add non-null fields to the dictionary
-        if resume.resume_title:
-            resume_dict['resume_title'] = resume.resume_title
-        if resume.profile:
-            resume_dict['profile'] = resume.profile
-        if resume.work_history:
-            resume_dict['work_history'] = resume.work_history
-        if resume.education:
-            resume_dict['education'] = resume.education
-        if resume.skills:
-            resume_dict['skills'] = resume.skills
-        if resume.summary:
-            resume_dict['summary'] = resume.summary
-        if resume.hobbies:
-            resume_dict['hobbies'] = resume.hobbies
-        if resume.certifications:
-            resume_dict['certifications'] = resume.certifications
-        if resume.languages:
-            resume_dict['languages'] = resume.languages
-        if resume.achievements:
-            resume_dict['achievements'] = resume.achievements
-        if resume.references:
-            resume_dict['references'] = resume.references
-        if resume.publications:
-            resume_dict['publications'] = resume.publications
+        resume_dict = get_resume_sections_for_ai(resume)
         
         # Log what we're sending for debugging
         print(f"Sending resume data with sections: {list(resume_dict.keys())}")
@@ -875,7 +884,11 @@ async def improve_entire_resume_with_ai(
         
         # Improve entire resume with AI
         try:
-            improved_content = await ai_service.improve_entire_resume(resume_dict)
+            improved_content = await run_until_disconnected(
+                request, ai_service.improve_entire_resume(resume_dict)
+            )
+        except HTTPException:
+            raise
         except Exception as ai_error:
             print(f"AI Service Error: {str(ai_error)}")
             print(f"Resume sections being processed: {list(resume_dict.keys())}")
@@ -1089,6 +1102,48 @@ async def improve_entire_resume_with_ai(
             detail=f"Error improving resume with AI: {str(e)}"
         )
 
+@router.post("/{resume_id}/ai-improve-all/stream")
+async def stream_improve_entire_resume_with_ai(
+    resume_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Improve all sections of a resume with AI, streamed as server-sent events.
+    Events: "delta" (raw text), "section" (each improved section as it completes),
+    "done" (full result in the same shape as /ai-improve-all) and "error".
+    """
+    resume = db.query(Resume).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    resume_dict = get_resume_sections_for_ai(resume)
+    if not resume_dict:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No resume content found to improve"
+        )
+    
+    # Check and deduct AI credits (higher cost for full resume improvement)
+    AICreditService.check_and_deduct_credits(db, current_user, 5)
+    
+    async def event_stream():
+        try:
+            async for event, data in ai_service.stream_improve_entire_resume(resume_dict):
+                yield format_sse(event, data)
+        except Exception as e:
+            print(f"Error streaming resume improvement for resume {resume_id}: {str(e)}")
+            yield format_sse("error", {"detail": f"Error improving resume with AI: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/with-upload", response_model=Dict[str, Any])
 async def create_resume_with_upload(
     resume_data: str = Form(...),
@@ -1230,10 +1285,10 @@ async def create_resume_with_upload(
     db.refresh(db_resume)
     
     # Clear user's resume list cache
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    clear_user_resume_list_cache(current_user.id)
     
     return format_structured_response(db_resume)
-async def create_resume_structured(
+def create_resume_structured(
     resume_data: ResumeDataCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -1317,7 +1372,7 @@ async def create_resume_structured(
     db.refresh(db_resume)
     
     # Clear user's resume list cache
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    clear_user_resume_list_cache(current_user.id)
     
     return format_structured_response(db_resume)
 
@@ -1325,14 +1380,16 @@ async def create_resume_structured(
 async def update_resume_structured(
     resume_id: int,
     resume_data: ResumeDataCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update a resume using structured data format"""
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    resume = (await db.execute(
+        select(Resume).where(
+            Resume.id == resume_id,
+            Resume.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not resume:
         raise HTTPException(
@@ -1401,26 +1458,28 @@ async def update_resume_structured(
     resume.languages = languages_data
     resume.custom_section = custom_section_data
     
-    db.commit()
-    db.refresh(resume)
+    await db.commit()
+    await db.refresh(resume)
     
     # Clear cache for this resume
     clear_resume_cache(resume_id)
-    cache.delete_pattern(f"{CacheKeys.RESUME}:user:{current_user.id}:list:*")
+    clear_user_resume_list_cache(current_user.id)
     
     return format_structured_response(resume)
 
 @router.get("/{resume_id}/structured", response_model=Dict[str, Any])
 async def get_resume_structured(
     resume_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific resume in structured format with flat structure"""
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    resume = (await db.execute(
+        select(Resume).where(
+            Resume.id == resume_id,
+            Resume.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not resume:
         raise HTTPException(
@@ -1433,14 +1492,16 @@ async def get_resume_structured(
 @router.get("/{resume_id}/flat", response_model=Dict[str, Any])
 async def get_resume_flat(
     resume_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get a specific resume in flat structure format"""
-    resume = db.query(Resume).filter(
-        Resume.id == resume_id,
-        Resume.user_id == current_user.id
-    ).first()
+    resume = (await db.execute(
+        select(Resume).where(
+            Resume.id == resume_id,
+            Resume.user_id == current_user.id
+        )
+    )).scalars().first()
     
     if not resume:
         raise HTTPException(
@@ -1450,13 +1511,77 @@ async def get_resume_flat(
     
     return format_structured_response(resume)
 
+def build_ai_enhance_prompt(section: str, profession: str, job_description: str) -> str:
+    """Build the /ai-enhance prompt for a single resume section"""
+    section_lower = section.lower()
+    
+    if section_lower == "summary":
+        return f"""
+        Create a professional resume summary for a {profession} based on this job description:
+        
+        Job Description: {job_description}
+        
+        Generate a compelling 2-3 sentence professional summary that:
+        - Highlights relevant experience and skills for this role
+        - Demonstrates value to potential employers
+        - Uses industry-specific keywords from the job description
+        - Shows enthusiasm and expertise
+        
+        Return only the summary text, no formatting, no markdown, no additional text.
+        """
+    elif section_lower == "skills":
+        return f"""
+        Generate a comprehensive list of relevant skills for a {profession} based on this job description:
+        
+        Job Description: {job_description}
+        
+        Create a list of 8-12 skills that include:
+        - Technical skills mentioned in the job description
+        - Industry-standard tools and technologies
+        - Soft skills relevant to the role
+        - Programming languages, frameworks, or software relevant to {profession}
+        
+        Return as a JSON array of strings, for example: ["React.js", "Node.js", "Python", "AWS", "REST APIs"]
+        Return only the JSON array, no markdown, no code blocks, no additional text.
+        """
+    elif section_lower == "experience":
+        return f"""
+        Generate 3-4 professional work experience bullet points for a {profession} based on this job description:
+        
+        Job Description: {job_description}
+        
+        Create realistic work experience examples that:
+        - Show progression and growth in the field
+        - Include quantifiable achievements and metrics
+        - Use strong action verbs
+        - Demonstrate skills mentioned in the job description
+        - Are specific and measurable (include percentages, numbers, timeframes)
+        
+        Return as a JSON array of strings, for example: ["Achievement 1 with 30% improvement", "Led team of 5 developers", "Implemented system that reduced costs by $50K"]
+        Return only the JSON array, no markdown, no code blocks, no additional text.
+        """
+    
+    # For other sections, provide a generic enhancement
+    return f"""
+    Generate professional {section} content for a {profession} resume based on this job description:
+    
+    Job Description: {job_description}
+    
+    Create relevant, professional {section} content that would be appropriate for this role.
+    Return only the content, no markdown, no code blocks, no additional formatting or explanation.
+    """
+
 @router.post("/ai-enhance", response_model=Dict[str, Any])
 async def ai_enhance_resume_content(
     request: AIEnhanceRequest,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Generate AI-enhanced resume content based on profession and job description without needing a stored resume"""
+    """
+    Generate AI-enhanced resume content based on profession and job description without needing a stored resume.
+    Sections that fail are left out of the response, listed in the X-Failed-Sections header and not charged.
+    """
     try:
         # Extract request parameters
         profession = request.profession
@@ -1482,30 +1607,30 @@ async def ai_enhance_resume_content(
                 detail="Sections must be a non-empty list"
             )
         
-        # Check and deduct AI credits
-        AICreditService.check_and_deduct_credits(db, current_user, len(sections))
+        # Send the independent section prompts concurrently; latency tracks the slowest section
+        prompts = {
+            section: build_ai_enhance_prompt(section, profession, job_description)
+            for section in sections
+        }
+        
+        # Check and deduct AI credits (one per distinct section)
+        AICreditService.check_and_deduct_credits(db, current_user, len(prompts))
+        
+        results = await ai_service.agenerate_many(prompts)
         
-        # Generate AI-enhanced content for each requested section
         enhanced_content = {}
+        section_errors = {}
         
-        for section in sections:
+        for section in prompts:
             section_lower = section.lower()
             
+            if isinstance(results[section], BaseException):
+                print(f"AI enhancement failed for section {section}: {str(results[section])}")
+                section_errors[section] = str(results[section])
+                continue
+            
             if section_lower == "summary":
-                prompt = f"""
-                Create a professional resume summary for a {profession} based on this job description:
-                
-                Job Description: {job_description}
-                
-                Generate a compelling 2-3 sentence professional summary that:
-                - Highlights relevant experience and skills for this role
-                - Demonstrates value to potential employers
-                - Uses industry-specific keywords from the job description
-                - Shows enthusiasm and expertise
-                
-                Return only the summary text, no formatting, no markdown, no additional text.
-                """
-                summary_response = ai_service._generate_with_aws(prompt)
+                summary_response = results[section]
                 
                 # Clean the response to remove any markdown or formatting
                 cleaned_summary = summary_response.strip()
@@ -1521,21 +1646,7 @@ async def ai_enhance_resume_content(
                 enhanced_content["summary"] = cleaned_summary
                 
             elif section_lower == "skills":
-                prompt = f"""
-                Generate a comprehensive list of relevant skills for a {profession} based on this job description:
-                
-                Job Description: {job_description}
-                
-                Create a list of 8-12 skills that include:
-                - Technical skills mentioned in the job description
-                - Industry-standard tools and technologies
-                - Soft skills relevant to the role
-                - Programming languages, frameworks, or software relevant to {profession}
-                
-                Return as a JSON array of strings, for example: ["React.js", "Node.js", "Python", "AWS", "REST APIs"]
-                Return only the JSON array, no markdown, no code blocks, no additional text.
-                """
-                skills_response = ai_service._generate_with_aws(prompt)
+                skills_response = results[section]
                 
                 # Clean the response to remove any markdown or formatting
                 cleaned_skills_response = skills_response.strip()
@@ -1585,22 +1696,7 @@ async def ai_enhance_resume_content(
                     enhanced_content["skills"] = fallback_skills if fallback_skills else ["JavaScript", "Python", "React", "Node.js", "API Development", "Database Design", "Problem Solving", "Team Collaboration"]
                 
             elif section_lower == "experience":
-                prompt = f"""
-                Generate 3-4 professional work experience bullet points for a {profession} based on this job description:
-                
-                Job Description: {job_description}
-                
-                Create realistic work experience examples that:
-                - Show progression and growth in the field
-                - Include quantifiable achievements and metrics
-                - Use strong action verbs
-                - Demonstrate skills mentioned in the job description
-                - Are specific and measurable (include percentages, numbers, timeframes)
-                
-                Return as a JSON array of strings, for example: ["Achievement 1 with 30% improvement", "Led team of 5 developers", "Implemented system that reduced costs by $50K"]
-                Return only the JSON array, no markdown, no code blocks, no additional text.
-                """
-                experience_response = ai_service._generate_with_aws(prompt)
+                experience_response = results[section]
                 
                 # Clean the response to remove any markdown or formatting
                 cleaned_experience_response = experience_response.strip()
@@ -1650,16 +1746,7 @@ async def ai_enhance_resume_content(
                     ]
             
             else:
-                # For other sections, provide a generic enhancement
-                prompt = f"""
-                Generate professional {section} content for a {profession} resume based on this job description:
-                
-                Job Description: {job_description}
-                
-                Create relevant, professional {section} content that would be appropriate for this role.
-                Return only the content, no markdown, no code blocks, no additional formatting or explanation.
-                """
-                response = ai_service._generate_with_aws(prompt)
+                response = results[section]
                 
                 # Clean the response
                 cleaned_response = response.strip()
@@ -1674,6 +1761,14 @@ async def ai_enhance_resume_content(
                 
                 enhanced_content[section] = cleaned_response
         
+        if section_errors:
+            AICreditService.refund_credits(db, current_user, len(section_errors))
+            if not enhanced_content:
+                raise Exception(f"All sections failed: {section_errors}")
+            # Return the sections that succeeded; a header reports the ones that did not
+            # without adding a key that could clash with a section name
+            response.headers["X-Failed-Sections"] = ",".join(section_errors)
+        
         return enhanced_content
         
     except HTTPException:
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body, Request, Header
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import json
@@ -10,7 +12,7 @@ import stripe
 
 logger = logging.getLogger(__name__)
 
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db
 from app.core.auth import get_current_active_user
 from app.models.user import User
 from app.models.subscription import Subscription
@@ -50,26 +52,30 @@ if stripe_api_key:
 
 @router.get("/plans", response_model=List[SubscriptionResponse])
 async def get_subscription_plans(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all available subscription plans (templates: stripe_price_id set, no subscription_id)."""
-    plans = db.query(Subscription).filter(
-        Subscription.is_active == True,
-        Subscription.stripe_price_id.isnot(None),
-        Subscription.subscription_id.is_(None),
-    ).all()
+    plans = (await db.execute(
+        select(Subscription).where(
+            Subscription.is_active == True,
+            Subscription.stripe_price_id.isnot(None),
+            Subscription.subscription_id.is_(None),
+        )
+    )).scalars().all()
     return plans
 
 @router.get("/my", response_model=Optional[SubscriptionResponse])
 async def get_my_subscription(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get the current user's subscription"""
-    subscription = db.query(Subscription).filter(
-        Subscription.user_id == current_user.id,
-        Subscription.is_active == True
-    ).first()
+    subscription = (await db.execute(
+        select(Subscription).where(
+            Subscription.user_id == current_user.id,
+            Subscription.is_active == True
+        )
+    )).scalars().first()
     
     if not subscription:
         return None
@@ -77,7 +83,7 @@ async def get_my_subscription(
     return subscription
 
 @router.post("/subscribe", response_model=SubscriptionResponse)
-async def subscribe_to_plan(
+def subscribe_to_plan(
     plan_id: int = Body(...),
     payment_method_id: Optional[str] = Body(None),
     db: Session = Depends(get_db),
@@ -224,7 +230,7 @@ async def subscribe_to_plan(
     return db_subscription
 
 @router.post("/cancel", response_model=SubscriptionResponse)
-async def cancel_subscription(
+def cancel_subscription(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -272,7 +278,7 @@ async def cancel_subscription(
 
 
 @router.post("/create-checkout-session")
-async def create_checkout_session(
+def create_checkout_session(
     plan_id: int = Body(..., embed=True),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -319,7 +325,7 @@ async def create_checkout_session(
 
 
 @router.post("/portal-session")
-async def create_portal_session(
+def create_portal_session(
     return_url: Optional[str] = Body(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -585,7 +591,7 @@ async def handle_stripe_webhook(
 # Admin endpoints
 
 @router.get("/admin/user-subscriptions", response_model=AdminUserSubscriptionsResponse)
-async def get_user_subscriptions(
+def get_user_subscriptions(
     page: int = 1,
     limit: int = 10,
     search: Optional[str] = None,
@@ -713,7 +719,7 @@ async def get_user_subscriptions(
     )
 
 @router.post("/admin/plans", response_model=SubscriptionResponse)
-async def create_plan(
+def create_plan(
     plan_in: SubscriptionCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -736,7 +742,7 @@ async def create_plan(
     return db_plan
 
 @router.put("/admin/plans/{plan_id}", response_model=SubscriptionResponse)
-async def update_plan(
+def update_plan(
     plan_id: int,
     plan_in: SubscriptionUpdate,
     db: Session = Depends(get_db),
@@ -768,12 +774,12 @@ async def update_plan(
 
 @router.get("/usage")
 async def get_subscription_usage(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get current user's subscription usage and limits"""
     try:
-        usage_summary = SubscriptionService.get_usage_summary(db, current_user.id)
+        usage_summary = await db.run_sync(SubscriptionService.get_usage_summary, current_user.id)
         return usage_summary
     except Exception as e:
         raise HTTPException(
@@ -783,12 +789,12 @@ async def get_subscription_usage(
 
 @router.get("/can-create-resume")
 async def can_create_resume(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Check if user can create a new resume"""
     try:
-        can_create = SubscriptionService.check_resume_limit(db, current_user.id)
+        can_create = await db.run_sync(SubscriptionService.check_resume_limit, current_user.id)
         return {"can_create": can_create}
     except Exception as e:
         raise HTTPException(
@@ -798,12 +804,12 @@ async def can_create_resume(
 
 @router.get("/can-create-cover-letter")
 async def can_create_cover_letter(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Check if user can create a new cover letter"""
     try:
-        can_create = SubscriptionService.check_cover_letter_limit(db, current_user.id)
+        can_create = await db.run_sync(SubscriptionService.check_cover_letter_limit, current_user.id)
         return {"can_create": can_create}
     except Exception as e:
         raise HTTPException(
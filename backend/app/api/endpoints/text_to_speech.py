@@ -1,16 +1,18 @@
 from fastapi import APIRouter, HTTPException, Response, Query, Body, UploadFile, File, Depends
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from pydantic import BaseModel
 import base64
-from sqlalchemy.orm import Session
-from app.services.text_to_speech_service import TextToSpeechService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.text_to_speech_service import TextToSpeechService, polly_voice_catalog
 from app.services.ai_credits_service import AICreditService
 from app.core.auth import get_current_active_user
 from app.models.user import User
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.schemas.text_to_speech import (
     TextToSpeechRequest, 
     TextToSpeechResponse, 
+    SpeechTimestampsResponse,
     AvailableVoicesResponse,
     ErrorResponse
 )
@@ -26,7 +28,7 @@ class LegacyTextToSpeechRequest(BaseModel):
 @router.post("/", response_model=TextToSpeechResponse)
 async def text_to_speech(
     request: TextToSpeechRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -56,7 +58,7 @@ async def text_to_speech(
     """
     try:
         # Check and deduct AI credits (1 credit per text-to-speech request)
-        AICreditService.check_and_deduct_credits(db, current_user, 1)
+        await AICreditService.acheck_and_deduct_credits(db, current_user, 1)
         
         tts_service = TextToSpeechService()
         
@@ -76,12 +78,104 @@ async def text_to_speech(
         # Encode audio as base64
         audio_base64 = base64.b64encode(audio_data).decode('utf-8')
         
-        # Log for debugging
-        print(f"Generated audio: {len(audio_data)} bytes, Base64: {len(audio_base64)} chars")
-        print(f"Audio header: {audio_data[:10].hex() if len(audio_data) >= 10 else 'N/A'}")
+        # Synthesized audio is cached in S3, so clients can also stream it directly
+        audio_url = await tts_service.get_cached_audio_url(
+            text=request.text,
+            lang=request.lang,
+            pitch=request.pitch,
+            rate=request.rate,
+            voice=request.voice
+        )
         
         return TextToSpeechResponse(
             audio=audio_base64,
+            timestamps=timestamps,
+            duration=duration,
+            voice_used=voice_used,
+            language=request.lang,
+            audio_url=audio_url
+        )
+        
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=str(ve))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream")
+async def text_to_speech_stream(
+    request: TextToSpeechRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream MP3 audio as it is synthesized (audio/mpeg, chunked) instead of base64 JSON.
+    Playback can start before synthesis finishes. Word timestamps for the same request
+    body are served by POST /text-to-speech/timestamps.
+    """
+    try:
+        # Check and deduct AI credits (1 credit per text-to-speech request)
+        await AICreditService.acheck_and_deduct_credits(db, current_user, 1)
+        
+        tts_service = TextToSpeechService()
+        audio_stream = tts_service.astream_speech(
+            text=request.text,
+            lang=request.lang,
+            pitch=request.pitch,
+            rate=request.rate,
+            voice=request.voice
+        )
+        
+        # Pull the first chunk here so synthesis errors still become an HTTP error status
+        first_chunk = await audio_stream.__anext__()
+        
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail="No audio data generated")
+    except ValueError as ve:
+        raise HTTPException(status_code=422, detail=str(ve))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def body():
+        yield first_chunk
+        async for chunk in audio_stream:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type="audio/mpeg",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@router.post("/timestamps", response_model=SpeechTimestampsResponse)
+async def text_to_speech_timestamps(
+    request: TextToSpeechRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Word timestamps for the audio returned by POST /text-to-speech/stream with the same body.
+    Served from the TTS cache when available, otherwise requested from Polly (long text is
+    fully synthesized), so it is charged like the other text-to-speech requests.
+    """
+    try:
+        # Check and deduct AI credits (1 credit per text-to-speech request)
+        await AICreditService.acheck_and_deduct_credits(db, current_user, 1)
+        
+        tts_service = TextToSpeechService()
+        timestamps, duration, voice_used = await tts_service.get_speech_timestamps(
+            text=request.text,
+            lang=request.lang,
+            pitch=request.pitch,
+            rate=request.rate,
+            voice=request.voice
+        )
+        
+        return SpeechTimestampsResponse(
             timestamps=timestamps,
             duration=duration,
             voice_used=voice_used,
@@ -90,13 +184,15 @@ async def text_to_speech(
         
     except ValueError as ve:
         raise HTTPException(status_code=422, detail=str(ve))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/audio-file")
 async def text_to_speech_file(
     request: TextToSpeechRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -104,7 +200,7 @@ async def text_to_speech_file(
     """
     try:
         # Check and deduct AI credits (1 credit per text-to-speech request)
-        AICreditService.check_and_deduct_credits(db, current_user, 1)
+        await AICreditService.acheck_and_deduct_credits(db, current_user, 1)
         
         tts_service = TextToSpeechService()
         
@@ -143,8 +239,8 @@ async def get_available_voices(lang: Optional[str] = Query(None, description="Fi
     Get list of available voices, optionally filtered by language.
     """
     try:
-        tts_service = TextToSpeechService()
-        voices = await tts_service.get_available_voices(lang)
+        # Served from the cached voice catalog; no AWS call unless the catalog is cold
+        voices = await polly_voice_catalog.get_voices(lang)
         
         # Convert VoiceInfo objects to dict format for response
         voices_dict = [
@@ -287,13 +383,13 @@ class AdvancedTextToSpeechRequest(BaseModel):
 @router.post("/advanced")
 async def advanced_text_to_speech(
     request: AdvancedTextToSpeechRequest = Body(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Generate speech with advanced controls and custom voice."""
     try:
         # Check and deduct AI credits (1 credit per text-to-speech request)
-        AICreditService.check_and_deduct_credits(db, current_user, 1)
+        await AICreditService.acheck_and_deduct_credits(db, current_user, 1)
         
         tts_service = TextToSpeechService()
         audio_content = await tts_service.synthesize_speech(
@@ -1,27 +1,18 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
 from app.db.session import get_db
 from app.models.user import User
-from app.utils.warnings import with_suppressed_warnings
-
-# Password hashing with warning suppression
-def _create_pwd_context():
-    # Use a simple configuration that doesn't rely on bcrypt's __about__
-    return CryptContext(
-        schemes=["bcrypt"],
-        bcrypt__default_rounds=12,
-        deprecated="auto"
-    )
+from app.services.password_hash_service import PasswordHashBusyError, password_hash_pool
 
-# Create the context with warnings suppressed
-pwd_context = _create_pwd_context()
 # Token URL
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login-form")
 oauth2_scheme_optional = OAuth2PasswordBearer(
@@ -29,13 +20,31 @@ oauth2_scheme_optional = OAuth2PasswordBearer(
     auto_error=False,
 )
 
-@with_suppressed_warnings
+def _hashing_busy(e: PasswordHashBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": "2"},
+    )
+
+def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password on the hashing pool. The second value is a new hash to store when
+    the stored one was made with a different PASSWORD_BCRYPT_ROUNDS.
+    """
+    try:
+        return password_hash_pool.verify_and_update(plain_password, hashed_password)
+    except PasswordHashBusyError as e:
+        raise _hashing_busy(e)
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
 
-@with_suppressed_warnings
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    try:
+        return password_hash_pool.hash(password)
+    except PasswordHashBusyError as e:
+        raise _hashing_busy(e)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -43,25 +52,53 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    # jti identifies the token on the revocation list
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
+def _token_id(token: str, payload: dict) -> str:
+    # Tokens issued before jti was added are identified by their hash
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+def revoke_access_token(token: str):
+    """Put a valid token on the revocation list (logout)"""
+    payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    principal_cache.revoke_token(_token_id(token, payload), payload.get("exp"))
+
+def _resolve_user(db: Session, token: str) -> Optional[User]:
+    """
+    User for a bearer token, or None if the token is invalid, revoked or from an older
+    token version. Served from the principal cache when possible; the users table is
+    only queried on a cache miss.
+    """
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
+        return None
+    token_version = payload.get("ver", 0)
+
+    if principal_cache.is_revoked(_token_id(token, payload)):
+        return None
+
+    cached = principal_cache.get(user_id, token_version)
+    if cached is not None:
+        return principal_cache.to_user(db, cached)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None or (user.token_version or 0) != token_version:
+        return None
+    principal_cache.store(user)
+    return user
+
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _resolve_user(db, token)
     if user is None:
         raise credentials_exception
     return user
@@ -77,15 +114,7 @@ def get_current_user_optional(
     """Return current user if Bearer token is present and valid; else None."""
     if not token:
         return None
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
-            return None
-        user = db.query(User).filter(User.id == user_id).first()
-        return user
-    except JWTError:
-        return None
+    return _resolve_user(db, token)
 
 def get_current_admin_user(current_user: User = Depends(get_current_active_user)):
     if not current_user.is_admin:
@@ -27,10 +27,27 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+    
+    # Async (asyncpg) engine pool; counts against the database connection limit next to the sync pool (10 + 20)
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 10
+    DB_ASYNC_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before failing the request
+    
     # JWT settings - Read from .env
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    # Authenticated-user cache used by get_current_user (per-process copy in front of Redis)
+    AUTH_PRINCIPAL_CACHE_TTL: int = 300  # Redis copy
+    AUTH_PRINCIPAL_LOCAL_TTL: int = 15  # Bounds how long other workers may use a changed profile or a logged-out token
+    AUTH_PRINCIPAL_LOCAL_MAX_ENTRIES: int = 10000
+    # Password hashing (bcrypt in a process pool)
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # Changing it re-hashes each user's password on their next login
+    PASSWORD_HASH_WORKERS: int = 0  # Worker processes (0 = one per CPU core)
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # Calls allowed to wait for a worker before new logins get 503
     # CORS
     CORS_ORIGINS: List[str] = [
         "https://dropshapes.com",
@@ -52,6 +69,12 @@ class Settings(BaseSettings):
     AWS_BEDROCK_MODEL_ID: str = "us.amazon.nova-lite-v1:0"  # Using Nova Lite inference profile (confirmed working)
     AWS_POLLY_VOICE_ID: str = "Joanna"
     AWS_POLLY_LANGUAGE_CODE: str = "en-US"
+    TTS_CHUNK_MAX_CHARS: int = 2500  # Longer text is split at sentence boundaries (Polly allows 3000 per request)
+    TTS_MAX_PARALLEL_CHUNKS: int = 4  # Chunks of one long text synthesized at the same time
+    TTS_STREAM_CHUNK_BYTES: int = 16384  # Size of audio chunks proxied by /text-to-speech/stream
+    TTS_STREAM_CACHE_MAX_BYTES: int = 4194304  # Streamed audio up to this size is also written to the TTS cache
+    POLLY_VOICES_TTL: int = 604800  # Voice catalog kept in Redis for 7 days
+    POLLY_VOICES_REFRESH_INTERVAL: int = 86400  # Older catalogs are served while refreshed in the background
     AWS_COMPREHEND_REGION: str = "us-east-2"
     AWS_TRANSCRIBE_REGION: str = "us-east-2"
     
@@ -59,6 +82,26 @@ class Settings(BaseSettings):
     USE_AWS_AI: bool = True
     AI_PROVIDER: str = "aws"
     
+    # Bedrock execution pool (blocking boto3 calls run off the event loop)
+    BEDROCK_MAX_WORKERS: int = 32  # Threads shared by all Bedrock calls in a worker process
+    BEDROCK_MAX_CONCURRENCY_PER_MODEL: int = 8  # In-flight requests allowed per model id
+    BEDROCK_PROBE_ON_STARTUP: bool = True  # Run the model availability probe in the background at startup
+    BEDROCK_PROBE_TTL: int = 3600  # Seconds a probe result is reused before probing again
+    BEDROCK_PROBE_CACHE_FILE: str = "/tmp/dropshapes_bedrock_models.json"  # Used when Redis is unavailable
+    BEDROCK_SHORT_TASK_MAX_TOKENS: int = 300  # Untyped requests up to this size are routed as short tasks
+    BEDROCK_BREAKER_FAILURE_THRESHOLD: int = 3  # Consecutive failures that open a model's circuit
+    BEDROCK_BREAKER_COOLDOWN: float = 30.0  # Seconds an open circuit waits before a trial request
+    BEDROCK_BREAKER_FATAL_COOLDOWN: float = 600.0  # Cooldown after access-denied/invalid-model errors
+    BEDROCK_ROUTER_EWMA_ALPHA: float = 0.2  # Weight of the newest sample in latency/error averages
+    BEDROCK_ROUTER_LATENCY_SAMPLES: int = 200  # Recent latencies kept per model for percentiles
+    BEDROCK_HEDGE_ENABLED: bool = True  # Send a second request to the next model when the first is slow
+    BEDROCK_HEDGE_PERCENTILE: float = 95.0  # Latency percentile after which a request is hedged
+    BEDROCK_HEDGE_MIN_SAMPLES: int = 20  # Samples needed before hedging kicks in for a model
+    BEDROCK_HEDGE_MIN_DELAY: float = 1.0  # Never hedge sooner than this many seconds
+    AI_FANOUT_MAX_CONCURRENCY: int = 4  # Parallel prompts per request for multi-section generation
+    AI_SINGLE_FLIGHT_LOCK_TTL: int = 120  # Seconds a worker may hold the generation lock for one prompt
+    AI_SINGLE_FLIGHT_POLL_INTERVAL: float = 0.25  # Seconds between cache checks while another worker generates
+    
     # Storage Configuration - Read from .env
     USE_S3_STORAGE: bool = True
     
@@ -71,6 +114,7 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
     REDIS_USE_SSL: bool = False
+    REDIS_ASYNC_MAX_CONNECTIONS: int = 50  # Pool size for the asyncio Redis client
     
     # Cache Configuration
     CACHE_ENABLED: bool = True
@@ -79,6 +123,21 @@ class Settings(BaseSettings):
     CACHE_USER_DATA_TTL: int = 1800  # 30 minutes
     CACHE_RESUME_TTL: int = 3600  # 1 hour
     CACHE_COVER_LETTER_TTL: int = 3600  # 1 hour
+    CACHE_TTS_TTL: int = 2592000  # 30 days; synthesized audio is content-addressed so it never goes stale
+    CACHE_TTS_INLINE_MAX_BYTES: int = 262144  # Audio kept in Redis itself only when S3 storage is disabled
+    
+    # In-process L1 cache in front of Redis (kept coherent across workers via pub/sub)
+    CACHE_L1_ENABLED: bool = False
+    CACHE_L1_MAX_ENTRIES: int = 2048
+    CACHE_L1_TTL: int = 60  # Upper bound on staleness if an invalidation message is missed
+    CACHE_L1_PREFIXES: List[str] = ["resume:", "user:profile:", "module:", "unit:"]
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    
+    # Admin dashboard rollups (daily_usage_rollups table + cached dashboard snapshot)
+    ADMIN_ROLLUP_SCHEDULER_ENABLED: bool = True  # Refresh rollups and the snapshot from a background task
+    ADMIN_ROLLUP_INTERVAL: int = 300  # Seconds between refreshes; only one worker runs each refresh
+    ADMIN_ROLLUP_FULL_INTERVAL: int = 86400  # Seconds between full reconciles that pick up deleted rows
+    ADMIN_DASHBOARD_SNAPSHOT_TTL: int = 900  # Snapshot outlives a few missed refreshes before it is rebuilt on request
     
     # Email Configuration - Read from .env
     EMAIL_USER: str
@@ -101,8 +160,23 @@ class Settings(BaseSettings):
     # Chat Assistant (Claude)
     ANTHROPIC_API_KEY: str = ""
     CLAUDE_MODEL: str = "claude-sonnet-4-6"  # override in .env; alternatives: claude-opus-4-6, claude-haiku-4-5
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 8000  # Approximate input tokens of history sent per turn (excluding system prompt)
+    CHAT_CONTEXT_KEEP_MESSAGES: int = 12  # Most recent messages always sent verbatim
+    CHAT_CONTEXT_COMPACT_BATCH: int = 8  # Older messages folded into the summary at once (keeps the cached prefix stable)
+    CHAT_SUMMARY_MODEL: str = "claude-haiku-4-5"  # Model used to maintain the rolling conversation summary
+    CHAT_SUMMARY_MAX_TOKENS: int = 600
+
+    # Resume PDF rendering (ReportLab in a process pool)
+    PDF_RENDER_WORKERS: int = 2  # Worker processes; each renders one PDF at a time
+    PDF_RENDER_MAX_QUEUE: int = 8  # Renders submitted ahead of a free worker; later callers wait
 
     # Speech-to-text for chat voice input (faster-whisper, local; no API key)
     WHISPER_MODEL_SIZE: str = "base"  # tiny, base, small, medium, large-v2, large-v3
+    WHISPER_WORKERS: int = 2  # Model replicas / concurrent transcriptions per process
+    WHISPER_CPU_THREADS: int = 0  # CPU threads per replica (0 = CTranslate2 default)
+    WHISPER_MAX_QUEUE: int = 8  # Requests allowed to wait for a replica before new ones are rejected
+    WHISPER_BEAM_SIZE: int = 1
+    WHISPER_VAD_FILTER: bool = False  # Opt in to trimming silence with the built-in Silero VAD before decoding
+    WHISPER_BATCH_SIZE: int = 0  # >1 transcribes VAD chunks of a clip in batches (needs faster-whisper >= 1.1; always uses VAD)
 
 settings = Settings()
@@ -0,0 +1,118 @@
+"""
+Cache of authenticated users for get_current_user.
+
+Entries are keyed by user id and carry the user's token version, so a token issued before
+the version was bumped never matches a cached entry. Lookups check a short-lived
+per-process copy first and Redis second; an authenticated request normally costs a
+dictionary lookup instead of a users query.
+
+Credit counters (ai_credits, subscription_tokens_used, has_used_free_limits) and the
+password hash are never cached. A user rebuilt from the cache has them unloaded, so they
+are read from the row the first time a request uses them and balances are always current.
+"""
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+from app.utils.cache import CacheKeys, LocalLRUCache, cache
+
+logger = logging.getLogger(__name__)
+
+# Columns held in a cached principal
+PRINCIPAL_FIELDS = (
+    "id", "username", "email", "name", "is_admin", "agree_to_terms", "profile_image",
+    "phone", "bio", "location", "website", "reply_voice", "token_version", "created_at",
+)
+
+
+class PrincipalCache:
+    """Two-tier (process memory, Redis) cache of users and of revoked access tokens"""
+
+    def __init__(self):
+        # Also holds revocation verdicts, so a token is checked against Redis at most
+        # once per AUTH_PRINCIPAL_LOCAL_TTL per worker
+        self.local = LocalLRUCache(settings.AUTH_PRINCIPAL_LOCAL_MAX_ENTRIES, settings.AUTH_PRINCIPAL_LOCAL_TTL)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{CacheKeys.AUTH_PRINCIPAL}:{user_id}"
+
+    @staticmethod
+    def _revoked_key(token_id: str) -> str:
+        return f"{CacheKeys.AUTH_REVOKED}:{token_id}"
+
+    def get(self, user_id: int, token_version: int) -> Optional[Dict[str, Any]]:
+        """Cached columns of the user, or None on a miss or a token version mismatch"""
+        key = self._key(user_id)
+        value = self.local.get(key)
+        if value is not None:
+            data = json.loads(value)
+        else:
+            data = cache.get(key)
+            if data is None:
+                return None
+            self.local.set(key, json.dumps(data))
+
+        if data.get("token_version") != token_version:
+            return None
+        return data
+
+    def store(self, user: User):
+        """Cache a user just loaded from the database"""
+        data = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+        data["created_at"] = user.created_at.isoformat() if user.created_at else None
+        key = self._key(user.id)
+        self.local.set(key, json.dumps(data))
+        cache.set(key, data, ttl=settings.AUTH_PRINCIPAL_CACHE_TTL)
+
+    def invalidate(self, user_id: int):
+        """
+        Drop a user's cached entry after their row changes. Other workers may keep
+        their local copy for up to AUTH_PRINCIPAL_LOCAL_TTL seconds.
+        """
+        key = self._key(user_id)
+        self.local.delete_many([key])
+        cache.delete(key)
+
+    @staticmethod
+    def to_user(db: Session, data: Dict[str, Any]) -> User:
+        """
+        Rebuild a User from cached columns and attach it to the request's session without
+        a query. Columns that are not cached load from the row on first access, and changes
+        to the instance are flushed like those of any queried user.
+        """
+        values = dict(data)
+        if values.get("created_at"):
+            values["created_at"] = datetime.fromisoformat(values["created_at"])
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def revoke_token(self, token_id: str, expires_at: Optional[int]):
+        """Add a token to the revocation list until it would have expired anyway"""
+        if expires_at:
+            ttl = max(int(expires_at - time.time()), 1)
+        else:
+            ttl = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        key = self._revoked_key(token_id)
+        self.local.set(key, "1")
+        if not cache.set(key, 1, ttl=ttl):
+            logger.warning("Revocation list unavailable; token is only revoked on this worker for now")
+
+    def is_revoked(self, token_id: str) -> bool:
+        key = self._revoked_key(token_id)
+        verdict = self.local.get(key)
+        if verdict is None:
+            verdict = "1" if cache.exists(key) else "0"
+            self.local.set(key, verdict)
+        return verdict == "1"
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache()
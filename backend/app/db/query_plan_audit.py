@@ -0,0 +1,258 @@
+"""
+Query plan audit for the per-user and per-session lookups.
+
+Creates the schema in a scratch database, seeds a large synthetic dataset, runs EXPLAIN on
+the queries the hot endpoints issue and exits with status 1 if any of them falls back to a
+sequential scan of the table it filters. Works with PostgreSQL and SQLite.
+
+Run from the backend directory (never against the production database):
+    python -m app.db.query_plan_audit                                   # temporary SQLite file
+    python -m app.db.query_plan_audit --database-url postgresql://localhost/dropshapes_audit --users 5000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.session import Base
+from app.models import (
+    CoverLetter, Comment, Discussion, InterviewAnswer, InterviewQuestion, InterviewSession,
+    Invoice, Resume, Signature, Subscription, Task, User, UserPerformance, DifficultyLevelEnum
+)
+
+# Rows per user (or per parent row) in the synthetic dataset
+PER_USER = {
+    "resumes": 20,
+    "cover_letters": 10,
+    "tasks": 20,
+    "interview_sessions": 10,
+    "signatures": 2,
+    "invoices": 5,
+    "user_performance": 3,
+}
+QUESTIONS_PER_SESSION = 5
+DISCUSSIONS = 500
+COMMENTS_PER_DISCUSSION = 40
+BATCH_SIZE = 5000
+
+
+def _batched(rows: Iterable[Dict[str, Any]]) -> Iterable[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(conn: Connection, model, rows: Iterable[Dict[str, Any]]):
+    for batch in _batched(rows):
+        conn.execute(insert(model.__table__), batch)
+
+
+def seed(engine: Engine, users: int):
+    """Insert the synthetic dataset; created_at values are spread over the last year"""
+    now = datetime.now(timezone.utc)
+
+    def created(i: int) -> datetime:
+        return now - timedelta(minutes=(i * 7919) % (365 * 24 * 60))
+
+    with engine.begin() as conn:
+        _insert(conn, User, (
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com", "password": "x",
+             "agree_to_terms": True, "created_at": created(u)}
+            for u in range(1, users + 1)
+        ))
+        _insert(conn, Subscription, (
+            {"user_id": u, "name": "Basic", "price": 9.0, "interval": "monthly",
+             "is_active": u % 3 != 0, "created_at": created(u)}
+            for u in range(1, users + 1)
+        ))
+        _insert(conn, Resume, (
+            {"user_id": u, "resume_title": f"Resume {i}", "created_at": created(u * 100 + i)}
+            for u in range(1, users + 1) for i in range(PER_USER["resumes"])
+        ))
+        _insert(conn, CoverLetter, (
+            {"user_id": u, "cover_letter_title": f"Letter {i}", "created_at": created(u * 100 + i)}
+            for u in range(1, users + 1) for i in range(PER_USER["cover_letters"])
+        ))
+        _insert(conn, Task, (
+            {"user_id": u, "title": f"Task {i}", "priority": "medium", "status": "pending",
+             "category": "general", "ai_generated": False,
+             "created_at": created(u * 100 + i).replace(tzinfo=None),
+             "updated_at": created(u * 100 + i).replace(tzinfo=None)}
+            for u in range(1, users + 1) for i in range(PER_USER["tasks"])
+        ))
+        _insert(conn, Signature, (
+            {"user_id": u, "name": f"Signature {i}", "signature_data": "data"}
+            for u in range(1, users + 1) for i in range(PER_USER["signatures"])
+        ))
+        _insert(conn, Invoice, (
+            {"user_id": u, "invoice_number": f"INV-{u}-{i}", "invoice_date": created(u * 100 + i),
+             "subtotal": 9.0, "tax_amount": 0.0, "total_amount": 9.0, "status": "paid",
+             "currency": "USD", "created_at": created(u * 100 + i)}
+            for u in range(1, users + 1) for i in range(PER_USER["invoices"])
+        ))
+        _insert(conn, UserPerformance, (
+            {"user_id": u, "topic": f"Topic {i}"}
+            for u in range(1, users + 1) for i in range(PER_USER["user_performance"])
+        ))
+
+        sessions = [
+            (f"s-{u}-{i}", u) for u in range(1, users + 1) for i in range(PER_USER["interview_sessions"])
+        ]
+        _insert(conn, InterviewSession, (
+            {"id": session_id, "user_id": u, "topic": "Python",
+             "difficulty_level": DifficultyLevelEnum.MID, "created_at": created(n)}
+            for n, (session_id, u) in enumerate(sessions)
+        ))
+        _insert(conn, InterviewQuestion, (
+            {"id": f"{session_id}-q{q}", "session_id": session_id, "question_text": "Question?"}
+            for session_id, _ in sessions for q in range(QUESTIONS_PER_SESSION)
+        ))
+        _insert(conn, InterviewAnswer, (
+            {"session_id": session_id, "question_id": f"{session_id}-q{q}", "user_answer": "Answer"}
+            for session_id, _ in sessions for q in range(QUESTIONS_PER_SESSION)
+        ))
+
+        _insert(conn, Discussion, (
+            {"id": d, "title": f"Discussion {d}", "content": "Content"}
+            for d in range(1, DISCUSSIONS + 1)
+        ))
+        _insert(conn, Comment, (
+            {"discussion_id": d, "name": "Reader", "comment": "Comment"}
+            for d in range(1, DISCUSSIONS + 1) for _ in range(COMMENTS_PER_DISCUSSION)
+        ))
+
+
+def key_queries(users: int) -> List[Tuple[str, str, Any]]:
+    """(name, table that must not be sequentially scanned, statement) for the audited lookups"""
+    user_id = users // 2
+    session_id = f"s-{user_id}-0"
+    period_start = datetime.now(timezone.utc) - timedelta(days=30)
+    return [
+        ("resumes by user", "resumes",
+         select(Resume.id).where(Resume.user_id == user_id)),
+        ("resume usage in period", "resumes",
+         select(func.count(Resume.id)).where(Resume.user_id == user_id, Resume.created_at >= period_start)),
+        ("cover letters by user", "cover_letters",
+         select(CoverLetter.id).where(CoverLetter.user_id == user_id)),
+        ("cover letter usage in period", "cover_letters",
+         select(func.count(CoverLetter.id)).where(CoverLetter.user_id == user_id, CoverLetter.created_at >= period_start)),
+        ("tasks by user, newest first", "tasks",
+         select(Task.id).where(Task.user_id == user_id).order_by(Task.created_at.desc()).limit(20)),
+        ("interview sessions by user, newest first", "interview_sessions",
+         select(InterviewSession.id).where(InterviewSession.user_id == user_id)
+         .order_by(InterviewSession.created_at.desc()).limit(20)),
+        ("interview questions by session", "interview_questions",
+         select(InterviewQuestion.id).where(InterviewQuestion.session_id == session_id)),
+        ("interview answer by session and question", "interview_answers",
+         select(InterviewAnswer.id).where(
+             InterviewAnswer.session_id == session_id, InterviewAnswer.question_id == f"{session_id}-q0"
+         )),
+        ("user performance by user", "user_performance",
+         select(UserPerformance.id).where(UserPerformance.user_id == user_id)),
+        ("signatures by user", "signatures",
+         select(Signature.id).where(Signature.user_id == user_id)),
+        ("invoices by user, newest first", "invoices",
+         select(Invoice.id).where(Invoice.user_id == user_id).order_by(Invoice.created_at.desc())),
+        ("comments by discussion", "comments",
+         select(Comment.id).where(Comment.discussion_id == DISCUSSIONS // 2)),
+        ("active subscription by user", "subscriptions",
+         select(Subscription.id).where(Subscription.user_id == user_id, Subscription.is_active == True)),
+    ]
+
+
+def explain(conn: Connection, statement) -> Any:
+    """Plan for a statement: the JSON plan on PostgreSQL, EXPLAIN QUERY PLAN rows on SQLite"""
+    compiled = statement.compile(dialect=conn.dialect)
+    if conn.dialect.name == "postgresql":
+        rows = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).fetchall()
+        plan = rows[0][0]
+        return json.loads(plan) if isinstance(plan, str) else plan
+    params = tuple(
+        value.isoformat(" ") if isinstance(value, datetime) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    return [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()]
+
+
+def sequential_scans(plan: Any, dialect: str) -> List[str]:
+    """Tables read with a full sequential scan according to the plan"""
+    if dialect == "postgresql":
+        scanned = []
+        nodes = [node["Plan"] for node in plan]
+        while nodes:
+            node = nodes.pop()
+            if node.get("Node Type") == "Seq Scan":
+                scanned.append(node.get("Relation Name"))
+            nodes.extend(node.get("Plans", []))
+        return scanned
+    # SQLite: "SCAN resumes" is a full scan, "SEARCH resumes USING INDEX ..." or
+    # "SCAN resumes USING COVERING INDEX ..." are not
+    return [
+        detail.split()[1]
+        for detail in plan
+        if detail.startswith("SCAN ") and " USING " not in detail
+    ]
+
+
+def audit(engine: Engine, users: int) -> List[str]:
+    """Run EXPLAIN for every key query and return a failure message per sequential scan"""
+    failures = []
+    with engine.connect() as conn:
+        for name, table, statement in key_queries(users):
+            plan = explain(conn, statement)
+            scanned = sequential_scans(plan, conn.dialect.name)
+            status = "SEQ SCAN" if table in scanned else "ok"
+            print(f"{status:8} {name}")
+            if table in scanned:
+                failures.append(f"{name}: sequential scan on {table}\n{json.dumps(plan, indent=2, default=str)}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN-based audit of per-user query plans")
+    parser.add_argument("--database-url", default=None,
+                        help="Scratch database to create and seed (default: a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=2000, help="Number of synthetic users to seed")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        handle, path = tempfile.mkstemp(prefix="query_plan_audit_", suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        already_seeded = conn.execute(select(func.count(User.id))).scalar()
+    if already_seeded:
+        print(f"Reusing existing data ({already_seeded} users)")
+        users = already_seeded
+    else:
+        print(f"Seeding {args.users} synthetic users into {engine.url.render_as_string(hide_password=True)}")
+        seed(engine, args.users)
+        users = args.users
+
+    # Fresh statistics, so the planner sees the real table sizes
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    failures = audit(engine, users)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
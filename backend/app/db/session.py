@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -22,6 +23,26 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for async def routes, so queries no longer block the event loop.
+# Separate pool from the sync engine, which keeps serving threadpool routes and scripts.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_size=settings.DB_ASYNC_POOL_SIZE,
+    max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+    pool_timeout=settings.DB_ASYNC_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    echo=False
+)
+
+# expire_on_commit=False: attributes stay loaded after commit, since lazy loads are not allowed in async code
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for ORM models
 Base = declarative_base()
 
@@ -36,3 +57,14 @@ def get_db():
         raise
     finally:
         db.close()
+
+
+# Async database dependency for async def routes
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session error: {str(e)}")
+            await db.rollback()
+            raise
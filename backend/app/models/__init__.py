@@ -22,5 +22,6 @@ from app.models.interview import (
     AnswerTypeEnum
 )
 from app.models.chat import ChatConversation, ChatMessage
+from app.models.usage_rollup import DailyUsageRollup
 
 # This module exports all models for easy importing
@@ -11,6 +11,8 @@ class ChatConversation(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     title = Column(String(500), default="New Chat")
+    summary = Column(Text, nullable=True)  # Rolling summary of messages older than the verbatim context window
+    summary_message_id = Column(Integer, nullable=True)  # Last message id folded into summary
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -25,6 +27,7 @@ class ChatMessage(Base):
     conversation_id = Column(Integer, ForeignKey("chat_conversations.id", ondelete="CASCADE"), nullable=False, index=True)
     role = Column(String(20), nullable=False)  # 'user' | 'assistant'
     content = Column(Text, nullable=False)  # Text message or, for user voice: S3 audio URL
+    transcript = Column(Text, nullable=True)  # For user voice: transcription, stored once at upload
     audio_url = Column(String(2000), nullable=True)  # Assistant TTS audio S3 URL (when role=assistant)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -11,7 +11,7 @@ class Comment(Base):
     name = Column(String, nullable=False)
     comment = Column(Text, nullable=False)
     date_time = Column(DateTime(timezone=True), server_default=func.now())    
-    discussion_id = Column(Integer, ForeignKey("discussions.id"))  # Reference to discussion
+    discussion_id = Column(Integer, ForeignKey("discussions.id"), index=True)  # Reference to discussion
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Float, Text, ForeignKey, DateTime, JSON, Enum
+from sqlalchemy import Boolean, Column, Integer, String, Float, Text, ForeignKey, DateTime, JSON, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -19,6 +19,9 @@ class AnswerTypeEnum(enum.Enum):
 class InterviewSession(Base):
     """Database model for interview sessions"""
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        Index("ix_interview_sessions_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True, index=True)  # UUID as string
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Optional user association
@@ -45,7 +48,7 @@ class InterviewQuestion(Base):
     __tablename__ = "interview_questions"
 
     id = Column(String, primary_key=True, index=True)  # question_id as string
-    session_id = Column(String, ForeignKey("interview_sessions.id"), nullable=False)
+    session_id = Column(String, ForeignKey("interview_sessions.id"), nullable=False, index=True)
     question_text = Column(Text, nullable=False)
     question_order = Column(Integer, default=1)
     
@@ -58,6 +61,9 @@ class InterviewQuestion(Base):
 class InterviewAnswer(Base):
     """Database model for interview answers"""
     __tablename__ = "interview_answers"
+    __table_args__ = (
+        Index("ix_interview_answers_session_id_question_id", "session_id", "question_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, ForeignKey("interview_sessions.id"), nullable=False)
@@ -84,7 +90,7 @@ class UserPerformance(Base):
     __tablename__ = "user_performance"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     topic = Column(String, nullable=False)
     
     # Performance metrics
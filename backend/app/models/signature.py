@@ -9,7 +9,7 @@ class Signature(Base):
     __tablename__ = "signatures"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     name = Column(String, nullable=False)
     signature_data = Column(Text, nullable=False)  # Base64 encoded signature image
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class DailyUsageRollup(Base):
+    """Per-day row counts of the tables behind the admin dashboard (one row per day and metric)"""
+    __tablename__ = "daily_usage_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False, index=True)
+    metric = Column(String(50), nullable=False)  # See admin_rollup_service.ROLLUP_METRICS
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("day", "metric", name="uq_daily_usage_rollups_day_metric"),
+    )
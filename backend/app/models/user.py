@@ -27,6 +27,7 @@ class User(Base):
     subscription_tokens_used = Column(Integer, default=0)  # Tokens used from subscription plan
     has_used_free_limits = Column(Boolean, default=False)  # Track if user has used free limits before subscribing
     reply_voice = Column(String(10), default="male", nullable=True)  # Chat assistant TTS: "female" | "male"
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bumped to revoke every issued token
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -12,7 +12,7 @@ class WordTimestamp(BaseModel):
 
 class TextToSpeechRequest(BaseModel):
     """Request model for enhanced text-to-speech with voice selection and timing"""
-    text: str = Field(..., min_length=1, max_length=3000, description="Text to convert to speech")
+    text: str = Field(..., min_length=1, max_length=20000, description="Text to convert to speech (long text is synthesized in chunks)")
     lang: str = Field(default="en", description="Language code (e.g., en, es, fr, de)")
     pitch: float = Field(default=1.0, ge=0.5, le=2.0, description="Pitch modifier (0.5-2.0, 1.0 = normal)")
     rate: float = Field(default=1.0, ge=0.2, le=3.0, description="Speech rate modifier (0.2-3.0, 1.0 = normal)")
@@ -28,8 +28,8 @@ class TextToSpeechRequest(BaseModel):
         cleaned_text = v.strip()
         
         # Check for length after cleaning
-        if len(cleaned_text) > 3000:
-            raise ValueError('Text is too long (max 3000 characters)')
+        if len(cleaned_text) > 20000:
+            raise ValueError('Text is too long (max 20000 characters)')
             
         return cleaned_text
     
@@ -77,6 +77,15 @@ class TextToSpeechResponse(BaseModel):
     duration: float = Field(..., description="Total audio duration in seconds")
     voice_used: str = Field(..., description="Voice that was actually used")
     language: str = Field(..., description="Language code used")
+    audio_url: Optional[str] = Field(None, description="Presigned URL of the cached MP3, when stored in S3")
+
+
+class SpeechTimestampsResponse(BaseModel):
+    """Response model for word timestamps of audio served by /text-to-speech/stream"""
+    timestamps: List[WordTimestamp] = Field(..., description="Word timing information for highlighting")
+    duration: float = Field(..., description="Total audio duration in seconds")
+    voice_used: str = Field(..., description="Voice that was actually used")
+    language: str = Field(..., description="Language code used")
 
 
 class AvailableVoicesResponse(BaseModel):
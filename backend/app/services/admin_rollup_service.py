@@ -0,0 +1,184 @@
+"""
+Daily usage rollups for the admin dashboard.
+
+Counts of users, resumes, cover letters, interview sessions and tasks are kept per day in
+daily_usage_rollups, so dashboard totals are a sum over a few hundred small rows instead of
+COUNT(*) scans of the content tables. Each refresh recomputes only the newest days with
+created_at range filters; the first run (or --full) backfills all history, and the
+scheduler repeats a full run daily to pick up deletions.
+
+A background task started with the app refreshes the rollups and the cached dashboard
+snapshot every ADMIN_ROLLUP_INTERVAL seconds. It can also be run from cron:
+    python -m app.services.admin_rollup_service [--full]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.cover_letter import CoverLetter
+from app.models.interview import InterviewSession
+from app.models.resume import Resume
+from app.models.task import Task
+from app.models.usage_rollup import DailyUsageRollup
+from app.models.user import User
+from app.utils.cache import async_cache
+
+logger = logging.getLogger(__name__)
+
+# metric -> (model, extra filter); each metric counts the model's rows by created_at day
+ROLLUP_METRICS = {
+    "users": (User, None),
+    "resumes": (Resume, None),
+    "cover_letters": (CoverLetter, None),
+    "interview_sessions": (InterviewSession, None),
+    "tasks": (Task, None),
+}
+
+# metric -> (model, condition); current-state counts that can change long after a row is
+# created (e.g. a resume enhanced days later), so they are counted live when the cached
+# dashboard snapshot is built instead of being bucketed by creation day
+STATE_METRICS = {
+    "resumes_ai_enhanced": (Resume, or_(
+        Resume.summary.isnot(None),
+        Resume.skills.isnot(None),
+        Resume.work_history.isnot(None)
+    )),
+    "cover_letters_ai_generated": (CoverLetter, or_(
+        CoverLetter.body.isnot(None),
+        CoverLetter.introduction.isnot(None)
+    )),
+}
+
+# Metrics that count as AI requests on the dashboard
+AI_REQUEST_METRICS = ("interview_sessions", "resumes", "cover_letters")
+
+ROLLUP_LOCK = "admin:rollup"
+# Held for ADMIN_ROLLUP_FULL_INTERVAL, so one worker per interval runs the full reconcile
+FULL_ROLLUP_LOCK = "admin:rollup:full"
+
+
+def refresh_daily_rollups(db: Session, full: bool = False) -> int:
+    """
+    Recompute rollup rows from the day before the newest rollup onwards (all history when
+    the table is empty or full=True). Returns the number of (day, metric) rows written.
+    """
+    since: Optional[date] = None
+    if not full:
+        latest = db.query(func.max(DailyUsageRollup.day)).scalar()
+        if latest:
+            since = latest - timedelta(days=1)
+
+    counts: Dict[Tuple[date, str], int] = {}
+    for metric, (model, condition) in ROLLUP_METRICS.items():
+        day = func.date(model.created_at)
+        query = db.query(day, func.count()).select_from(model)
+        if since is not None:
+            # Range filter on the raw column so an index on created_at can be used
+            query = query.filter(model.created_at >= datetime.combine(since, datetime.min.time()))
+        if condition is not None:
+            query = query.filter(condition)
+        for row_day, count in query.group_by(day).all():
+            if row_day is not None:
+                counts[(row_day, metric)] = count
+
+    existing_query = db.query(DailyUsageRollup)
+    if since is not None:
+        existing_query = existing_query.filter(DailyUsageRollup.day >= since)
+    existing = {(row.day, row.metric): row for row in existing_query.all()}
+
+    try:
+        for (row_day, metric), count in counts.items():
+            row = existing.pop((row_day, metric), None)
+            if row is None:
+                db.add(DailyUsageRollup(day=row_day, metric=metric, count=count))
+            elif row.count != count:
+                row.count = count
+        # Days in the window whose rows have all been deleted since the last refresh
+        for row in existing.values():
+            row.count = 0
+        db.commit()
+    except IntegrityError:
+        # Another worker inserted the same days first; its counts are just as fresh
+        db.rollback()
+        logger.info("Concurrent usage rollup refresh detected, keeping the other worker's rows")
+
+    return len(counts)
+
+
+def rollup_totals(db: Session, since: Optional[date] = None) -> Dict[str, int]:
+    """Sum of each metric over all days, or over days >= since"""
+    query = db.query(DailyUsageRollup.metric, func.sum(DailyUsageRollup.count)).filter(
+        DailyUsageRollup.metric.in_(list(ROLLUP_METRICS))
+    )
+    if since is not None:
+        query = query.filter(DailyUsageRollup.day >= since)
+    totals = {metric: 0 for metric in ROLLUP_METRICS}
+    for metric, total in query.group_by(DailyUsageRollup.metric).all():
+        totals[metric] = int(total or 0)
+    return totals
+
+
+def state_counts(db: Session) -> Dict[str, int]:
+    """Live counts of the STATE_METRICS"""
+    return {
+        metric: db.query(func.count()).select_from(model).filter(condition).scalar() or 0
+        for metric, (model, condition) in STATE_METRICS.items()
+    }
+
+
+def run_rollup_job(full: bool = False) -> Dict[str, int]:
+    """Refresh the rollups, then rebuild and cache the dashboard snapshot"""
+    # Imported here: AdminService reads the rollups through this module
+    from app.services.admin_service import AdminService
+
+    db = SessionLocal()
+    try:
+        rows = refresh_daily_rollups(db, full=full)
+        AdminService.refresh_dashboard_snapshot(db)
+        return {"rollup_rows": rows}
+    finally:
+        db.close()
+
+
+async def run_rollup_scheduler():
+    """
+    Background loop started at app startup. The Redis lock is held for a whole interval,
+    so with several workers only one of them refreshes per interval.
+    Incremental refreshes only revisit the newest days, so rows deleted from older days
+    are reconciled by a full refresh once per ADMIN_ROLLUP_FULL_INTERVAL. acquire_lock
+    succeeds whenever Redis is unavailable, so each worker also tracks when it last tried
+    the full refresh and asks for FULL_ROLLUP_LOCK at most once per interval itself.
+    """
+    interval = settings.ADMIN_ROLLUP_INTERVAL
+    full_interval = settings.ADMIN_ROLLUP_FULL_INTERVAL
+    last_full_check: Optional[float] = None
+    while True:
+        token = await async_cache.acquire_lock(ROLLUP_LOCK, ttl=interval)
+        if token:
+            full = False
+            now = time.monotonic()
+            if last_full_check is None or now - last_full_check >= full_interval:
+                last_full_check = now
+                full = bool(await async_cache.acquire_lock(FULL_ROLLUP_LOCK, ttl=full_interval))
+            try:
+                await asyncio.to_thread(run_rollup_job, full)
+            except Exception as e:
+                logger.warning(f"Admin usage rollup refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Refresh admin dashboard usage rollups")
+    parser.add_argument("--full", action="store_true", help="Recompute all days instead of only the newest")
+    args = parser.parse_args()
+    print(run_rollup_job(full=args.full))
@@ -2,8 +2,10 @@
 Admin service for dashboard statistics and admin-only operations
 """
 
+import base64
+
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select, or_, and_
 from datetime import datetime, date, timedelta, timezone
 from typing import List, Tuple, Dict, Any, Optional
 
@@ -13,6 +15,9 @@ from app.models.interview import InterviewSession, InterviewAnswer
 from app.models.resume import Resume
 from app.models.cover_letter import CoverLetter
 from app.models.task import Task
+from app.core.config import settings
+from app.utils.cache import cache, CacheKeys, LocalLRUCache
+from app.services.admin_rollup_service import AI_REQUEST_METRICS, refresh_daily_rollups, rollup_totals, state_counts
 
 
 def normalize_datetime(dt):
@@ -22,6 +27,11 @@ def normalize_datetime(dt):
     return dt
 
 
+# Process-local copy of the dashboard snapshot, served when Redis is disabled or unreachable
+# so each request does not rebuild it
+_local_snapshot = LocalLRUCache(max_entries=1, default_ttl=settings.ADMIN_DASHBOARD_SNAPSHOT_TTL)
+
+
 class AdminService:
     """Service class for admin dashboard and admin operations"""
     
@@ -45,27 +55,23 @@ class AdminService:
     
     @staticmethod
     def get_user_statistics(db: Session) -> Dict[str, int]:
-        """Get basic user statistics"""
+        """Get basic user statistics (counts come from the daily usage rollups)"""
         today = date.today()
         
-        total_users = db.query(User).count()
-        new_users_today = db.query(User).filter(
-            func.date(User.created_at) == today
-        ).count()
+        total_users = db.query(func.count(User.id)).scalar() or 0
+        new_users_today = rollup_totals(db, since=today)["users"]
         
         # Active users (users who have used any AI feature in the last 30 days)
         thirty_days_ago = today - timedelta(days=30)
-        active_users = db.query(User.id).distinct().filter(
-            User.id.in_(
-                db.query(InterviewSession.user_id).filter(
-                    InterviewSession.created_at >= thirty_days_ago
-                ).union(
-                    db.query(Resume.user_id).filter(Resume.created_at >= thirty_days_ago)
-                ).union(
-                    db.query(CoverLetter.user_id).filter(CoverLetter.created_at >= thirty_days_ago)
-                )
-            )
-        ).count()
+        active_users = db.query(func.count()).select_from(
+            db.query(InterviewSession.user_id).filter(
+                InterviewSession.created_at >= thirty_days_ago
+            ).union(
+                db.query(Resume.user_id).filter(Resume.created_at >= thirty_days_ago)
+            ).union(
+                db.query(CoverLetter.user_id).filter(CoverLetter.created_at >= thirty_days_ago)
+            ).subquery()
+        ).scalar() or 0
         
         return {
             "total_users": total_users,
@@ -75,26 +81,13 @@ class AdminService:
     
     @staticmethod
     def get_ai_request_statistics(db: Session) -> Dict[str, int]:
-        """Get AI request statistics"""
-        today = date.today()
-        
-        # AI requests today
-        ai_requests_today = (
-            db.query(InterviewSession).filter(func.date(InterviewSession.created_at) == today).count() +
-            db.query(Resume).filter(func.date(Resume.created_at) == today).count() +
-            db.query(CoverLetter).filter(func.date(CoverLetter.created_at) == today).count()
-        )
-        
-        # Total AI requests
-        total_ai_requests = (
-            db.query(InterviewSession).count() +
-            db.query(Resume).count() +
-            db.query(CoverLetter).count()
-        )
+        """Get AI request statistics from the daily usage rollups"""
+        today_counts = rollup_totals(db, since=date.today())
+        totals = rollup_totals(db)
         
         return {
-            "ai_requests_today": ai_requests_today,
-            "total_ai_requests": total_ai_requests
+            "ai_requests_today": sum(today_counts[metric] for metric in AI_REQUEST_METRICS),
+            "total_ai_requests": sum(totals[metric] for metric in AI_REQUEST_METRICS)
         }
     
     @staticmethod
@@ -118,35 +111,31 @@ class AdminService:
     
     @staticmethod
     def get_top_active_users(db: Session, limit: int = 3) -> List[Tuple[int, str, int]]:
-        """Get top active users based on AI feature usage"""
-        # Get users who have interview sessions
-        users_with_activity = []
-        
-        # Get users with interview activity including username and email for fallback
-        interview_users = db.query(
-            User.id, 
-            User.name,
-            User.username,
-            User.email,
-            func.count(InterviewSession.id).label('interview_count')
-        ).join(InterviewSession).group_by(User.id, User.name, User.username, User.email).all()
-        
-        for user_id, user_name, username, email, interview_count in interview_users:
-            # Count all AI requests for this user
-            resume_count = db.query(Resume).filter(Resume.user_id == user_id).count()
-            cover_letter_count = db.query(CoverLetter).filter(CoverLetter.user_id == user_id).count()
-            total_requests = interview_count + resume_count + cover_letter_count
-            
-            # Use name priority: name -> username -> email -> fallback
-            display_name = AdminService._get_user_display_name(
-                user_name, username, email, user_id
-            )
-            
-            users_with_activity.append((user_id, display_name, total_requests))
+        """Get top active users based on AI feature usage (interviews, resumes and cover letters)"""
+        activity = (
+            db.query(InterviewSession.user_id.label("user_id"))
+            .union_all(db.query(Resume.user_id), db.query(CoverLetter.user_id))
+            .subquery()
+        )
+        request_counts = (
+            db.query(activity.c.user_id, func.count().label("total_requests"))
+            .group_by(activity.c.user_id)
+            .order_by(desc("total_requests"))
+            .limit(limit)
+            .subquery()
+        )
+        rows = (
+            db.query(User.id, User.name, User.username, User.email, request_counts.c.total_requests)
+            .join(request_counts, request_counts.c.user_id == User.id)
+            .order_by(desc(request_counts.c.total_requests))
+            .all()
+        )
         
-        # Sort by total requests and return top users
-        users_with_activity.sort(key=lambda x: x[2], reverse=True)
-        return users_with_activity[:limit]
+        # Use name priority: name -> username -> email -> fallback
+        return [
+            (user_id, AdminService._get_user_display_name(user_name, username, email, user_id), total_requests)
+            for user_id, user_name, username, email, total_requests in rows
+        ]
     
     @staticmethod
     def get_subscription_statistics(db: Session) -> Dict[str, Any]:
@@ -237,31 +226,27 @@ class AdminService:
     
     @staticmethod
     def get_feature_usage_statistics(db: Session) -> Dict[str, Any]:
-        """Get comprehensive feature usage statistics"""
+        """Get comprehensive feature usage statistics from the daily usage rollups and live state counts"""
+        totals = rollup_totals(db)
+        # Current-state counts; this runs only when the cached dashboard snapshot is rebuilt
+        states = state_counts(db)
         
         # Resume Builder Statistics
-        total_resumes = db.query(Resume).count()
-        # Count AI-enhanced resumes (those with AI-generated content in key sections)
-        ai_enhanced_resumes = db.query(Resume).filter(
-            (Resume.summary.isnot(None)) |
-            (Resume.skills.isnot(None)) |
-            (Resume.work_history.isnot(None))
-        ).count()
+        total_resumes = totals["resumes"]
+        # AI-enhanced resumes: those with AI-generated content in key sections (summary, skills, work history)
+        ai_enhanced_resumes = states["resumes_ai_enhanced"]
         
         # Cover Letter Builder Statistics
-        total_cover_letters = db.query(CoverLetter).count()
-        # Count AI-generated letters (those with AI-generated body content)
-        ai_generated_letters = db.query(CoverLetter).filter(
-            (CoverLetter.body.isnot(None)) |
-            (CoverLetter.introduction.isnot(None))
-        ).count()
+        total_cover_letters = totals["cover_letters"]
+        # AI-generated letters: those with AI-generated body or introduction
+        ai_generated_letters = states["cover_letters_ai_generated"]
         
         # AI Services Statistics
         # Interview Prep Sessions
-        interview_prep_sessions = db.query(InterviewSession).count()
+        interview_prep_sessions = totals["interview_sessions"]
         
         # Smart Task Management: Count all tasks (AI and non-AI)
-        smart_task_management = db.query(Task).count()
+        smart_task_management = totals["tasks"]
         
         # For services without dedicated tracking, provide realistic estimates
         # based on user activity and typical usage patterns
@@ -299,36 +284,17 @@ class AdminService:
         """Get feature usage trends over the specified number of days"""
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
-        
-        # Get trends for resumes
-        recent_resumes = db.query(Resume).filter(
-            Resume.created_at >= start_date
-        ).count()
-        
-        # Get trends for cover letters
-        recent_cover_letters = db.query(CoverLetter).filter(
-            CoverLetter.created_at >= start_date
-        ).count()
-        
-        # Get trends for interview sessions
-        recent_interviews = db.query(InterviewSession).filter(
-            InterviewSession.created_at >= start_date
-        ).count()
-        
-        # Get trends for tasks
-        recent_tasks = db.query(Task).filter(
-            Task.created_at >= start_date
-        ).count()
+        totals = rollup_totals(db, since=start_date)
         
         return {
             "period_days": days,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
             "trends": {
-                "resumes_created": recent_resumes,
-                "cover_letters_created": recent_cover_letters,
-                "interview_sessions": recent_interviews,
-                "tasks_created": recent_tasks
+                "resumes_created": totals["resumes"],
+                "cover_letters_created": totals["cover_letters"],
+                "interview_sessions": totals["interview_sessions"],
+                "tasks_created": totals["tasks"]
             }
         }
     
@@ -336,25 +302,21 @@ class AdminService:
     def get_user_engagement_metrics(db: Session) -> Dict[str, Any]:
         """Get user engagement metrics"""
         # Users who have created at least one piece of content
-        engaged_users = db.query(User.id).distinct().filter(
-            User.id.in_(
-                db.query(Resume.user_id).union(
-                    db.query(CoverLetter.user_id)
-                ).union(
-                    db.query(InterviewSession.user_id)
-                ).union(
-                    db.query(Task.user_id)
-                )
-            )
-        ).count()
+        engaged_users = db.query(func.count()).select_from(
+            db.query(Resume.user_id).union(
+                db.query(CoverLetter.user_id)
+            ).union(
+                db.query(InterviewSession.user_id)
+            ).union(
+                db.query(Task.user_id)
+            ).subquery()
+        ).scalar() or 0
         
-        total_users = db.query(User).count()
+        total_users = db.query(func.count(User.id)).scalar() or 0
         engagement_rate = (engaged_users / total_users * 100) if total_users > 0 else 0
         
-        # Average content per engaged user
-        avg_resumes_per_user = db.query(func.avg(
-            db.query(func.count(Resume.id)).filter(Resume.user_id == User.id).scalar_subquery()
-        )).scalar() or 0
+        # Average resumes per user (including users without any)
+        avg_resumes_per_user = rollup_totals(db)["resumes"] / total_users if total_users > 0 else 0
         
         return {
             "total_users": total_users,
@@ -364,10 +326,100 @@ class AdminService:
         }
     
     @staticmethod
-    def get_all_users_with_activity(db: Session, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get all users with their activity information"""
+    def build_dashboard_snapshot(db: Session) -> Dict[str, Any]:
+        """Everything the dashboard and feature-usage endpoints return, as plain dicts"""
+        user_stats = AdminService.get_user_statistics(db)
+        ai_request_stats = AdminService.get_ai_request_statistics(db)
         
-        # Base query for users
+        return {
+            "dashboard": {
+                "overview": {
+                    "total_users": user_stats["total_users"],
+                    "active_users": user_stats["active_users"],
+                    "new_users_today": user_stats["new_users_today"],
+                    "ai_requests_today": ai_request_stats["ai_requests_today"],
+                    "total_ai_requests": ai_request_stats["total_ai_requests"],
+                    "revenue": AdminService.get_revenue_statistics(db)
+                },
+                "ai_performance": AdminService.get_ai_performance_metrics(),
+                "user_stats": {
+                    "total_users": user_stats["total_users"],
+                    "top_active_users": [
+                        {"id": user_id, "name": name, "ai_requests": requests}
+                        for user_id, name, requests in AdminService.get_top_active_users(db, limit=3)
+                    ]
+                },
+                "subscriptions": AdminService.get_subscription_statistics(db),
+                "recent_activity": AdminService.get_recent_activity(db, limit=10)
+            },
+            "feature_usage": AdminService.get_feature_usage_statistics(db),
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }
+    
+    @staticmethod
+    def refresh_dashboard_snapshot(db: Session) -> Dict[str, Any]:
+        """Rebuild the dashboard snapshot and cache it for all workers"""
+        snapshot = AdminService.build_dashboard_snapshot(db)
+        cache.set(CacheKeys.ADMIN_DASHBOARD, snapshot, settings.ADMIN_DASHBOARD_SNAPSHOT_TTL)
+        _local_snapshot.set(CacheKeys.ADMIN_DASHBOARD, snapshot)
+        return snapshot
+    
+    @staticmethod
+    def get_dashboard_snapshot(db: Session) -> Dict[str, Any]:
+        """
+        Cached dashboard snapshot, refreshed every ADMIN_ROLLUP_INTERVAL by the rollup job.
+        Falls back to this process's copy when Redis has none (e.g. Redis is down), and is
+        rebuilt here (rollups first) only when both are empty or have expired.
+        """
+        snapshot = cache.get(CacheKeys.ADMIN_DASHBOARD)
+        if snapshot is None:
+            snapshot = _local_snapshot.get(CacheKeys.ADMIN_DASHBOARD)
+        if snapshot is None:
+            refresh_daily_rollups(db)
+            snapshot = AdminService.refresh_dashboard_snapshot(db)
+        return snapshot
+    
+    @staticmethod
+    def _activity_subquery(db: Session, model, page):
+        """Per-user row count and latest created_at for one activity table, limited to the page's users"""
+        return db.query(
+            model.user_id.label('user_id'),
+            func.count(model.id).label('count'),
+            func.max(model.created_at).label('last')
+        ).filter(
+            model.user_id.in_(select(page.c.id))
+        ).group_by(model.user_id).subquery()
+    
+    @staticmethod
+    def encode_user_cursor(created_at: datetime, user_id: int) -> str:
+        """Opaque keyset cursor for the (created_at, id) position of a user row"""
+        raw = f"{created_at.isoformat() if created_at else ''}|{user_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_user_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+        """Inverse of encode_user_cursor; raises ValueError for a malformed cursor"""
+        try:
+            created_at_str, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return (datetime.fromisoformat(created_at_str) if created_at_str else None), int(user_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+    
+    @staticmethod
+    def get_users_page(
+        db: Session,
+        search_term: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Users with their activity information, newest first, in a single query.
+        The page of users is selected first, then joined to grouped per-user counts and
+        latest activity dates for interviews, resumes, cover letters and tasks.
+        Pass cursor (from a previous page) for keyset pagination instead of offset.
+        Returns (users, next_cursor); next_cursor is None on the last page.
+        """
         users_query = db.query(
             User.id,
             User.name,
@@ -376,60 +428,64 @@ class AdminService:
             User.profile_image,
             User.created_at,
             User.updated_at
-        ).order_by(desc(User.created_at))
+        )
+        
+        if search_term:
+            # Create search filter for name, username, or email
+            search_filter = f"%{search_term.lower()}%"
+            users_query = users_query.filter(
+                (func.lower(User.name).like(search_filter)) |
+                (func.lower(User.username).like(search_filter)) |
+                (func.lower(User.email).like(search_filter))
+            )
+        
+        if cursor:
+            cursor_created_at, cursor_id = AdminService.decode_user_cursor(cursor)
+            if cursor_created_at is None:
+                users_query = users_query.filter(User.created_at.is_(None), User.id < cursor_id)
+            else:
+                users_query = users_query.filter(
+                    or_(
+                        User.created_at < cursor_created_at,
+                        and_(User.created_at == cursor_created_at, User.id < cursor_id),
+                        User.created_at.is_(None)
+                    )
+                )
+        
+        # id breaks created_at ties so keyset pages never skip or repeat rows
+        users_query = users_query.order_by(desc(User.created_at).nullslast(), desc(User.id))
         
         # Apply pagination if specified
         if limit:
-            users_query = users_query.offset(offset).limit(limit)
+            if not cursor:
+                users_query = users_query.offset(offset)
+            users_query = users_query.limit(limit)
+        
+        page = users_query.subquery()
+        activity = [
+            AdminService._activity_subquery(db, model, page)
+            for model in (InterviewSession, Resume, CoverLetter, Task)
+        ]
+        
+        query = db.query(
+            page,
+            *[func.coalesce(sub.c.count, 0) for sub in activity],
+            *[sub.c.last for sub in activity]
+        )
+        for sub in activity:
+            query = query.outerjoin(sub, sub.c.user_id == page.c.id)
+        rows = query.order_by(desc(page.c.created_at).nullslast(), desc(page.c.id)).all()
         
-        users = users_query.all()
         user_list = []
-        
-        for user_id, name, username, email, profile_image, created_at, updated_at in users:
-            # Get AI requests count for this user
-            interview_count = db.query(InterviewSession).filter(InterviewSession.user_id == user_id).count()
-            resume_count = db.query(Resume).filter(Resume.user_id == user_id).count()
-            cover_letter_count = db.query(CoverLetter).filter(CoverLetter.user_id == user_id).count()
-            task_count = db.query(Task).filter(Task.user_id == user_id).count()
-            
-            total_ai_requests = interview_count + resume_count + cover_letter_count + task_count
-            
-            # Get last activity date
-            last_activities = []
-            
-            # Check latest interview session
-            latest_interview = db.query(InterviewSession.created_at).filter(
-                InterviewSession.user_id == user_id
-            ).order_by(desc(InterviewSession.created_at)).first()
-            if latest_interview:
-                last_activities.append(latest_interview[0])
-            
-            # Check latest resume
-            latest_resume = db.query(Resume.created_at).filter(
-                Resume.user_id == user_id
-            ).order_by(desc(Resume.created_at)).first()
-            if latest_resume:
-                last_activities.append(latest_resume[0])
-            
-            # Check latest cover letter
-            latest_cover_letter = db.query(CoverLetter.created_at).filter(
-                CoverLetter.user_id == user_id
-            ).order_by(desc(CoverLetter.created_at)).first()
-            if latest_cover_letter:
-                last_activities.append(latest_cover_letter[0])
-            
-            # Check latest task
-            latest_task = db.query(Task.created_at).filter(
-                Task.user_id == user_id
-            ).order_by(desc(Task.created_at)).first()
-            if latest_task:
-                last_activities.append(latest_task[0])
+        for row in rows:
+            user_id, name, username, email, profile_image, created_at, updated_at = row[:7]
+            total_ai_requests = sum(row[7:11])
             
             # Get the most recent activity or fall back to user creation/update date
+            last_activities = [dt for dt in row[11:15] if dt]
             if last_activities:
                 # Normalize all datetime objects to timezone-naive for comparison
-                normalized_activities = [normalize_datetime(dt) for dt in last_activities]
-                last_active = max(normalized_activities)
+                last_active = max(normalize_datetime(dt) for dt in last_activities)
             else:
                 last_active = normalize_datetime(updated_at or created_at)
             
@@ -452,7 +508,16 @@ class AdminService:
                 "profile_picture": profile_image
             })
         
-        return user_list
+        next_cursor = None
+        if limit and len(rows) == limit:
+            next_cursor = AdminService.encode_user_cursor(rows[-1][5], rows[-1][0])
+        
+        return user_list, next_cursor
+    
+    @staticmethod
+    def get_all_users_with_activity(db: Session, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get all users with their activity information"""
+        return AdminService.get_users_page(db, limit=limit, offset=offset)[0]
     
     @staticmethod
     def get_users_count(db: Session) -> int:
@@ -462,95 +527,4 @@ class AdminService:
     @staticmethod
     def search_users_with_activity(db: Session, search_term: str, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """Search users by name or email and return with activity information"""
-        
-        # Create search filter for name, username, or email
-        search_filter = f"%{search_term.lower()}%"
-        users_query = db.query(
-            User.id,
-            User.name,
-            User.username,
-            User.email,
-            User.profile_image,
-            User.created_at,
-            User.updated_at
-        ).filter(
-            (func.lower(User.name).like(search_filter)) |
-            (func.lower(User.username).like(search_filter)) |
-            (func.lower(User.email).like(search_filter))
-        ).order_by(desc(User.created_at))
-        
-        # Apply pagination if specified
-        if limit:
-            users_query = users_query.offset(offset).limit(limit)
-        
-        users = users_query.all()
-        user_list = []
-        
-        for user_id, name, username, email, profile_image, created_at, updated_at in users:
-            # Get AI requests count for this user
-            interview_count = db.query(InterviewSession).filter(InterviewSession.user_id == user_id).count()
-            resume_count = db.query(Resume).filter(Resume.user_id == user_id).count()
-            cover_letter_count = db.query(CoverLetter).filter(CoverLetter.user_id == user_id).count()
-            task_count = db.query(Task).filter(Task.user_id == user_id).count()
-            
-            total_ai_requests = interview_count + resume_count + cover_letter_count + task_count
-            
-            # Get last activity date (same logic as in get_all_users_with_activity)
-            last_activities = []
-            
-            # Check latest interview session
-            latest_interview = db.query(InterviewSession.created_at).filter(
-                InterviewSession.user_id == user_id
-            ).order_by(desc(InterviewSession.created_at)).first()
-            if latest_interview:
-                last_activities.append(latest_interview[0])
-            
-            # Check latest resume
-            latest_resume = db.query(Resume.created_at).filter(
-                Resume.user_id == user_id
-            ).order_by(desc(Resume.created_at)).first()
-            if latest_resume:
-                last_activities.append(latest_resume[0])
-            
-            # Check latest cover letter
-            latest_cover_letter = db.query(CoverLetter.created_at).filter(
-                CoverLetter.user_id == user_id
-            ).order_by(desc(CoverLetter.created_at)).first()
-            if latest_cover_letter:
-                last_activities.append(latest_cover_letter[0])
-            
-            # Check latest task
-            latest_task = db.query(Task.created_at).filter(
-                Task.user_id == user_id
-            ).order_by(desc(Task.created_at)).first()
-            if latest_task:
-                last_activities.append(latest_task[0])
-            
-            # Get the most recent activity or fall back to user creation/update date
-            if last_activities:
-                # Normalize all datetime objects to timezone-naive for comparison
-                normalized_activities = [normalize_datetime(dt) for dt in last_activities]
-                last_active = max(normalized_activities)
-            else:
-                last_active = normalize_datetime(updated_at or created_at)
-            
-            # Format last active date
-            last_active_str = last_active.strftime("%Y-%m-%d %H:%M") if last_active else None
-            
-            # Format created_at date
-            created_at_str = created_at.strftime("%Y-%m-%d %H:%M") if created_at else None
-            
-            # Get display name using our helper function
-            display_name = AdminService._get_user_display_name(name, username, email, user_id)
-            
-            user_list.append({
-                "id": user_id,
-                "name": display_name,
-                "email": email,
-                "ai_requests": total_ai_requests,
-                "last_active": last_active_str,
-                "created_at": created_at_str,
-                "profile_picture": profile_image
-            })
-        
-        return user_list
+        return AdminService.get_users_page(db, search_term=search_term, limit=limit, offset=offset)[0]
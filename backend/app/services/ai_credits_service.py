@@ -3,6 +3,7 @@ AI Credits Service for managing user AI credits and validation.
 """
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.services.subscription_service import SubscriptionService
@@ -68,6 +69,44 @@ class AICreditService:
         
         return True
     
+    @staticmethod
+    async def acheck_and_deduct_credits(db: AsyncSession, user: User, credits_required: int = 1) -> bool:
+        """
+        check_and_deduct_credits for async routes using an AsyncSession.
+        The request's user may be a stale copy rebuilt from the principal cache, so the row is
+        re-read under a row lock and only that fresh row is changed; merging the request
+        instance would write its other columns (profile, token_version) back as well.
+        """
+        def deduct(session: Session) -> bool:
+            db_user = session.get(User, user.id, with_for_update=True)
+            if db_user is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+            return AICreditService.check_and_deduct_credits(session, db_user, credits_required)
+        
+        return await db.run_sync(deduct)
+    
+    @staticmethod
+    def refund_credits(db: Session, user: User, credits_to_refund: int) -> None:
+        """
+        Give back credits charged for work that then failed.
+        Subscription tokens are returned first, since check_and_deduct_credits takes them last.
+        
+        Args:
+            db: Database session
+            user: User object
+            credits_to_refund: Number of credits to give back
+        """
+        if credits_to_refund <= 0:
+            return
+        
+        subscription_tokens_used = user.subscription_tokens_used if user.subscription_tokens_used is not None else 0
+        from_subscription = min(subscription_tokens_used, credits_to_refund)
+        user.subscription_tokens_used = subscription_tokens_used - from_subscription
+        user.ai_credits += credits_to_refund - from_subscription
+        
+        db.commit()
+        db.refresh(user)
+    
     @staticmethod
     def add_credits(db: Session, user: User, credits_to_add: int) -> int:
         """
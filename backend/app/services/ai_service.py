@@ -1,12 +1,15 @@
+import asyncio
 import os
 import re
 import requests
 import json
 import hashlib
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple, Union
 
 from app.core.config import settings
-from app.utils.cache import cache, cache_ai_response, CacheKeys
+from app.utils.cache import cache, async_cache, cache_ai_response, CacheKeys
+from app.utils.streaming import IncrementalJSONObjectParser
+from app.services.bedrock_router import TASK_LONG
 
 # Import AWS base service
 try:
@@ -19,6 +22,9 @@ class AIService:
     """Service for AI-powered content generation using AWS Bedrock"""
     
     def __init__(self):
+        # In-flight generations keyed by prompt hash, shared by concurrent identical prompts
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        
         # Initialize AWS AI service
         self.aws_ai_service = None
         if AWS_AVAILABLE and settings.USE_AWS_AI:
@@ -84,6 +90,151 @@ class AIService:
             # Re-raise the exception instead of falling back
             raise Exception(f"AWS Bedrock generation failed: {error_message}")
     
+    async def _aget_cached_response(self, prompt_hash: str) -> Optional[Any]:
+        """Get cached AI response without blocking the event loop"""
+        return await async_cache.get(f"{CacheKeys.AI_RESPONSE}:{prompt_hash}")
+    
+    async def _acache_response(self, prompt_hash: str, response: Any) -> bool:
+        """Cache AI response without blocking the event loop"""
+        return await async_cache.set(f"{CacheKeys.AI_RESPONSE}:{prompt_hash}", response, settings.CACHE_AI_RESPONSES_TTL)
+    
+    async def _adrop_cached_response(self, prompt: str) -> bool:
+        """Forget a cached AI response the caller could not use, so the next request regenerates it"""
+        return await async_cache.delete(f"{CacheKeys.AI_RESPONSE}:{self._generate_prompt_hash(prompt)}")
+    
+    async def _agenerate_with_aws(self, prompt: str, task_type: Optional[str] = None) -> str:
+        """
+        Async variant of _generate_with_aws; Bedrock runs on the shared execution pool.
+        Concurrent identical prompts share a single in-flight generation (single-flight).
+        task_type picks the model route (see bedrock_router).
+        """
+        prompt_hash = self._generate_prompt_hash(prompt)
+        
+        cached_response = await self._aget_cached_response(prompt_hash)
+        if cached_response is not None:
+            print(f"Cache hit for AI prompt hash: {prompt_hash}")
+            return cached_response
+        
+        if not self.aws_ai_service:
+            error_msg = "AWS AI service not initialized. Please check your AWS configuration."
+            print(error_msg)
+            raise Exception(error_msg)
+        
+        entry = self._inflight.get(prompt_hash)
+        if entry is None:
+            task = asyncio.ensure_future(self._generate_single_flight(prompt, prompt_hash, task_type))
+            entry = {"task": task, "waiters": 0}
+            self._inflight[prompt_hash] = entry
+            task.add_done_callback(lambda _: self._release_inflight(prompt_hash, entry))
+        else:
+            print(f"Joining in-flight generation for prompt hash: {prompt_hash}")
+        
+        entry["waiters"] += 1
+        try:
+            # Shielded so one waiter's cancellation does not fail the others
+            return await asyncio.shield(entry["task"])
+        finally:
+            entry["waiters"] -= 1
+            if entry["waiters"] == 0 and not entry["task"].done():
+                # Every caller has gone away (e.g. clients disconnected)
+                self._release_inflight(prompt_hash, entry)
+                entry["task"].cancel()
+    
+    def _release_inflight(self, prompt_hash: str, entry: Dict[str, Any]):
+        """Forget an in-flight generation so later callers start a fresh one"""
+        if self._inflight.get(prompt_hash) is entry:
+            del self._inflight[prompt_hash]
+    
+    async def _generate_single_flight(self, prompt: str, prompt_hash: str, task_type: Optional[str] = None) -> str:
+        """Generate a prompt while holding the cross-worker lock for its hash"""
+        lock_name = f"{CacheKeys.AI_RESPONSE}:{prompt_hash}"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.AI_SINGLE_FLIGHT_LOCK_TTL
+        
+        token = await async_cache.acquire_lock(lock_name, settings.AI_SINGLE_FLIGHT_LOCK_TTL)
+        while token is None:
+            # Another worker is generating this prompt; wait for its cached result
+            await asyncio.sleep(settings.AI_SINGLE_FLIGHT_POLL_INTERVAL)
+            cached_response = await self._aget_cached_response(prompt_hash)
+            if cached_response is not None:
+                print(f"Received result from another worker for prompt hash: {prompt_hash}")
+                return cached_response
+            if loop.time() > deadline:
+                break
+            token = await async_cache.acquire_lock(lock_name, settings.AI_SINGLE_FLIGHT_LOCK_TTL)
+        
+        try:
+            # The previous holder may have finished between our cache check and taking the lock
+            cached_response = await self._aget_cached_response(prompt_hash)
+            if cached_response is not None:
+                return cached_response
+            
+            print(f"Generating with AWS Bedrock for prompt hash: {prompt_hash}")
+            response = await self.aws_ai_service.agenerate_text(prompt, task_type=task_type)
+            
+            if not response or response.strip() == "":
+                raise Exception("AWS Bedrock returned empty response")
+            
+            await self._acache_response(prompt_hash, response)
+            print(f"Successfully generated and cached response for hash: {prompt_hash}")
+            return response
+            
+        except Exception as e:
+            error_message = str(e)
+            print(f"AWS AI error for prompt hash {prompt_hash}: {error_message}")
+            raise Exception(f"AWS Bedrock generation failed: {error_message}")
+        finally:
+            if token is not None:
+                await async_cache.release_lock(lock_name, token)
+    
+    async def agenerate_many(self, prompts: Dict[str, str], max_concurrency: Optional[int] = None) -> Dict[str, Union[str, BaseException]]:
+        """
+        Generate several independent prompts concurrently.
+        Returns a dict with the same keys; a failed or cancelled prompt maps to its exception
+        so callers can keep the sections that succeeded.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.AI_FANOUT_MAX_CONCURRENCY)
+        
+        async def generate(prompt: str) -> str:
+            async with semaphore:
+                return await self._agenerate_with_aws(prompt)
+        
+        keys = list(prompts.keys())
+        results = await asyncio.gather(
+            *(generate(prompts[key]) for key in keys),
+            return_exceptions=True
+        )
+        return dict(zip(keys, results))
+    
+    async def _astream_with_aws(self, prompt: str, task_type: Optional[str] = None, cache_result: bool = True) -> AsyncIterator[str]:
+        """
+        Stream text from AWS Bedrock; a cached response is replayed as a single chunk.
+        Callers that validate the text pass cache_result=False and cache it themselves once accepted.
+        """
+        prompt_hash = self._generate_prompt_hash(prompt)
+        
+        cached_response = await self._aget_cached_response(prompt_hash)
+        if cached_response is not None:
+            print(f"Cache hit for AI prompt hash: {prompt_hash}")
+            yield cached_response
+            return
+        
+        if not self.aws_ai_service:
+            error_msg = "AWS AI service not initialized. Please check your AWS configuration."
+            print(error_msg)
+            raise Exception(error_msg)
+        
+        print(f"Streaming with AWS Bedrock for prompt hash: {prompt_hash}")
+        chunks = []
+        async for chunk in self.aws_ai_service.astream_text(prompt, task_type=task_type):
+            chunks.append(chunk)
+            yield chunk
+        
+        response = "".join(chunks)
+        if cache_result and response.strip():
+            await self._acache_response(prompt_hash, response)
+            print(f"Successfully streamed and cached response for hash: {prompt_hash}")
+    
     def _get_fallback_response(self, error_message: str) -> str:
         """Generate appropriate fallback response based on error type"""
         error_lower = error_message.lower()
@@ -254,7 +405,7 @@ Please try again in a few minutes for full AI assistance, or contact support for
         
         Format the response as a JSON object with these sections.
         """
-        content = self._generate_with_aws(prompt)
+        content = await self._agenerate_with_aws(prompt)
         # Try to parse as JSON
         try:
             return json.loads(content)
@@ -280,18 +431,18 @@ Please try again in a few minutes for full AI assistance, or contact support for
         The cover letter should be professional, highlight the applicant's relevant experience, 
         explain why they're a good fit for the role, and demonstrate enthusiasm for the position.
         """
-        content = self._generate_with_aws(prompt)
+        content = await self._agenerate_with_aws(prompt)
         return content if isinstance(content, str) else str(content)
 
-    async def generate_structured_cover_letter(self, resume) -> Dict[str, Any]:
-        """Generate a structured cover letter in JSON format based on resume data"""
+    def _build_structured_cover_letter_prompt(self, resume) -> str:
+        """Build the structured cover letter prompt from resume data"""
         # Extract resume information
         profile_data = resume.profile if resume.profile else {}
         work_history = resume.work_history if resume.work_history else []
         skills = resume.skills.get("skills", []) if resume.skills else []
         
         # Create the AI prompt for structured cover letter generation
-        prompt = f"""You are a professional cover letter writer. Your task is to generate a valid JSON object for a cover letter.
+        return f"""You are a professional cover letter writer. Your task is to generate a valid JSON object for a cover letter.
 
 CRITICAL RULES:
 1. Return ONLY valid JSON - no explanations, no markdown, no code blocks
@@ -341,6 +492,23 @@ Skills: {', '.join(skills[:5]) if skills else 'Leadership, Communication, Proble
 Experience: {str(work_history)[:300] if work_history else 'Extensive professional experience across various roles and industries'}
 
 Make the content professional, specific, and tailored to the candidate's background. Return only the JSON object."""
+    
+    def _build_simplified_cover_letter_prompt(self, resume) -> str:
+        """Shorter prompt used to retry after the full prompt produced unusable JSON"""
+        profile_data = resume.profile if resume.profile else {}
+        skills = resume.skills.get("skills", []) if resume.skills else []
+        return f"""Generate a professional cover letter as pure JSON. Use this exact structure and fill with realistic data:
+
+{{"cover_letter_title":"Professional Cover Letter","cover_letter_type":"professional","cover_template_category":"modern","profile":{{"full_name":"Generate name","email":"Generate email","phone_number":"Generate phone","linkedin_profile":"Generate LinkedIn URL","portfolio_website":"Generate website","location":"Generate location"}},"recipient":{{"hiring_manager_name":"Generate manager name","job_title":"Generate job title","company_name":"Generate company","company_address":"Generate address"}},"introduction":{{"greet_text":"Dear Hiring Manager,","intro_para":"Generate professional intro"}},"body":"Generate professional body with \\n for paragraphs","closing":{{"text":"Generate professional closing"}}}}
+
+Use resume context: Name: {profile_data.get('fullName', 'Professional')}, Skills: {', '.join(skills[:3]) if skills else 'Professional skills'}
+
+Return only valid JSON, no extra text."""
+    
+    async def generate_structured_cover_letter(self, resume) -> Dict[str, Any]:
+        """Generate a structured cover letter in JSON format based on resume data"""
+        # Create the AI prompt for structured cover letter generation
+        prompt = self._build_structured_cover_letter_prompt(resume)
         
         # Try to generate with AI multiple times
         max_retries = 3
@@ -349,7 +517,7 @@ Make the content professional, specific, and tailored to the candidate's backgro
                 print(f"AI generation attempt {attempt + 1} of {max_retries}")
                 
                 # Generate the content using AWS
-                raw_response = self._generate_with_aws(prompt)
+                raw_response = await self._agenerate_with_aws(prompt)
                 print(f"Raw AI response (first 500 chars): {raw_response[:500]}...")
                 
                 # Clean the response to extract pure JSON
@@ -372,6 +540,8 @@ Make the content professional, specific, and tailored to the candidate's backgro
                 else:
                     missing_fields = [field for field in required_fields if field not in cover_letter_data]
                     print(f"AI response missing required fields: {missing_fields}")
+                    # Do not replay the incomplete response on the next attempt
+                    await self._adrop_cached_response(prompt)
                     
             except json.JSONDecodeError as e:
                 print(f"JSON parsing failed on attempt {attempt + 1}: {str(e)}")
@@ -394,15 +564,10 @@ Make the content professional, specific, and tailored to the candidate's backgro
                 except Exception as fix_error:
                     print(f"JSON fix attempt failed: {str(fix_error)}")
                 
+                await self._adrop_cached_response(prompt)
                 if attempt < max_retries - 1:
                     # Try a simplified prompt for next attempt
-                    prompt = f"""Generate a professional cover letter as pure JSON. Use this exact structure and fill with realistic data:
-
-{{"cover_letter_title":"Professional Cover Letter","cover_letter_type":"professional","cover_template_category":"modern","profile":{{"full_name":"Generate name","email":"Generate email","phone_number":"Generate phone","linkedin_profile":"Generate LinkedIn URL","portfolio_website":"Generate website","location":"Generate location"}},"recipient":{{"hiring_manager_name":"Generate manager name","job_title":"Generate job title","company_name":"Generate company","company_address":"Generate address"}},"introduction":{{"greet_text":"Dear Hiring Manager,","intro_para":"Generate professional intro"}},"body":"Generate professional body with \\n for paragraphs","closing":{{"text":"Generate professional closing"}}}}
-
-Use resume context: Name: {profile_data.get('fullName', 'Professional')}, Skills: {', '.join(skills[:3]) if skills else 'Professional skills'}
-
-Return only valid JSON, no extra text."""
+                    prompt = self._build_simplified_cover_letter_prompt(resume)
                     continue
             except Exception as e:
                 print(f"Unexpected error on attempt {attempt + 1}: {str(e)}")
@@ -411,6 +576,57 @@ Return only valid JSON, no extra text."""
         print("All AI generation attempts failed, raising exception")
         raise Exception("AI service failed to generate valid cover letter data after multiple attempts. Please try again or contact support.")
 
+    async def stream_structured_cover_letter(self, resume) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream a structured cover letter as (event, data) pairs.
+        Emits "delta" for raw text, "section" for each top-level field as soon as it
+        closes, and a final "done" with the validated cover letter data. When the text
+        cannot be parsed, "retry" tells the client to discard what it received and the
+        generation starts again with the simplified prompt, as generate_structured_cover_letter does.
+        The response is only cached once it has been validated.
+        """
+        prompt = self._build_structured_cover_letter_prompt(resume)
+        required_fields = ['cover_letter_title', 'cover_letter_type', 'profile', 'recipient', 'introduction', 'body', 'closing']
+        max_retries = 3
+        
+        for attempt in range(max_retries):
+            parser = IncrementalJSONObjectParser(fixer=self._attempt_json_fix)
+            chunks = []
+            
+            async for chunk in self._astream_with_aws(prompt, cache_result=False):
+                chunks.append(chunk)
+                yield "delta", {"text": chunk}
+                for section_name, section_data in parser.feed(chunk):
+                    if section_name != 'id':
+                        yield "section", {"name": section_name, "data": section_data}
+            
+            raw_response = "".join(chunks)
+            cleaned_response = self._clean_ai_response(raw_response)
+            try:
+                try:
+                    cover_letter_data = json.loads(cleaned_response)
+                except json.JSONDecodeError:
+                    cover_letter_data = json.loads(self._attempt_json_fix(cleaned_response))
+                
+                missing_fields = [field for field in required_fields if field not in cover_letter_data]
+                if missing_fields:
+                    raise ValueError(f"AI response missing required fields: {missing_fields}")
+            except ValueError as e:
+                # JSONDecodeError is a ValueError too
+                print(f"Streamed cover letter unusable on attempt {attempt + 1}: {str(e)}")
+                # A response replayed from the cache may be the bad one
+                await self._adrop_cached_response(prompt)
+                if attempt == max_retries - 1:
+                    raise Exception("AI service failed to generate valid cover letter data after multiple attempts. Please try again or contact support.")
+                yield "retry", {"attempt": attempt + 2, "detail": str(e)}
+                prompt = self._build_simplified_cover_letter_prompt(resume)
+                continue
+            
+            await self._acache_response(self._generate_prompt_hash(prompt), raw_response)
+            cover_letter_data.pop('id', None)
+            yield "done", cover_letter_data
+            return
+    
     def _clean_ai_response(self, response: str) -> str:
         """Clean AI response by removing markdown formatting and extracting JSON"""
         if not response:
@@ -864,7 +1080,7 @@ Return only valid JSON, no extra text."""
             IMPORTANT: Start your response directly with {{ and end with }} - no other text or formatting.
             """
         
-        content = self._generate_with_aws(prompt)
+        content = await self._agenerate_with_aws(prompt)
         # Clean the response to remove any markdown formatting
         cleaned_content = self._clean_ai_response(content)
         return cleaned_content if isinstance(cleaned_content, str) else str(cleaned_content)
@@ -1062,28 +1278,22 @@ Return only valid JSON, no extra text."""
             IMPORTANT: Start your response directly with {{ and end with }} - no other text or formatting.
             """
         
-        content = self._generate_with_aws(prompt)
+        content = await self._agenerate_with_aws(prompt)
         # Clean the response to remove any markdown formatting
         cleaned_content = self._clean_ai_response(content)
         return cleaned_content if isinstance(cleaned_content, str) else str(cleaned_content)
     
-    async def improve_entire_resume(self, resume_data: dict) -> str:
-        """Improve multiple sections of a resume at once using AWS Bedrock"""
-        
-        print(f"Improving entire resume with sections: {list(resume_data.keys())}")
-        print(f"Resume data: {json.dumps(resume_data, indent=2, default=str)[:1000]}...")
-        
-        # Extract sections that need improvement
+    def _sections_to_improve(self, resume_data: dict) -> dict:
+        """Extract the resume sections that should be sent for improvement"""
         sections_to_improve = {}
         for section_name, section_content in resume_data.items():
             if section_content and section_name not in ['id', 'user_id', 'created_at', 'updated_at', 'pdf_url']:
                 sections_to_improve[section_name] = section_content
-        
-        print(f"Sections to improve: {list(sections_to_improve.keys())}")
-        
-        try:
-            # Use a simpler approach: provide clear examples and strict format requirements
-            prompt = f"""You are a professional resume writer. You must improve the provided resume sections and return them in a very specific JSON format.
+        return sections_to_improve
+    
+    def _build_entire_resume_prompt(self, sections_to_improve: dict) -> str:
+        """Build the whole-resume improvement prompt"""
+        return f"""You are a professional resume writer. You must improve the provided resume sections and return them in a very specific JSON format.
 
 INPUT RESUME DATA:
 {json.dumps(sections_to_improve, indent=2, ensure_ascii=False)}
@@ -1124,8 +1334,85 @@ CRITICAL REQUIREMENTS:
 - Start with {{ and end with }}
 
 Response:"""
+    
+    def _normalize_entire_resume_response(self, parsed: dict, sections_to_improve: dict) -> dict:
+        """Coerce a parsed whole-resume AI response into the original/improved structure"""
+        # Check if AI returned a proper structure or needs reconstruction
+        needs_reconstruction = False
+        reconstructed = {}
+        
+        # Check each section in the AI response
+        # Create a copy of items to avoid "dictionary changed size during iteration" error
+        parsed_items = list(parsed.items())
+        for section_name, section_data in parsed_items:
+            if isinstance(section_data, dict) and 'original' in section_data and 'improved' in section_data:
+                # This section has correct structure
+                reconstructed[section_name] = section_data
+            else:
+                # This section needs to be restructured
+                print(f"Warning: Section {section_name} has incorrect structure, reconstructing")
+                needs_reconstruction = True
+                
+                # Find the original data for this section
+                if section_name in sections_to_improve:
+                    original_data = sections_to_improve[section_name]
+                elif section_name == 'experience' and 'work_history' in sections_to_improve:
+                    # Special case: AI returned 'experience' but we sent 'work_history'
+                    original_data = sections_to_improve['work_history']
+                    # Remove the misplaced 'experience' and handle it properly below
+                    del parsed['experience']
+                    continue
+                else:
+                    original_data = section_data
+                
+                reconstructed[section_name] = {
+                    "original": original_data,
+                    "improved": section_data
+                }
+        
+        # Special handling for 'experience' key that should be part of 'work_history'
+        if 'experience' in parsed and 'work_history' in sections_to_improve:
+            print("Found 'experience' key, mapping to 'work_history' structure")
+            reconstructed['work_history'] = {
+                "original": sections_to_improve['work_history'],
+                "improved": {
+                    "experience": parsed['experience']
+                }
+            }
+            needs_reconstruction = True
+            # Remove the standalone 'experience' key if it exists
+            if 'experience' in reconstructed:
+                del reconstructed['experience']
+        
+        # Ensure all input sections are present in output
+        for section_name in sections_to_improve.keys():
+            if section_name not in reconstructed:
+                print(f"Warning: Missing section {section_name} in AI response, adding it")
+                reconstructed[section_name] = {
+                    "original": sections_to_improve[section_name],
+                    "improved": sections_to_improve[section_name]
+                }
+                needs_reconstruction = True
+        
+        # Use reconstructed version if needed, otherwise use original parsed
+        return reconstructed if needs_reconstruction else parsed
+    
+    async def improve_entire_resume(self, resume_data: dict) -> str:
+        """Improve multiple sections of a resume at once using AWS Bedrock"""
+        
+        print(f"Improving entire resume with sections: {list(resume_data.keys())}")
+        print(f"Resume data: {json.dumps(resume_data, indent=2, default=str)[:1000]}...")
+        
+        # Extract sections that need improvement
+        sections_to_improve = self._sections_to_improve(resume_data)
+        
+        print(f"Sections to improve: {list(sections_to_improve.keys())}")
+        
+        try:
+            # Use a simpler approach: provide clear examples and strict format requirements
+            prompt = self._build_entire_resume_prompt(sections_to_improve)
             
-            content = self._generate_with_aws(prompt)
+            content = await self._agenerate_with_aws(prompt, task_type=TASK_LONG)
             
             # Clean and validate the response
             cleaned_content = self._clean_ai_response(content)
@@ -1134,65 +1421,7 @@ Response:"""
             try:
                 parsed = json.loads(cleaned_content)
                 
-                # Check if AI returned a proper structure or needs reconstruction
-                needs_reconstruction = False
-                reconstructed = {}
-                
-                # Check each section in the AI response
-                # Create a copy of items to avoid "dictionary changed size during iteration" error
-                parsed_items = list(parsed.items())
-                for section_name, section_data in parsed_items:
-                    if isinstance(section_data, dict) and 'original' in section_data and 'improved' in section_data:
-                        # This section has correct structure
-                        reconstructed[section_name] = section_data
-                    else:
-                        # This section needs to be restructured
-                        print(f"Warning: Section {section_name} has incorrect structure, reconstructing")
-                        needs_reconstruction = True
-                        
-                        # Find the original data for this section
-                        if section_name in sections_to_improve:
-                            original_data = sections_to_improve[section_name]
-                        elif section_name == 'experience' and 'work_history' in sections_to_improve:
-                            # Special case: AI returned 'experience' but we sent 'work_history'
-                            original_data = sections_to_improve['work_history']
-                            # Remove the misplaced 'experience' and handle it properly below
-                            del parsed['experience']
-                            continue
-                        else:
-                            original_data = section_data
-                        
-                        reconstructed[section_name] = {
-                            "original": original_data,
-                            "improved": section_data
-                        }
-                
-                # Special handling for 'experience' key that should be part of 'work_history'
-                if 'experience' in parsed and 'work_history' in sections_to_improve:
-                    print("Found 'experience' key, mapping to 'work_history' structure")
-                    reconstructed['work_history'] = {
-                        "original": sections_to_improve['work_history'],
-                        "improved": {
-                            "experience": parsed['experience']
-                        }
-                    }
-                    needs_reconstruction = True
-                    # Remove the standalone 'experience' key if it exists
-                    if 'experience' in reconstructed:
-                        del reconstructed['experience']
-                
-                # Ensure all input sections are present in output
-                for section_name in sections_to_improve.keys():
-                    if section_name not in reconstructed:
-                        print(f"Warning: Missing section {section_name} in AI response, adding it")
-                        reconstructed[section_name] = {
-                            "original": sections_to_improve[section_name],
-                            "improved": sections_to_improve[section_name]
-                        }
-                        needs_reconstruction = True
-                
-                # Use reconstructed version if needed, otherwise use original parsed
-                final_result = reconstructed if needs_reconstruction else parsed
+                final_result = self._normalize_entire_resume_response(parsed, sections_to_improve)
                 
                 # Return the validated and corrected JSON
                 return json.dumps(final_result, indent=2, ensure_ascii=False)
@@ -1223,6 +1452,53 @@ Response:"""
                 }
             return json.dumps(error_structure, indent=2, ensure_ascii=False)
 
+    def _normalize_streamed_resume_section(self, section_name: str, section_data: Any, sections_to_improve: dict) -> Tuple[str, Any]:
+        """Coerce a single streamed whole-resume section into the original/improved structure"""
+        if section_name == 'experience' and 'work_history' in sections_to_improve:
+            return 'work_history', {
+                "original": sections_to_improve['work_history'],
+                "improved": {"experience": section_data}
+            }
+        if isinstance(section_data, dict) and 'original' in section_data and 'improved' in section_data:
+            return section_name, section_data
+        return section_name, {
+            "original": sections_to_improve.get(section_name, section_data),
+            "improved": section_data
+        }
+    
+    async def stream_improve_entire_resume(self, resume_data: dict) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream whole-resume improvements as (event, data) pairs.
+        Emits "delta" for raw text, "section" for each improved section as soon as it
+        closes (e.g. profile, work_history, skills), and a final "done" with the full result.
+        """
+        sections_to_improve = self._sections_to_improve(resume_data)
+        prompt = self._build_entire_resume_prompt(sections_to_improve)
+        parser = IncrementalJSONObjectParser(fixer=self._attempt_json_fix)
+        chunks = []
+        
+        async for chunk in self._astream_with_aws(prompt, task_type=TASK_LONG):
+            chunks.append(chunk)
+            yield "delta", {"text": chunk}
+            for section_name, section_data in parser.feed(chunk):
+                name, data = self._normalize_streamed_resume_section(section_name, section_data, sections_to_improve)
+                yield "section", {"name": name, "data": data}
+        
+        cleaned_content = self._clean_ai_response("".join(chunks))
+        try:
+            parsed = json.loads(cleaned_content)
+            final_result = self._normalize_entire_resume_response(parsed, sections_to_improve)
+        except json.JSONDecodeError as e:
+            print(f"Streamed AI response is not valid JSON: {str(e)}")
+            final_result = {
+                section_name: {
+                    "original": section_content,
+                    "improved": section_content  # No improvement if AI failed
+                }
+                for section_name, section_content in sections_to_improve.items()
+            }
+        yield "done", final_result
+
 # Create a global instance
 ai_service = AIService()
 
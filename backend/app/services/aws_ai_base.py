@@ -1,127 +1,287 @@
+import asyncio
 import boto3
+import functools
 import json
 import logging
-from typing import Dict, Any, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Iterator
+from fastapi import HTTPException, Request
 from app.core.config import settings
+from app.services.bedrock_router import bedrock_router
+from app.utils.cache import cache
 
 logger = logging.getLogger(__name__)
 
-class AWSBaseAIService:
+# Sentinel pushed by the pool thread when a streamed call is exhausted
+_STREAM_END = object()
+
+
+class BedrockExecutor:
     """
-    Base AWS AI Service Class
-    Provides common functionality for AWS AI services including Bedrock, Polly, Comprehend, etc.
+    Bounded execution pool for blocking Bedrock calls.
+    boto3 has no asyncio client, so calls run on a dedicated thread pool while the
+    event loop keeps serving other requests. Each model id gets its own concurrency
+    limit so one throttled model cannot take every thread.
     """
     
-    def __init__(self):
-        self.aws_access_key_id = settings.AWS_ACCESS_KEY_ID
-        self.aws_secret_access_key = settings.AWS_SECRET_ACCESS_KEY
-        self.region = settings.AWS_BEDROCK_REGION
+    def __init__(self, max_workers: int, per_model_limit: int):
+        self.max_workers = max_workers
+        self.per_model_limit = per_model_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bedrock")
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+    
+    def _model_stats(self, model_id: str) -> Dict[str, int]:
+        if model_id not in self._stats:
+            self._stats[model_id] = {
+                "queued": 0,
+                "in_flight": 0,
+                "completed": 0,
+                "failed": 0,
+                "cancelled": 0
+            }
+        return self._stats[model_id]
+    
+    def _semaphore(self, model_id: str) -> asyncio.Semaphore:
+        if model_id not in self._semaphores:
+            self._semaphores[model_id] = asyncio.Semaphore(self.per_model_limit)
+        return self._semaphores[model_id]
+    
+    async def _acquire(self, model_id: str) -> asyncio.Semaphore:
+        """Wait for a free slot for model_id, tracking queue depth while waiting"""
+        stats = self._model_stats(model_id)
+        semaphore = self._semaphore(model_id)
         
-        # Initialize AWS clients
-        self.bedrock_client = None
-        self.polly_client = None
-        self.comprehend_client = None
-        self.transcribe_client = None
+        stats["queued"] += 1
+        try:
+            await semaphore.acquire()
+        except asyncio.CancelledError:
+            stats["cancelled"] += 1
+            raise
+        finally:
+            stats["queued"] -= 1
+        return semaphore
+    
+    async def run(self, model_id: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call for model_id on the pool, waiting for a free slot first"""
+        stats = self._model_stats(model_id)
+        semaphore = await self._acquire(model_id)
         
-        if self.aws_access_key_id and self.aws_secret_access_key:
-            self._initialize_clients()
+        stats["in_flight"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            # Cancelling the awaiting task drops the job if it has not started yet;
+            # a call already running in a thread finishes but its result is discarded.
+            result = await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+            stats["completed"] += 1
+            return result
+        except asyncio.CancelledError:
+            stats["cancelled"] += 1
+            raise
+        except Exception:
+            stats["failed"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+            semaphore.release()
     
-    def _initialize_clients(self):
-        """Initialize AWS service clients"""
+    async def stream(self, model_id: str, func: Callable[..., Iterator[Any]], *args, **kwargs) -> AsyncIterator[Any]:
+        """
+        Drain a blocking iterator for model_id on the pool, yielding items as they arrive.
+        If the consumer stops early (e.g. the client disconnected), the pool thread
+        stops reading from the underlying stream at the next item.
+        """
+        stats = self._model_stats(model_id)
+        semaphore = await self._acquire(model_id)
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        
+        def push(item, error=None):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                # Event loop already closed
+                stop.set()
+        
+        def pump():
+            try:
+                for item in func(*args, **kwargs):
+                    if stop.is_set():
+                        break
+                    push(item)
+                push(_STREAM_END)
+            except Exception as e:
+                push(_STREAM_END, e)
+        
+        stats["in_flight"] += 1
+        loop.run_in_executor(self._executor, pump)
         try:
-            # Bedrock client for text generation
-            self.bedrock_client = boto3.client(
-                'bedrock-runtime',
-                region_name=self.region,
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key
-            )
-            
-            # Polly client for text-to-speech
-            self.polly_client = boto3.client(
-                'polly',
-                region_name=settings.AWS_BEDROCK_REGION,
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key
-            )
-            
-            # Comprehend client for NLP tasks
-            self.comprehend_client = boto3.client(
-                'comprehend',
-                region_name=settings.AWS_COMPREHEND_REGION,
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key
-            )
-            
-            # Transcribe client for speech-to-text
-            self.transcribe_client = boto3.client(
-                'transcribe',
-                region_name=settings.AWS_TRANSCRIBE_REGION,
-                aws_access_key_id=self.aws_access_key_id,
-                aws_secret_access_key=self.aws_secret_access_key
-            )
-            
-            logger.info("AWS AI service clients initialized successfully")
-            
-            # Test Bedrock availability and log working models
-            self._test_bedrock_models()
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize AWS AI service clients: {str(e)}")
+            while True:
+                item, error = await queue.get()
+                if item is _STREAM_END:
+                    if error is not None:
+                        raise error
+                    break
+                yield item
+            stats["completed"] += 1
+        except (asyncio.CancelledError, GeneratorExit):
+            stats["cancelled"] += 1
             raise
+        except Exception:
+            stats["failed"] += 1
+            raise
+        finally:
+            stop.set()
+            stats["in_flight"] -= 1
+            semaphore.release()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and outcome counters, overall and per model"""
+        models = {model_id: dict(stats) for model_id, stats in self._stats.items()}
+        return {
+            "max_workers": self.max_workers,
+            "per_model_limit": self.per_model_limit,
+            "queue_depth": sum(stats["queued"] for stats in models.values()),
+            "in_flight": sum(stats["in_flight"] for stats in models.values()),
+            "models": models
+        }
+
+
+# Shared by every AWSBaseAIService instance in the process
+bedrock_executor = BedrockExecutor(
+    max_workers=settings.BEDROCK_MAX_WORKERS,
+    per_model_limit=settings.BEDROCK_MAX_CONCURRENCY_PER_MODEL
+)
+
+
+async def run_until_disconnected(request: Request, awaitable: Awaitable, poll_interval: float = 0.5) -> Any:
+    """
+    Await an AI call, cancelling it if the HTTP client goes away first.
+    Raises HTTPException 499 when the client disconnected.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info(f"Client disconnected, cancelling AI request for {request.url.path}")
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client disconnected")
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+class AWSClientRegistry:
+    """
+    Process-wide registry of boto3 clients.
+    Clients are created on first use and shared by every AWSBaseAIService, so
+    importing a service does no client construction and no network I/O.
+    boto3 clients are thread-safe, so one per service/region is enough.
+    """
+    
+    def __init__(self):
+        self._clients: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
     
-    def _test_bedrock_models(self):
+    def get(self, service_name: str, region: str):
+        key = (service_name, region)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = boto3.client(
+                        service_name,
+                        region_name=region,
+                        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY
+                    )
+                    self._clients[key] = client
+                    logger.info(f"AWS {service_name} client initialized for {region}")
+        return client
+
+
+aws_clients = AWSClientRegistry()
+
+
+class BedrockModelProbe:
+    """
+    Cached Bedrock model availability.
+    The probe makes a tiny converse call per candidate model, so results are kept
+    in Redis (or a local file when Redis is down) for BEDROCK_PROBE_TTL seconds and
+    shared by all workers instead of being re-run by every service instance.
+    """
+    
+    CACHE_KEY = "bedrock:available_models"
+    CANDIDATE_MODELS = [
+        "us.amazon.nova-lite-v1:0",  # Nova Lite inference profile (confirmed working)
+        "us.amazon.nova-micro-v1:0", # Nova Micro inference profile (confirmed working)
+        "us.amazon.nova-pro-v1:0",   # Nova Pro inference profile (confirmed working)
+    ]
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local_result: Optional[Dict[str, Any]] = None
+    
+    def _is_fresh(self, result: Optional[Dict[str, Any]]) -> bool:
+        return bool(result) and time.time() - result.get("checked_at", 0) < settings.BEDROCK_PROBE_TTL
+    
+    def _load(self) -> Optional[Dict[str, Any]]:
+        if self._is_fresh(self._local_result):
+            return self._local_result
+        result = cache.get(self.CACHE_KEY)
+        if result is None and os.path.exists(settings.BEDROCK_PROBE_CACHE_FILE):
+            try:
+                with open(settings.BEDROCK_PROBE_CACHE_FILE) as f:
+                    result = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read Bedrock probe cache file: {e}")
+        if self._is_fresh(result):
+            self._local_result = result
+            return result
+        return None
+    
+    def _store(self, result: Dict[str, Any]):
+        self._local_result = result
+        if not cache.set(self.CACHE_KEY, result, settings.BEDROCK_PROBE_TTL):
+            try:
+                with open(settings.BEDROCK_PROBE_CACHE_FILE, "w") as f:
+                    json.dump(result, f)
+            except OSError as e:
+                logger.warning(f"Could not write Bedrock probe cache file: {e}")
+    
+    def _probe(self, bedrock_client) -> Dict[str, Any]:
         """Test which Bedrock models are available"""
-        if not self.bedrock_client:
-            return
-            
-        test_models = [
-            "us.amazon.nova-lite-v1:0",  # Nova Lite inference profile (confirmed working)
-            "us.amazon.nova-micro-v1:0", # Nova Micro inference profile (confirmed working)
-            "us.amazon.nova-pro-v1:0",   # Nova Pro inference profile (confirmed working)
-            settings.AWS_BEDROCK_MODEL_ID
-        ]
-        
+        candidates = list(dict.fromkeys(self.CANDIDATE_MODELS + [settings.AWS_BEDROCK_MODEL_ID]))
         available_models = []
         
-        for model_id in test_models:
+        for model_id in candidates:
+            # All our models are Nova models that use converse API
+            if not ("amazon.nova" in model_id or "us.amazon.nova" in model_id):
+                continue
             try:
-                # Simple test prompt
-                test_prompt = "Hello"
-                
-                # All our models are Nova models that use converse API
-                if "amazon.nova" in model_id or "us.amazon.nova" in model_id:
-                    try:
-                        response = self.bedrock_client.converse(
-                            modelId=model_id,
-                            messages=[
-                                {
-                                    "role": "user",
-                                    "content": [{"text": test_prompt}]
-                                }
-                            ],
-                            inferenceConfig={
-                                "maxTokens": 10,
-                                "temperature": 0.1
-                            }
-                        )
-                        # If we get here, the model is available
-                        available_models.append(model_id)
-                        logger.info(f"✓ Model available: {model_id}")
-                        continue
-                    except Exception as e:
-                        error_msg = str(e)
-                        if "AccessDenied" in error_msg or "not authorized" in error_msg:
-                            logger.warning(f"✗ Model access denied: {model_id}")
-                        elif "ValidationException" in error_msg or "invalid" in error_msg:
-                            logger.warning(f"✗ Model not found: {model_id}")
-                        else:
-                            logger.warning(f"✗ Model test failed: {model_id} - {error_msg}")
-                        continue
-                else:
-                    # Skip non-Nova models
-                    continue
-                    
+                bedrock_client.converse(
+                    modelId=model_id,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": [{"text": "Hi"}]
+                        }
+                    ],
+                    inferenceConfig={
+                        "maxTokens": 1,
+                        "temperature": 0.1
+                    }
+                )
+                available_models.append(model_id)
+                logger.info(f"✓ Model available: {model_id}")
             except Exception as e:
                 error_msg = str(e)
                 if "AccessDenied" in error_msg or "not authorized" in error_msg:
@@ -135,95 +295,291 @@ class AWSBaseAIService:
             logger.info(f"Available Bedrock models: {', '.join(available_models)}")
         else:
             logger.error("No Bedrock models are available!")
+        
+        return {"available_models": available_models, "checked_at": time.time()}
     
-    def get_available_models(self) -> list:
-        """Get list of available Bedrock models"""
+    def get_available_models(self, bedrock_client, refresh: bool = False) -> list:
+        """Cached list of available models; probes only when the cache is stale"""
+        if not refresh:
+            result = self._load()
+            if result is not None:
+                return result["available_models"]
+        
+        with self._lock:
+            if not refresh:
+                # Another thread may have probed while we waited
+                result = self._load()
+                if result is not None:
+                    return result["available_models"]
+            result = self._probe(bedrock_client)
+            self._store(result)
+            return result["available_models"]
+    
+    def start_background_probe(self, bedrock_client):
+        """Warm the cache on a daemon thread so startup never waits for Bedrock"""
+        def run():
+            try:
+                self.get_available_models(bedrock_client)
+            except Exception as e:
+                logger.warning(f"Background Bedrock probe failed: {e}")
+        
+        threading.Thread(target=run, name="bedrock-probe", daemon=True).start()
+
+
+bedrock_model_probe = BedrockModelProbe()
+
+
+class AWSBaseAIService:
+    """
+    Base AWS AI Service Class
+    Provides common functionality for AWS AI services including Bedrock, Polly, Comprehend, etc.
+    Clients come from the shared, lazily-initialized aws_clients registry.
+    """
+    
+    def __init__(self):
+        self.aws_access_key_id = settings.AWS_ACCESS_KEY_ID
+        self.aws_secret_access_key = settings.AWS_SECRET_ACCESS_KEY
+        self.region = settings.AWS_BEDROCK_REGION
+    
+    def _has_credentials(self) -> bool:
+        return bool(self.aws_access_key_id and self.aws_secret_access_key)
+    
+    @property
+    def bedrock_client(self):
+        """Bedrock client for text generation"""
+        return aws_clients.get('bedrock-runtime', self.region) if self._has_credentials() else None
+    
+    @property
+    def polly_client(self):
+        """Polly client for text-to-speech"""
+        return aws_clients.get('polly', settings.AWS_BEDROCK_REGION) if self._has_credentials() else None
+    
+    @property
+    def comprehend_client(self):
+        """Comprehend client for NLP tasks"""
+        return aws_clients.get('comprehend', settings.AWS_COMPREHEND_REGION) if self._has_credentials() else None
+    
+    @property
+    def transcribe_client(self):
+        """Transcribe client for speech-to-text"""
+        return aws_clients.get('transcribe', settings.AWS_TRANSCRIBE_REGION) if self._has_credentials() else None
+    
+    def start_background_probe(self):
+        """Kick off the cached model availability probe without blocking"""
+        if self._has_credentials():
+            bedrock_model_probe.start_background_probe(self.bedrock_client)
+    
+    def get_available_models(self, refresh: bool = False) -> list:
+        """Get list of available Bedrock models (cached, see BedrockModelProbe)"""
         if not self.bedrock_client:
             return []
-            
-        available_models = []
-        test_models = [
-            "us.amazon.nova-lite-v1:0",  # Nova Lite inference profile (confirmed working)
-            "us.amazon.nova-micro-v1:0", # Nova Micro inference profile (confirmed working) 
-            "us.amazon.nova-pro-v1:0",   # Nova Pro inference profile (confirmed working)
-        ]
+        return bedrock_model_probe.get_available_models(self.bedrock_client, refresh=refresh)
+    
+    def _converse_text(self, model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Single blocking converse call against one Nova model"""
+        response = self.bedrock_client.converse(
+            modelId=model_id,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [{"text": prompt}]
+                }
+            ],
+            inferenceConfig={
+                "maxTokens": max_tokens,
+                "temperature": temperature
+            }
+        )
+        return response['output']['message']['content'][0]['text']
+    
+    def _timed_converse(self, model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """_converse_text that reports its outcome and latency to the model router"""
+        started = time.monotonic()
+        try:
+            result = self._converse_text(model_id, prompt, max_tokens, temperature)
+        except Exception as e:
+            bedrock_router.record_failure(model_id, e)
+            raise
+        bedrock_router.record_success(model_id, time.monotonic() - started)
+        return result
+    
+    def generate_text_with_bedrock(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                                   task_type: Optional[str] = None) -> str:
+        """
+        Generate text using AWS Bedrock Nova models.
+        Models are tried in the router's order for task_type, skipping open circuits.
+        """
+        if not self.bedrock_client:
+            raise Exception("AWS Bedrock client not initialized")
+        
+        task_type = task_type or bedrock_router.classify(max_tokens)
+        last_error = None
         
-        for model_id in test_models:
+        for model_id in bedrock_router.route(task_type):
+            if not bedrock_router.try_acquire(model_id):
+                logger.info(f"Skipping model with open circuit: {model_id}")
+                continue
             try:
-                # Quick availability check using converse API for Nova models
-                if "amazon.nova" in model_id or "us.amazon.nova" in model_id:
-                    self.bedrock_client.converse(
-                        modelId=model_id,
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": [{"text": "Hi"}]
-                            }
-                        ],
-                        inferenceConfig={
-                            "maxTokens": 1,
-                            "temperature": 0.1
-                        }
-                    )
-                    available_models.append(model_id)
-                else:
-                    # Skip non-Nova models
-                    continue
-            except:
+                logger.info(f"Attempting to use model: {model_id} ({task_type} task)")
+                result = self._timed_converse(model_id, prompt, max_tokens, temperature)
+                logger.info(f"Successfully generated text using Nova model: {model_id}")
+                return result
+            except Exception as e:
+                if bedrock_router.is_client_error(e):
+                    raise
+                logger.warning(f"Model {model_id} failed: {str(e)}")
+                last_error = e
                 continue
-                
-        return available_models
+        
+        if last_error is None:
+            raise Exception("All AWS Bedrock models are unavailable (circuits open)")
+        
+        # If all models failed, raise the last error
+        logger.error(f"All AWS Bedrock models failed. Last error: {str(last_error)}")
+        raise last_error
+    
+    async def _arouted_converse(self, model_id: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """One routed converse call on the shared Bedrock pool"""
+        try:
+            return await bedrock_executor.run(
+                model_id, self._timed_converse, model_id, prompt, max_tokens, temperature
+            )
+        except asyncio.CancelledError:
+            # No outcome to report (lost a hedge race or the caller went away)
+            bedrock_router.release(model_id)
+            raise
     
-    def generate_text_with_bedrock(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7) -> str:
+    async def agenerate_text(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                             task_type: Optional[str] = None) -> str:
         """
-        Generate text using AWS Bedrock Nova models
+        Async variant of generate_text_with_bedrock.
+        Runs the converse calls on the shared Bedrock pool so the event loop is never blocked.
+        If the first model has not answered by its hedge delay (a latency percentile), the
+        next model is called as well and whichever answers first wins.
         """
         if not self.bedrock_client:
             raise Exception("AWS Bedrock client not initialized")
         
-        # List of Nova models to try in order of preference (confirmed working)
-        models_to_try = [
-            settings.AWS_BEDROCK_MODEL_ID,  # Primary model from settings
-            "us.amazon.nova-lite-v1:0",  # Amazon Nova Lite inference profile (confirmed working)
-            "us.amazon.nova-micro-v1:0",  # Amazon Nova Micro inference profile (confirmed working)
-            "us.amazon.nova-pro-v1:0",  # Amazon Nova Pro inference profile (confirmed working)
-        ]
-        
+        task_type = task_type or bedrock_router.classify(max_tokens)
+        candidates = iter(bedrock_router.route(task_type))
+        pending: Dict[asyncio.Future, str] = {}
+        hedged = False
         last_error = None
         
-        for model_id in models_to_try:
-            try:
-                logger.info(f"Attempting to use model: {model_id}")
+        def launch() -> Optional[str]:
+            for model_id in candidates:
+                if bedrock_router.try_acquire(model_id):
+                    logger.info(f"Attempting to use model: {model_id} ({task_type} task)")
+                    task = asyncio.ensure_future(self._arouted_converse(model_id, prompt, max_tokens, temperature))
+                    pending[task] = model_id
+                    return model_id
+                logger.info(f"Skipping model with open circuit: {model_id}")
+            return None
+        
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if not hedged and len(pending) == 1:
+                    timeout = bedrock_router.hedge_delay(next(iter(pending.values())))
                 
-                # All our models are Nova models that use the converse API
-                if "amazon.nova" in model_id or "us.amazon.nova" in model_id:
-                    response = self.bedrock_client.converse(
-                        modelId=model_id,
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": [{"text": prompt}]
-                            }
-                        ],
-                        inferenceConfig={
-                            "maxTokens": max_tokens,
-                            "temperature": temperature
-                        }
-                    )
-                    result = response['output']['message']['content'][0]['text']
-                    logger.info(f"Successfully generated text using Nova model: {model_id}")
-                    return result
-                else:
-                    logger.warning(f"Skipping non-Nova model: {model_id}")
+                done, _ = await asyncio.wait(pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    # The first model is slower than usual; race it against the next one
+                    hedged = True
+                    slow_model = next(iter(pending.values()))
+                    hedge_model = launch()
+                    if hedge_model:
+                        bedrock_router.record_hedge(slow_model)
+                        logger.info(f"Model {slow_model} exceeded hedge delay, hedging with {hedge_model}")
                     continue
-                    
+                
+                for task in done:
+                    model_id = pending.pop(task)
+                    if task.exception() is None:
+                        logger.info(f"Successfully generated text using Nova model: {model_id}")
+                        return task.result()
+                    if bedrock_router.is_client_error(task.exception()):
+                        raise task.exception()
+                    logger.warning(f"Model {model_id} failed: {str(task.exception())}")
+                    last_error = task.exception()
+                
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        if last_error is None:
+            raise Exception("All AWS Bedrock models are unavailable (circuits open)")
+        
+        logger.error(f"All AWS Bedrock models failed. Last error: {str(last_error)}")
+        raise last_error
+    
+    def _converse_stream_text(self, model_id: str, prompt: str, max_tokens: int, temperature: float) -> Iterator[str]:
+        """Blocking converse_stream call against one Nova model, yielding text deltas"""
+        response = self.bedrock_client.converse_stream(
+            modelId=model_id,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [{"text": prompt}]
+                }
+            ],
+            inferenceConfig={
+                "maxTokens": max_tokens,
+                "temperature": temperature
+            }
+        )
+        for event in response['stream']:
+            if 'contentBlockDelta' in event:
+                text = event['contentBlockDelta'].get('delta', {}).get('text')
+                if text:
+                    yield text
+    
+    async def astream_text(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                           task_type: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream generated text from Bedrock as it is produced.
+        Falls back to the next routed model only if a model fails before sending any text.
+        """
+        if not self.bedrock_client:
+            raise Exception("AWS Bedrock client not initialized")
+        
+        task_type = task_type or bedrock_router.classify(max_tokens)
+        last_error = None
+        
+        for model_id in bedrock_router.route(task_type):
+            if not bedrock_router.try_acquire(model_id):
+                logger.info(f"Skipping model with open circuit: {model_id}")
+                continue
+            started = False
+            try:
+                logger.info(f"Attempting to stream from model: {model_id} ({task_type} task)")
+                async for chunk in bedrock_executor.stream(
+                    model_id, self._converse_stream_text, model_id, prompt, max_tokens, temperature
+                ):
+                    started = True
+                    yield chunk
+                bedrock_router.record_success(model_id)
+                logger.info(f"Successfully streamed text using Nova model: {model_id}")
+                return
+            except (asyncio.CancelledError, GeneratorExit):
+                bedrock_router.release(model_id)
+                raise
             except Exception as e:
-                error_message = str(e)
-                logger.warning(f"Model {model_id} failed: {error_message}")
+                bedrock_router.record_failure(model_id, e)
+                if started or bedrock_router.is_client_error(e):
+                    logger.error(f"Model {model_id} failed: {str(e)}")
+                    raise
+                logger.warning(f"Model {model_id} failed: {str(e)}")
                 last_error = e
                 continue
         
-        # If all models failed, raise the last error
+        if last_error is None:
+            raise Exception("All AWS Bedrock models are unavailable (circuits open)")
+        
         logger.error(f"All AWS Bedrock models failed. Last error: {str(last_error)}")
         raise last_error
     
@@ -310,9 +666,5 @@ class AWSBaseAIService:
         raise NotImplementedError("Audio transcription requires S3 upload. Use transcribe_file_with_transcribe instead.")
     
     def is_available(self) -> bool:
-        """Check if AWS AI services are available"""
-        return (
-            self.aws_access_key_id and 
-            self.aws_secret_access_key and 
-            self.bedrock_client is not None
-        ) 
\ No newline at end of file
+        """Check if AWS AI services are configured (no network call)"""
+        return self._has_credentials() 
\ No newline at end of file
@@ -0,0 +1,236 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NOVA_MICRO = "us.amazon.nova-micro-v1:0"
+NOVA_LITE = "us.amazon.nova-lite-v1:0"
+NOVA_PRO = "us.amazon.nova-pro-v1:0"
+
+# Task types callers can pass to the Bedrock generation methods
+TASK_SHORT = "short"      # grammar checks, categorization, one-line messages
+TASK_DEFAULT = "default"  # everything else
+TASK_LONG = "long"        # full resume rewrites and other large structured outputs
+
+# Error substrings that mean a model will keep failing until configuration changes
+_FATAL_ERRORS = (
+    "AccessDenied",
+    "not authorized",
+    "ResourceNotFound",
+    # ValidationException messages about the model id itself
+    "model identifier is invalid",
+    "on-demand throughput",
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ModelHealth:
+    """Circuit breaker state plus EWMA latency/error tracking for one model"""
+
+    def __init__(self, model_id: str, sample_size: int):
+        self.model_id = model_id
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.cooldown = 0.0
+        self.probe_in_flight = False
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.latencies: Deque[float] = deque(maxlen=sample_size)
+        self.successes = 0
+        self.failures = 0
+        self.hedges = 0
+
+    def available(self, now: float) -> bool:
+        """Whether a request could be sent now (does not claim the half-open probe)"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now - self.opened_at >= self.cooldown
+        return not self.probe_in_flight
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in": round(max(0.0, self.opened_at + self.cooldown - now), 1) if self.state == OPEN else 0,
+            "ewma_latency_ms": round(self.ewma_latency * 1000) if self.ewma_latency is not None else None,
+            "ewma_error_rate": round(self.ewma_error_rate, 3),
+            "successes": self.successes,
+            "failures": self.failures,
+            "hedges": self.hedges
+        }
+
+
+class BedrockModelRouter:
+    """
+    Picks which Nova models to call, and in what order, for a request.
+    - Routes by task type, so short prompts go to the cheapest model first.
+    - Skips models whose circuit breaker is open instead of waiting for them to fail
+      again; after a cooldown one trial request (half-open) decides whether to close it.
+    - Tracks EWMA latency and error rate per model, and exposes a latency percentile
+      that callers use as the delay before hedging to the next model.
+    Thread-safe: outcomes are recorded from the Bedrock pool threads.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, ModelHealth] = {}
+        self._lock = threading.Lock()
+
+    def _health(self, model_id: str) -> ModelHealth:
+        health = self._models.get(model_id)
+        if health is None:
+            health = ModelHealth(model_id, settings.BEDROCK_ROUTER_LATENCY_SAMPLES)
+            self._models[model_id] = health
+        return health
+
+    def classify(self, max_tokens: int) -> str:
+        """Fallback task type for callers that did not pass one"""
+        if max_tokens <= settings.BEDROCK_SHORT_TASK_MAX_TOKENS:
+            return TASK_SHORT
+        return TASK_DEFAULT
+
+    def preferred_models(self, task_type: str) -> List[str]:
+        """Models for a task type in order of preference"""
+        if task_type == TASK_SHORT:
+            models = [NOVA_MICRO, NOVA_LITE, NOVA_PRO]
+        elif task_type == TASK_LONG:
+            models = [NOVA_LITE, NOVA_PRO, NOVA_MICRO]
+        else:
+            models = [settings.AWS_BEDROCK_MODEL_ID, NOVA_LITE, NOVA_MICRO, NOVA_PRO]
+        return list(dict.fromkeys(models))
+
+    def route(self, task_type: str) -> List[str]:
+        """
+        Candidate models for a request: healthy ones in preference order, followed by
+        open-circuit ones ordered by how soon they reopen. try_acquire refuses the latter
+        until their cooldown ends, so when every breaker is open the request fails fast;
+        they are listed so one whose cooldown ends while earlier candidates are being
+        tried still gets its trial request.
+        """
+        now = time.monotonic()
+        with self._lock:
+            healthy, tripped = [], []
+            for model_id in self.preferred_models(task_type):
+                health = self._health(model_id)
+                if health.available(now):
+                    healthy.append(model_id)
+                else:
+                    tripped.append(health)
+        tripped.sort(key=lambda health: health.opened_at + health.cooldown)
+        return healthy + [health.model_id for health in tripped]
+
+    def try_acquire(self, model_id: str) -> bool:
+        """
+        Claim the right to call model_id now. For a half-open breaker only one
+        trial request is let through; an open breaker inside its cooldown refuses.
+        """
+        now = time.monotonic()
+        with self._lock:
+            health = self._health(model_id)
+            if health.state == OPEN:
+                if now - health.opened_at < health.cooldown:
+                    return False
+                health.state = HALF_OPEN
+                health.probe_in_flight = False
+                logger.info(f"Circuit half-open for model {model_id}, sending trial request")
+            if health.state == HALF_OPEN:
+                if health.probe_in_flight:
+                    return False
+                health.probe_in_flight = True
+            return True
+
+    def record_success(self, model_id: str, latency: Optional[float] = None):
+        """Record a successful call; latency is omitted for streams (time to first token differs)"""
+        alpha = settings.BEDROCK_ROUTER_EWMA_ALPHA
+        with self._lock:
+            health = self._health(model_id)
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.ewma_error_rate = (1 - alpha) * health.ewma_error_rate
+            if latency is not None:
+                health.latencies.append(latency)
+                if health.ewma_latency is None:
+                    health.ewma_latency = latency
+                else:
+                    health.ewma_latency = alpha * latency + (1 - alpha) * health.ewma_latency
+            if health.state != CLOSED:
+                logger.info(f"Circuit closed for model {model_id}")
+            health.state = CLOSED
+            health.probe_in_flight = False
+
+    @staticmethod
+    def is_client_error(error: Exception) -> bool:
+        """
+        A ValidationException caused by the request itself (prompt too long, bad parameter).
+        Another model would reject it too, so it neither counts against the model nor fails over.
+        """
+        error_message = str(error)
+        return "ValidationException" in error_message and not any(marker in error_message for marker in _FATAL_ERRORS)
+
+    def record_failure(self, model_id: str, error: Exception):
+        """Record a failed call, opening the breaker when the model looks unhealthy"""
+        if self.is_client_error(error):
+            self.release(model_id)
+            return
+        alpha = settings.BEDROCK_ROUTER_EWMA_ALPHA
+        error_message = str(error)
+        fatal = any(marker in error_message for marker in _FATAL_ERRORS)
+        now = time.monotonic()
+        with self._lock:
+            health = self._health(model_id)
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.ewma_error_rate = alpha + (1 - alpha) * health.ewma_error_rate
+            health.probe_in_flight = False
+            if (
+                fatal
+                or health.state == HALF_OPEN
+                or health.consecutive_failures >= settings.BEDROCK_BREAKER_FAILURE_THRESHOLD
+            ):
+                health.state = OPEN
+                health.opened_at = now
+                health.cooldown = (
+                    settings.BEDROCK_BREAKER_FATAL_COOLDOWN if fatal else settings.BEDROCK_BREAKER_COOLDOWN
+                )
+                logger.warning(f"Circuit opened for model {model_id} for {health.cooldown}s: {error_message}")
+
+    def release(self, model_id: str):
+        """Give back a half-open trial slot when the call was cancelled without an outcome"""
+        with self._lock:
+            self._health(model_id).probe_in_flight = False
+
+    def record_hedge(self, model_id: str):
+        with self._lock:
+            self._health(model_id).hedges += 1
+
+    def hedge_delay(self, model_id: str) -> Optional[float]:
+        """
+        Seconds to wait on model_id before sending a hedged request to the next model:
+        the configured latency percentile of recent calls. None until enough samples exist.
+        """
+        if not settings.BEDROCK_HEDGE_ENABLED:
+            return None
+        with self._lock:
+            samples = sorted(self._health(model_id).latencies)
+        if len(samples) < settings.BEDROCK_HEDGE_MIN_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * settings.BEDROCK_HEDGE_PERCENTILE / 100))
+        return max(samples[index], settings.BEDROCK_HEDGE_MIN_DELAY)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {model_id: health.to_dict(now) for model_id, health in self._models.items()}
+
+
+# Shared by every AWSBaseAIService instance in the process
+bedrock_router = BedrockModelRouter()
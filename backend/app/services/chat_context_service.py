@@ -0,0 +1,93 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.chat import ChatConversation, ChatMessage
+from app.services.claude_chat_service import ClaudeChatService
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)"""
+    return len(text or "") // 4 + 1
+
+
+class ChatContextManager:
+    """
+    Bounded context window for chat conversations.
+    Only messages newer than the conversation's rolling summary are read from the DB.
+    When they exceed CHAT_CONTEXT_KEEP_MESSAGES + CHAT_CONTEXT_COMPACT_BATCH messages or the
+    token budget, the older ones are folded into ChatConversation.summary so each turn
+    sends the system prompt, the summary and at most a fixed number of recent messages.
+    """
+
+    def __init__(self, claude_service: ClaudeChatService):
+        self.claude_service = claude_service
+
+    @staticmethod
+    def _history_content(message: ChatMessage) -> str:
+        # User voice messages have content=URL -> use the stored transcript
+        if message.role == "user" and (message.content or "").strip().startswith("http"):
+            return (message.transcript or "").strip() or "[Voice message]"
+        return message.content
+
+    @staticmethod
+    def _fold_count(history: List[Dict[str, str]]) -> int:
+        """How many of the oldest messages to fold into the summary (0 = none)"""
+        total_tokens = sum(estimate_tokens(m["content"]) for m in history)
+        keep = settings.CHAT_CONTEXT_KEEP_MESSAGES
+        if len(history) <= keep + settings.CHAT_CONTEXT_COMPACT_BATCH and total_tokens <= settings.CHAT_CONTEXT_TOKEN_BUDGET:
+            return 0
+
+        fold = len(history) - keep if len(history) > keep else len(history) - 1
+        # The verbatim window must start with a user turn
+        while 0 < fold < len(history) - 1 and history[fold]["role"] != "user":
+            fold += 1
+        return max(fold, 0)
+
+    @staticmethod
+    def _fit_budget(history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Drop the oldest messages until the history fits the token budget (always keeps the newest)"""
+        total_tokens = sum(estimate_tokens(m["content"]) for m in history)
+        start = 0
+        while start < len(history) - 1 and (
+            total_tokens > settings.CHAT_CONTEXT_TOKEN_BUDGET or history[start]["role"] != "user"
+        ):
+            total_tokens -= estimate_tokens(history[start]["content"])
+            start += 1
+        return history[start:]
+
+    def build(self, db: Session, convo: ChatConversation) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """
+        Messages and summary to send to Claude for the conversation's next reply.
+        Compacts the conversation first when the unsummarized history has grown too long.
+        """
+        messages = (
+            db.query(ChatMessage)
+            .filter(
+                ChatMessage.conversation_id == convo.id,
+                ChatMessage.id > (convo.summary_message_id or 0),
+            )
+            .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc())
+            .all()
+        )
+        history = [{"role": m.role, "content": self._history_content(m)} for m in messages]
+
+        fold = self._fold_count(history)
+        if fold:
+            try:
+                summary = self.claude_service.summarize(convo.summary, history[:fold])
+                convo.summary = summary
+                convo.summary_message_id = messages[fold - 1].id
+                db.commit()
+                history = history[fold:]
+                logger.info("Compacted %s chat messages into summary for conversation %s", fold, convo.id)
+            except Exception as e:
+                # Keep answering; the budget trim below bounds this turn and the next turn retries
+                db.rollback()
+                logger.warning("Chat summary failed for conversation %s: %s", convo.id, e)
+
+        return self._fit_budget(history), convo.summary
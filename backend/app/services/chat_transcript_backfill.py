@@ -0,0 +1,89 @@
+"""
+Backfill ChatMessage.transcript for voice messages recorded before transcripts were stored.
+
+Run from the backend directory:
+    python -m app.services.chat_transcript_backfill --batch-size 50 --limit 1000
+"""
+import argparse
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import or_
+
+from app.db.session import SessionLocal
+from app.models.chat import ChatMessage
+from app.services.speech_to_text_service import transcribe_audio
+from app.utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Stored when the audio cannot be fetched or contains no speech, so the row is not retried forever
+UNTRANSCRIBABLE = ""
+
+
+def backfill_voice_transcripts(batch_size: int = 50, limit: Optional[int] = None) -> Dict[str, int]:
+    """
+    Transcribe user voice messages (content = S3 audio URL) that have no transcript, in id order.
+    Each batch is committed on its own, so the job can be stopped and resumed at any point.
+    Returns counters for transcribed, empty and failed messages.
+    """
+    storage = get_storage()
+    if not storage:
+        raise RuntimeError("S3 storage is disabled; voice recordings cannot be read")
+
+    stats = {"transcribed": 0, "empty": 0, "failed": 0}
+    last_id = 0
+    processed = 0
+
+    while limit is None or processed < limit:
+        db = SessionLocal()
+        try:
+            size = batch_size if limit is None else min(batch_size, limit - processed)
+            batch = (
+                db.query(ChatMessage)
+                .filter(
+                    ChatMessage.id > last_id,
+                    ChatMessage.role == "user",
+                    ChatMessage.transcript.is_(None),
+                    or_(ChatMessage.content.like("http://%"), ChatMessage.content.like("https://%")),
+                )
+                .order_by(ChatMessage.id.asc())
+                .limit(size)
+                .all()
+            )
+            if not batch:
+                break
+
+            for message in batch:
+                last_id = message.id
+                processed += 1
+                try:
+                    audio = storage.download_file_content(message.content.strip())
+                    text = transcribe_audio(audio, filename=message.content.strip()) if audio else ""
+                except Exception as e:
+                    # Leave transcript NULL so a later run retries it
+                    logger.warning("Transcription failed for chat message %s: %s", message.id, e)
+                    stats["failed"] += 1
+                    continue
+                message.transcript = text or UNTRANSCRIBABLE
+                stats["transcribed" if text else "empty"] += 1
+
+            db.commit()
+            logger.info("Backfilled transcripts up to chat message %s: %s", last_id, stats)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill transcripts for chat voice messages")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of messages to process")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(backfill_voice_transcripts(batch_size=args.batch_size, limit=args.limit))
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 
 from app.core.config import settings
 
@@ -34,12 +34,17 @@ If the user asks about anything outside these topics, politely decline in one sh
 class ClaudeChatService:
     def __init__(self):
         self._client = None
+        self._async_client = None
+
+    def _api_key(self) -> str:
+        api_key = (settings.ANTHROPIC_API_KEY or "").strip()
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY is not set. Add it to backend .env to enable chat.")
+        return api_key
 
     def _get_client(self):
         if self._client is None:
-            api_key = (settings.ANTHROPIC_API_KEY or "").strip()
-            if not api_key:
-                raise ValueError("ANTHROPIC_API_KEY is not set. Add it to backend .env to enable chat.")
+            api_key = self._api_key()
             try:
                 from anthropic import Anthropic
                 self._client = Anthropic(api_key=api_key)
@@ -47,14 +52,23 @@ class ClaudeChatService:
                 raise ImportError("anthropic package is required. Install with: pip install anthropic")
         return self._client
 
-    def chat(self, messages: List[Dict[str, str]], max_tokens: int = 4096) -> str:
-        """
-        Send messages to Claude and return the assistant's text response.
-        messages: list of {"role": "user"|"assistant", "content": "..."}
-        """
-        if not messages:
-            return ""
-        client = self._get_client()
+    def _get_async_client(self):
+        """AsyncAnthropic client for streaming; one per process so its connection pool is reused"""
+        if self._async_client is None:
+            api_key = self._api_key()
+            try:
+                from anthropic import AsyncAnthropic
+                self._async_client = AsyncAnthropic(api_key=api_key)
+            except ImportError:
+                raise ImportError("anthropic package is required. Install with: pip install anthropic")
+        return self._async_client
+
+    @staticmethod
+    def _model() -> str:
+        return (getattr(settings, "CLAUDE_MODEL", None) or "claude-sonnet-4-6").strip()
+
+    @staticmethod
+    def _format_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
         # Ensure content is string (Anthropic expects text content as string)
         formatted = []
         for m in messages:
@@ -67,13 +81,51 @@ class ClaudeChatService:
                     (c.get("text", c) if isinstance(c, dict) else str(c)) for c in content
                 )
             formatted.append({"role": role, "content": str(content).strip() or "(empty)"})
+        return formatted
+
+    def _build_request(
+        self, messages: List[Dict[str, str]], summary: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        System blocks and messages for a Claude request, with prompt-cache breakpoints on the
+        fixed system prompt, the rolling summary and the history before the newest message.
+        Those prefixes only change when the conversation is compacted, so later turns reuse them.
+        """
+        system: List[Dict[str, Any]] = [
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+        ]
+        if summary:
+            system.append({
+                "type": "text",
+                "text": f"Summary of the earlier part of this conversation:\n{summary}",
+                "cache_control": {"type": "ephemeral"},
+            })
+
+        formatted: List[Dict[str, Any]] = self._format_messages(messages)
+        if len(formatted) > 1:
+            prefix_end = formatted[-2]
+            formatted[-2] = {
+                "role": prefix_end["role"],
+                "content": [{"type": "text", "text": prefix_end["content"], "cache_control": {"type": "ephemeral"}}],
+            }
+        return system, formatted
+
+    def chat(self, messages: List[Dict[str, str]], max_tokens: int = 4096, summary: Optional[str] = None) -> str:
+        """
+        Send messages to Claude and return the assistant's text response.
+        messages: list of {"role": "user"|"assistant", "content": "..."}
+        summary: rolling summary of older messages not included in messages
+        """
+        if not messages:
+            return ""
+        client = self._get_client()
+        system, formatted = self._build_request(messages, summary)
 
-        model = (getattr(settings, "CLAUDE_MODEL", None) or "claude-sonnet-4-6").strip()
         try:
             response = client.messages.create(
-                model=model,
+                model=self._model(),
                 max_tokens=max_tokens,
-                system=SYSTEM_PROMPT,
+                system=system,
                 messages=formatted,
                 temperature=0.7,
             )
@@ -86,4 +138,61 @@ class ClaudeChatService:
             return ""
         except Exception as e:
             logger.error("Claude API error: %s", e)
-            raise
\ No newline at end of file
+            raise
+
+    async def astream_chat(
+        self, messages: List[Dict[str, str]], max_tokens: int = 4096, summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream the assistant's reply as text deltas using the async streaming API.
+        Runs on the event loop, so no worker thread is held while Claude generates.
+        """
+        if not messages:
+            return
+        client = self._get_async_client()
+        system, formatted = self._build_request(messages, summary)
+
+        try:
+            async with client.messages.stream(
+                model=self._model(),
+                max_tokens=max_tokens,
+                system=system,
+                messages=formatted,
+                temperature=0.7,
+            ) as stream:
+                async for text in stream.text_stream:
+                    if text:
+                        yield text
+        except Exception as e:
+            logger.error("Claude API streaming error: %s", e)
+            raise
+
+    def summarize(self, previous_summary: Optional[str], messages: List[Dict[str, str]]) -> str:
+        """
+        Fold messages into the rolling conversation summary using the (cheaper) summary model.
+        Returns the new summary text.
+        """
+        client = self._get_client()
+        transcript = "\n\n".join(
+            f"{(m.get('role') or 'user').capitalize()}: {m.get('content') or ''}" for m in messages
+        )
+        prompt = (
+            "Update the running summary of a conversation between a user and an assistant.\n\n"
+            f"Current summary:\n{previous_summary or '(none yet)'}\n\n"
+            f"New messages:\n{transcript}\n\n"
+            "Write the updated summary in English, in at most a few short paragraphs. Keep facts the user "
+            "shared about themselves, their questions, and the advice already given. Output only the summary."
+        )
+        try:
+            response = client.messages.create(
+                model=(settings.CHAT_SUMMARY_MODEL or self._model()).strip(),
+                max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.2,
+            )
+            if response.content and hasattr(response.content[0], "text"):
+                return (response.content[0].text or "").strip()
+            return previous_summary or ""
+        except Exception as e:
+            logger.error("Claude summary error: %s", e)
+            raise
@@ -6,6 +6,7 @@ from typing import List, Dict, Any
 from app.core.config import settings
 from app.utils.cache import cache, CacheKeys
 from app.schemas.grammar_check import GrammarCorrection
+from app.services.bedrock_router import TASK_SHORT
 
 logger = logging.getLogger(__name__)
 
@@ -123,7 +124,8 @@ class GrammarCheckService:
             response = self.aws_ai_service.generate_text_with_bedrock(
                 prompt, 
                 max_tokens=2000, 
-                temperature=0.1
+                temperature=0.1,
+                task_type=TASK_SHORT
             )
             
             # Parse the AI response
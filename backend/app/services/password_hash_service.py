@@ -0,0 +1,142 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.utils import password_hashing
+from app.utils.cache import CacheKeys, cache
+
+logger = logging.getLogger(__name__)
+
+# Per-minute login counters are kept this long in Redis
+LOGIN_RATE_RETENTION = 3600
+
+
+class PasswordHashBusyError(Exception):
+    """Raised when the password hashing queue is full; callers should retry later"""
+
+
+class PasswordHashPool:
+    """
+    Process pool for bcrypt hashing and verification.
+    Each hash is ~250 ms of CPU at cost 12; running it in worker processes keeps login and
+    register bursts off the API worker and spreads them over all cores.
+    At most workers + max_queue calls are admitted at once; beyond that new calls are
+    rejected with PasswordHashBusyError instead of queueing unboundedly.
+    """
+
+    def __init__(self, workers: int, max_queue: int, rounds: int):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_queue = max(0, max_queue)
+        self.rounds = rounds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._stats = {"admitted": 0, "rejected": 0, "completed": 0, "failed": 0, "in_progress": 0, "rehashed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the pool on first use; spawn so workers don't inherit sockets and threads"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard_executor(self, broken: ProcessPoolExecutor):
+        with self._executor_lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False)
+
+    def _count(self, key: str, delta: int = 1):
+        with self._stats_lock:
+            self._stats[key] += delta
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise PasswordHashBusyError("Too many sign-in requests in progress, please try again shortly")
+        self._count("admitted")
+        self._count("in_progress")
+        try:
+            executor = self._get_executor()
+            try:
+                result = executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); start a fresh pool and retry once
+                logger.warning("Password hashing pool broke, restarting it")
+                self._discard_executor(executor)
+                result = self._get_executor().submit(fn, *args).result()
+            self._count("completed")
+            return result
+        except Exception:
+            self._count("failed")
+            raise
+        finally:
+            self._count("in_progress", -1)
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(password_hashing.hash_password, password, self.rounds)
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password; when it matches a hash made with a different cost, also
+        return a new hash at the configured cost for the caller to store
+        """
+        valid, new_hash = self._run(password_hashing.verify_and_update, password, hashed_password, self.rounds)
+        if new_hash:
+            self._count("rehashed")
+        return valid, new_hash
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"workers": self.workers, "max_queue": self.max_queue, "rounds": self.rounds, **self._stats}
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+
+def _login_key(outcome: str, minute: int) -> str:
+    return f"{CacheKeys.AUTH_LOGINS}:{outcome}:{minute}"
+
+
+def record_login(success: bool):
+    """Count a login attempt in the current minute's bucket (shared by all workers)"""
+    key = _login_key("success" if success else "failure", int(time.time() // 60))
+    if cache.increment(key) == 1:
+        cache.expire(key, LOGIN_RATE_RETENTION)
+
+
+def get_login_rate(minutes: int = 15) -> Dict[str, Any]:
+    """Successful and failed logins per minute over the last `minutes` minutes, newest first"""
+    current = int(time.time() // 60)
+    window = range(current, current - minutes, -1)
+    keys = [_login_key(outcome, minute) for minute in window for outcome in ("success", "failure")]
+    counts = cache.get_many(keys)
+    per_minute = [
+        {
+            "minute": minute * 60,
+            "success": int(counts.get(_login_key("success", minute), 0)),
+            "failure": int(counts.get(_login_key("failure", minute), 0)),
+        }
+        for minute in window
+    ]
+    return {
+        "window_minutes": minutes,
+        "success_per_minute": sum(m["success"] for m in per_minute) / minutes,
+        "failure_per_minute": sum(m["failure"] for m in per_minute) / minutes,
+        "minutes": per_minute,
+    }
@@ -1,9 +1,15 @@
+import asyncio
+import io
+import multiprocessing
 import os
 import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Any, Optional, List
 import json
 import uuid
-from pathlib import Path
 from app.core.config import settings
 from app.utils.storage import get_storage
 
@@ -23,16 +29,93 @@ except ImportError:
 
 # Add import for PDF generation
 try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.lib import colors
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+    from app.utils import pdf_rendering
     PDF_GENERATION_AVAILABLE = True
 except ImportError:
     PDF_GENERATION_AVAILABLE = False
 
+class PDFRenderPool:
+    """
+    Process pool for ReportLab rendering.
+    Each worker builds the style sheet and loads font metrics once when it starts, and
+    every render returns the PDF as bytes from an in-memory buffer (no temp files).
+    At most workers + max_queue renders are submitted at once; further callers wait
+    for a slot without blocking the event loop.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots = asyncio.Semaphore(self.workers + self.max_queue)
+        self._stats = {"completed": 0, "failed": 0, "in_progress": 0, "render_seconds": 0.0}
+        self._stats_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the pool on first use; spawn so workers don't inherit sockets and threads"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=pdf_rendering.init_worker,
+                )
+            return self._executor
+
+    def _discard_executor(self, broken: ProcessPoolExecutor):
+        with self._executor_lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False)
+
+    def _count(self, key: str, delta=1):
+        with self._stats_lock:
+            self._stats[key] += delta
+
+    async def arender(self, content: Dict[str, Any]) -> bytes:
+        """Render structured resume content to PDF bytes on the pool"""
+        async with self._slots:
+            self._count("in_progress")
+            started = time.monotonic()
+            try:
+                executor = self._get_executor()
+                try:
+                    pdf_bytes = await asyncio.wrap_future(executor.submit(pdf_rendering.render_resume_pdf, content))
+                except BrokenProcessPool:
+                    # A worker died (e.g. OOM-killed); start a fresh pool and retry once
+                    self._discard_executor(executor)
+                    pdf_bytes = await asyncio.wrap_future(
+                        self._get_executor().submit(pdf_rendering.render_resume_pdf, content)
+                    )
+                self._count("completed")
+                self._count("render_seconds", time.monotonic() - started)
+                return pdf_bytes
+            except Exception:
+                self._count("failed")
+                raise
+            finally:
+                self._count("in_progress", -1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        completed = stats.pop("completed")
+        render_seconds = stats.pop("render_seconds")
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "completed": completed,
+            "avg_render_seconds": round(render_seconds / completed, 4) if completed else None,
+            **stats
+        }
+
+
+pdf_render_pool = PDFRenderPool(
+    workers=settings.PDF_RENDER_WORKERS,
+    max_queue=settings.PDF_RENDER_MAX_QUEUE,
+)
+
 class PDFService:
     """Service for generating PDFs from AWS AI-generated content and analyzing PDFs"""
     def __init__(self):
@@ -105,7 +188,7 @@ class PDFService:
             """
             
             # Generate content using AWS Bedrock
-            content = self.aws_ai_service.generate_text_with_bedrock(structured_prompt, max_tokens=1500, temperature=0.7)
+            content = await self.aws_ai_service.agenerate_text(structured_prompt, max_tokens=1500, temperature=0.7)
             
             # Parse the content and generate PDF
             return await self._generate_pdf_from_content(content, template_name)
@@ -114,10 +197,12 @@ class PDFService:
             raise Exception(f"Failed to generate PDF from AI: {str(e)}")
 
     async def _generate_pdf_from_content(self, content: str, template_name: str) -> str:
-        """Generate PDF from content using ReportLab (no HTML templates needed)"""
+        """Render content on the PDF render pool and stream the bytes to storage"""
         try:
             if not PDF_GENERATION_AVAILABLE:
                 raise Exception("ReportLab is not available for PDF generation")
+            if not self.storage:
+                raise Exception("S3 storage is not configured")
             
             # Parse content into structured data
             parsed_content = self._parse_content(content)
@@ -125,28 +210,15 @@ class PDFService:
             # Generate PDF filename
             pdf_filename = f"resume_{uuid.uuid4().hex}.pdf"
             
-            # Use temporary file for PDF generation
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
-                temp_pdf_path = temp_pdf.name
-            
-            # Generate PDF with ReportLab directly (no HTML template needed)
-            self._generate_pdf_with_reportlab(parsed_content, temp_pdf_path)
+            pdf_bytes = await pdf_render_pool.arender(parsed_content)
             
-            # Upload to storage
-            with open(temp_pdf_path, 'rb') as pdf_file:
-                pdf_url = self.storage.upload_file_content(
-                    pdf_file,
-                    f"resumes/pdfs/{pdf_filename}",
-                    content_type="application/pdf"
-                )
-            
-            # Clean up temporary file
-            try:
-                os.unlink(temp_pdf_path)
-            except OSError as e:
-                print(f"Warning: Could not delete temporary file {temp_pdf_path}: {e}")
-            
-            return pdf_url
+            # Upload from the in-memory buffer
+            return await asyncio.to_thread(
+                self.storage.upload_fileobj,
+                io.BytesIO(pdf_bytes),
+                f"resumes/pdfs/{pdf_filename}",
+                content_type="application/pdf"
+            )
             
         except Exception as e:
             raise Exception(f"Failed to generate PDF from content: {str(e)}")
@@ -271,156 +343,6 @@ class PDFService:
                 })
         return formatted_edu
 
-    def _generate_pdf_with_reportlab(self, content: Dict[str, Any], output_path: str):
-        """Generate PDF using ReportLab"""
-        if not PDF_GENERATION_AVAILABLE:
-            raise Exception("ReportLab is not available for PDF generation")
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(output_path, pagesize=letter, 
-                              rightMargin=72, leftMargin=72, 
-                              topMargin=72, bottomMargin=72)
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.darkblue,
-            alignment=TA_CENTER,
-            spaceAfter=12
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.darkblue,
-            spaceBefore=12,
-            spaceAfter=6
-        )
-        
-        normal_style = styles['Normal']
-        
-        # Add personal info
-        personal_info = content.get('personal_info', {})
-        name = personal_info.get('name', 'Resume')
-        story.append(Paragraph(name, title_style))
-        
-        # Contact information
-        contact_info = []
-        if personal_info.get('email'):
-            contact_info.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_info.append(personal_info['phone'])
-        if personal_info.get('address'):
-            contact_info.append(personal_info['address'])
-        
-        if contact_info:
-            contact_text = ' | '.join(contact_info)
-            contact_style = ParagraphStyle(
-                'Contact',
-                parent=normal_style,
-                alignment=TA_CENTER,
-                spaceAfter=12
-            )
-            story.append(Paragraph(contact_text, contact_style))
-        
-        story.append(Spacer(1, 12))
-        
-        # Professional Summary
-        summary = content.get('professional_summary', '')
-        if summary:
-            story.append(Paragraph('Professional Summary', heading_style))
-            story.append(Paragraph(summary, normal_style))
-            story.append(Spacer(1, 12))
-        
-        # Work Experience
-        work_experience = content.get('work_experience', [])
-        if work_experience:
-            story.append(Paragraph('Work Experience', heading_style))
-            for exp in work_experience:
-                if isinstance(exp, dict):
-                    # Job title and company
-                    job_title = f"<b>{exp.get('position', 'Position')}</b> at {exp.get('company', 'Company')}"
-                    story.append(Paragraph(job_title, normal_style))
-                    
-                    # Duration and location
-                    duration = exp.get('duration', '')
-                    location = exp.get('location', '')
-                    if duration or location:
-                        duration_text = f"{duration}"
-                        if location:
-                            duration_text += f" | {location}"
-                        story.append(Paragraph(duration_text, normal_style))
-                    
-                    # Responsibilities
-                    responsibilities = exp.get('responsibilities', [])
-                    if responsibilities:
-                        if isinstance(responsibilities, list):
-                            for resp in responsibilities:
-                                story.append(Paragraph(f"• {resp}", normal_style))
-                        else:
-                            story.append(Paragraph(f"• {responsibilities}", normal_style))
-                    
-                    story.append(Spacer(1, 8))
-        
-        # Education
-        education = content.get('education', [])
-        if education:
-            story.append(Paragraph('Education', heading_style))
-            for edu in education:
-                if isinstance(edu, dict):
-                    degree_text = f"<b>{edu.get('degree', 'Degree')}</b> in {edu.get('field', 'Field')}"
-                    story.append(Paragraph(degree_text, normal_style))
-                    institution = edu.get('institution', 'Institution')
-                    year = edu.get('year', '')
-                    if year:
-                        institution += f" | {year}"
-                    story.append(Paragraph(institution, normal_style))
-                    story.append(Spacer(1, 8))
-        
-        # Skills
-        skills = content.get('skills', [])
-        if skills:
-            story.append(Paragraph('Skills', heading_style))
-            if isinstance(skills, list):
-                skills_text = ', '.join(skills)
-            else:
-                skills_text = str(skills)
-            story.append(Paragraph(skills_text, normal_style))
-            story.append(Spacer(1, 8))
-        
-        # Certifications
-        certifications = content.get('certifications', [])
-        if certifications:
-            story.append(Paragraph('Certifications', heading_style))
-            for cert in certifications:
-                if isinstance(cert, dict):
-                    cert_text = f"<b>{cert.get('name', 'Certification')}</b>"
-                    issuer = cert.get('issuer', cert.get('organization', ''))
-                    year = cert.get('year', cert.get('endDate', ''))
-                    if issuer:
-                        cert_text += f" - {issuer}"
-                    if year:
-                        cert_text += f" ({year})"
-                    story.append(Paragraph(cert_text, normal_style))
-                elif isinstance(cert, str):
-                    story.append(Paragraph(cert, normal_style))
-                story.append(Spacer(1, 4))
-        
-        # Additional content if available
-        if content.get('generated_content'):
-            story.append(Paragraph('Additional Information', heading_style))
-            story.append(Paragraph(content['generated_content'], normal_style))
-        
-        # Build PDF
-        doc.build(story)
-
     def _create_default_structure(self, content: str) -> Dict[str, Any]:
         """Create a default resume structure from unstructured content"""
         return {
@@ -1,57 +1,183 @@
+import asyncio
+import io
 import logging
 import tempfile
+import threading
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-_whisper_model = None
+SUPPORTED_SUFFIXES = (".webm", ".mp3", ".wav", ".ogg", ".m4a", ".flac")
 
 
-def _get_whisper_model():
-    """Lazy-load faster-whisper model (shared across requests)."""
-    global _whisper_model
-    if _whisper_model is None:
+class TranscriptionBusyError(Exception):
+    """Raised when the transcription queue is full; callers should retry later"""
+
+
+class TranscriptionPool:
+    """
+    Process-wide faster-whisper transcription pool.
+    One WhisperModel is loaded with `workers` replicas (CTranslate2 inter-threads) and
+    driven from a thread pool of the same size; CTranslate2 releases the GIL, so
+    concurrent clips use separate cores and never block the event loop.
+    At most workers + max_queue requests are admitted at once; beyond that new
+    requests are rejected with TranscriptionBusyError instead of queueing unboundedly.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="whisper")
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._model = None
+        self._batched = None
+        self._model_lock = threading.Lock()
+        self._stats = {"admitted": 0, "rejected": 0, "completed": 0, "failed": 0, "in_progress": 0}
+        self._stats_lock = threading.Lock()
+
+    def _get_model(self):
+        """Lazy-load the faster-whisper model (shared by all pool threads)."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    try:
+                        from faster_whisper import WhisperModel
+                    except ImportError:
+                        raise ImportError(
+                            "faster-whisper is required for voice input. Install with: pip install faster-whisper"
+                        )
+                    model_size = getattr(settings, "WHISPER_MODEL_SIZE", "base") or "base"
+                    logger.info("Loading faster-whisper model: %s (%s workers)", model_size, self.workers)
+                    self._model = WhisperModel(
+                        model_size,
+                        device="cpu",
+                        compute_type="int8",
+                        cpu_threads=settings.WHISPER_CPU_THREADS,
+                        num_workers=self.workers,
+                    )
+                    if settings.WHISPER_BATCH_SIZE > 1:
+                        try:
+                            from faster_whisper import BatchedInferencePipeline
+                            self._batched = BatchedInferencePipeline(model=self._model)
+                        except ImportError:
+                            logger.warning("BatchedInferencePipeline needs faster-whisper >= 1.1; batching disabled")
+        return self._model
+
+    @staticmethod
+    def _suffix(filename: Optional[str]) -> str:
+        suffix = ".webm"
+        if filename and "." in filename:
+            suffix = "." + filename.rsplit(".", 1)[-1].lower()
+        if suffix not in SUPPORTED_SUFFIXES:
+            suffix = ".webm"
+        return suffix
+
+    def _decode(self, audio_bytes: bytes, filename: Optional[str], sampling_rate: int):
+        """Decode to a float32 waveform in memory; fall back to a temp file for containers PyAV cannot seek in memory"""
+        from faster_whisper import decode_audio
+
+        try:
+            return decode_audio(io.BytesIO(audio_bytes), sampling_rate=sampling_rate)
+        except Exception as e:
+            logger.debug("In-memory audio decode failed, using temp file: %s", e)
+
+        with tempfile.NamedTemporaryFile(suffix=self._suffix(filename), delete=False) as tmp:
+            try:
+                tmp.write(audio_bytes)
+                tmp.flush()
+                path = tmp.name
+                return decode_audio(path, sampling_rate=sampling_rate)
+            finally:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _transcribe(self, audio_bytes: bytes, filename: Optional[str]) -> str:
+        model = self._get_model()
+        audio = self._decode(audio_bytes, filename, model.feature_extractor.sampling_rate)
+
+        options = {
+            "language": None,
+            "beam_size": settings.WHISPER_BEAM_SIZE,
+            "vad_filter": settings.WHISPER_VAD_FILTER,
+        }
+        if self._batched is not None:
+            # The batched pipeline splits the clip on VAD segments; without VAD it rejects clips over 30 s
+            options["vad_filter"] = True
+            segments, info = self._batched.transcribe(audio, batch_size=settings.WHISPER_BATCH_SIZE, **options)
+        else:
+            segments, info = model.transcribe(audio, **options)
+        parts = [s.text for s in segments if s.text]
+        return " ".join(parts).strip() if parts else ""
+
+    def _count(self, key: str, delta: int = 1):
+        with self._stats_lock:
+            self._stats[key] += delta
+
+    def _submit(self, audio_bytes: bytes, filename: Optional[str], block: bool):
+        if not self._slots.acquire(blocking=block):
+            self._count("rejected")
+            raise TranscriptionBusyError("Transcription queue is full, please try again shortly")
+        self._count("admitted")
+
+        def run():
+            self._count("in_progress")
+            try:
+                text = self._transcribe(audio_bytes, filename)
+                self._count("completed")
+                return text
+            except Exception:
+                self._count("failed")
+                raise
+            finally:
+                self._count("in_progress", -1)
+
         try:
-            from faster_whisper import WhisperModel
-        except ImportError:
-            raise ImportError(
-                "faster-whisper is required for voice input. Install with: pip install faster-whisper"
-            )
-        model_size = getattr(settings, "WHISPER_MODEL_SIZE", "base") or "base"
-        logger.info("Loading faster-whisper model: %s", model_size)
-        _whisper_model = WhisperModel(model_size, device="cpu", compute_type="int8")
-    return _whisper_model
+            future = self._executor.submit(run)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is freed when the work finishes, even if the caller stopped waiting
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def transcribe(self, audio_bytes: bytes, filename: Optional[str] = None) -> str:
+        """Blocking transcription for scripts and sync code; waits for a free slot"""
+        if not audio_bytes:
+            return ""
+        return self._submit(audio_bytes, filename, block=True).result()
+
+    async def atranscribe(self, audio_bytes: bytes, filename: Optional[str] = None) -> str:
+        """Transcribe on the pool without blocking the event loop; raises TranscriptionBusyError when saturated"""
+        if not audio_bytes:
+            return ""
+        return await asyncio.wrap_future(self._submit(audio_bytes, filename, block=False))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"workers": self.workers, "max_queue": self.max_queue, **self._stats}
+
+
+transcription_pool = TranscriptionPool(
+    workers=settings.WHISPER_WORKERS,
+    max_queue=settings.WHISPER_MAX_QUEUE,
+)
 
 
 def transcribe_audio(audio_bytes: bytes, filename: Optional[str] = None) -> str:
     """
     Transcribe audio to text using faster-whisper (local, no API key).
-    Accepts common formats (webm, mp3, wav, etc.) via temp file.
+    Accepts common formats (webm, mp3, wav, etc.), decoded in memory.
     Returns transcribed text.
     """
-    if not audio_bytes:
-        return ""
+    return transcription_pool.transcribe(audio_bytes, filename)
 
-    suffix = ".webm"
-    if filename and "." in filename:
-        suffix = "." + filename.rsplit(".", 1)[-1].lower()
-    if suffix not in (".webm", ".mp3", ".wav", ".ogg", ".m4a", ".flac"):
-        suffix = ".webm"
 
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-        try:
-            tmp.write(audio_bytes)
-            tmp.flush()
-            path = tmp.name
-            model = _get_whisper_model()
-            segments, info = model.transcribe(path, language=None, beam_size=1)
-            parts = [s.text for s in segments if s.text]
-            return " ".join(parts).strip() if parts else ""
-        finally:
-            try:
-                os.unlink(path)
-            except OSError:
-                pass
+async def atranscribe_audio(audio_bytes: bytes, filename: Optional[str] = None) -> str:
+    """Async variant of transcribe_audio for request handlers"""
+    return await transcription_pool.atranscribe(audio_bytes, filename)
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.task import Task
 from app.models.user import User
+from app.services.bedrock_router import TASK_SHORT
 
 # Import AWS base service
 try:
@@ -475,7 +476,8 @@ class TaskManagementService:
             ai_response = self.aws_ai_service.generate_text_with_bedrock(
                 prompt, 
                 max_tokens=400, 
-                temperature=0.3
+                temperature=0.3,
+                task_type=TASK_SHORT
             )
             
             # Clean and parse the AI response
@@ -756,7 +758,8 @@ class TaskManagementService:
             ai_response = self.aws_ai_service.generate_text_with_bedrock(
                 prompt, 
                 max_tokens=700, 
-                temperature=0.5
+                temperature=0.5,
+                task_type=TASK_SHORT
             )
             
             cleaned_response = self._clean_ai_response(ai_response)
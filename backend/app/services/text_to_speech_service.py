@@ -5,9 +5,16 @@ import tempfile
 import asyncio
 import json
 import base64
-from typing import List, Dict, Any, Tuple
+import hashlib
+import re
+import threading
+import time
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple
 from app.core.config import settings
+from app.utils.cache import cache, async_cache, CacheKeys
+from app.utils.audio import concat_mp3, mp3_duration
 from app.utils.storage import get_storage
+from app.utils.streaming import iterate_in_thread
 from app.schemas.text_to_speech import WordTimestamp, VoiceInfo
 
 # Import AWS base service
@@ -20,6 +27,9 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared S3 client for the audio cache (None when S3 storage is disabled)
+storage = get_storage()
+
 """
 Text-to-Speech Service
 ======================
@@ -140,10 +150,16 @@ class TextToSpeechService:
             # Get language code for AWS Polly
             language_code = self._normalize_language_code(lang)
             
-            # Generate both audio and speech marks (for timestamps) 
-            audio_data, speech_marks = await self._aws_polly_synthesize_with_marks(
-                text, polly_voice, language_code, pitch, rate
-            )
+            # Generate both audio and speech marks (for timestamps), or reuse an identical earlier synthesis.
+            # Long text is synthesized in parallel chunks and stitched back together.
+            if len(text) > settings.TTS_CHUNK_MAX_CHARS:
+                audio_data, speech_marks = await self._synthesize_long_text_with_marks(
+                    text, polly_voice, language_code, pitch, rate
+                )
+            else:
+                audio_data, speech_marks = await self._cached_synthesize_with_marks(
+                    text, polly_voice, language_code, pitch, rate
+                )
             
             # Parse speech marks to extract word timestamps
             timestamps = self._parse_speech_marks_to_timestamps(speech_marks)
@@ -171,72 +187,73 @@ class TextToSpeechService:
 
     async def get_available_voices(self, language_code: str = None) -> List[VoiceInfo]:
         """
-        Get list of available voices, optionally filtered by language
+        Get list of available voices, optionally filtered by language (served from the voice catalog cache)
         """
         try:
-            if not self.aws_ai_service or not self.aws_ai_service.polly_client:
-                raise Exception("AWS Polly client not available")
-                
-            # Get voices from AWS Polly
-            polly_voices = await self._get_polly_voices(language_code)
-            
-            # Convert to our VoiceInfo format and include mapped names
-            voices = []
-            
-            # Add mapped voices (OpenAI-style names)
-            for mapped_name, polly_name in self.VOICE_MAPPING.items():
-                polly_voice = next((v for v in polly_voices if v['Id'] == polly_name), None)
-                if polly_voice:
-                    voices.append(VoiceInfo(
-                        id=mapped_name,
-                        name=f"{mapped_name.title()} ({polly_name})",
-                        language=polly_voice.get('LanguageCode', 'en-US'),
-                        gender=polly_voice.get('Gender', 'Unknown'),
-                        engine=polly_voice.get('SupportedEngines', ['standard'])[0],
-                        description=f"Compatible with {mapped_name} - AWS Polly {polly_name} voice"
-                    ))
-            
-            # Add native AWS Polly voices not in mapping
-            for polly_voice in polly_voices:
-                if polly_voice['Id'] not in self.VOICE_MAPPING.values():
-                    voices.append(VoiceInfo(
-                        id=polly_voice['Id'].lower(),
-                        name=polly_voice['Id'],
-                        language=polly_voice.get('LanguageCode', 'en-US'),
-                        gender=polly_voice.get('Gender', 'Unknown'),
-                        engine=polly_voice.get('SupportedEngines', ['standard'])[0],
-                        description=f"AWS Polly native voice"
-                    ))
-            
-            return voices
-            
+            return await polly_voice_catalog.get_voices(language_code)
         except Exception as e:
             logger.error(f"Error getting available voices: {str(e)}")
             raise Exception(f"Failed to get available voices: {str(e)}")
 
-    async def _get_polly_voices(self, language_code: str = None) -> List[Dict]:
-        """Get voices from AWS Polly"""
+    def _polly_audio(self, text: str, text_type: str, voice_id: str, language_code: str) -> bytes:
+        """Blocking Polly call for the MP3 audio"""
+        audio_response = self.aws_ai_service.polly_client.synthesize_speech(
+            Text=text,
+            TextType=text_type,
+            VoiceId=voice_id,
+            LanguageCode=language_code,
+            OutputFormat='mp3'
+        )
+        return audio_response['AudioStream'].read()
+
+    def _polly_speech_marks(self, text: str, text_type: str, voice_id: str, language_code: str) -> List[Dict]:
+        """Blocking Polly call for word speech marks, parsed line by line as the stream is read"""
+        marks_response = self.aws_ai_service.polly_client.synthesize_speech(
+            Text=text,
+            TextType=text_type,
+            VoiceId=voice_id,
+            LanguageCode=language_code,
+            OutputFormat='json',
+            SpeechMarkTypes=['word']
+        )
+        speech_marks = []
+        for line in marks_response['AudioStream'].iter_lines():
+            if line.strip():
+                try:
+                    speech_marks.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return speech_marks
+
+    def _polly_audio_stream(self, text: str, text_type: str, voice_id: str, language_code: str, chunk_size: int) -> Iterator[bytes]:
+        """Blocking Polly call yielding the MP3 in chunks as Polly produces it"""
+        audio_response = self.aws_ai_service.polly_client.synthesize_speech(
+            Text=text,
+            TextType=text_type,
+            VoiceId=voice_id,
+            LanguageCode=language_code,
+            OutputFormat='mp3'
+        )
+        stream = audio_response['AudioStream']
         try:
-            polly_client = self.aws_ai_service.polly_client
-            
-            params = {}
-            if language_code:
-                params['LanguageCode'] = self._normalize_language_code(language_code)
-                
-            response = polly_client.describe_voices(**params)
-            return response.get('Voices', [])
-            
-        except Exception as e:
-            logger.error(f"Error getting Polly voices: {str(e)}")
-            raise
+            for chunk in stream.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            stream.close()
+
+    async def _polly_audio_and_marks(self, text: str, text_type: str, voice_id: str, language_code: str) -> Tuple[bytes, List[Dict]]:
+        """Issue the audio and speech-mark requests concurrently on worker threads"""
+        audio_data, speech_marks = await asyncio.gather(
+            asyncio.to_thread(self._polly_audio, text, text_type, voice_id, language_code),
+            asyncio.to_thread(self._polly_speech_marks, text, text_type, voice_id, language_code)
+        )
+        return audio_data, speech_marks
 
     async def _aws_polly_synthesize_with_marks(self, text: str, voice_id: str, language_code: str, pitch: float = 1.0, rate: float = 1.0) -> Tuple[bytes, List[Dict]]:
         """
         Synthesize speech and get speech marks for timestamps using AWS Polly
         """
         try:
-            polly_client = self.aws_ai_service.polly_client
-            
             # Validate inputs
             if not text or not text.strip():
                 raise ValueError("Text cannot be empty")
@@ -259,37 +276,8 @@ class TextToSpeechService:
             if not ssml_text.startswith('<speak>') or not ssml_text.endswith('</speak>'):
                 raise ValueError("Invalid SSML format generated")
             
-            # First, get the audio
-            audio_response = polly_client.synthesize_speech(
-                Text=ssml_text,
-                TextType='ssml',
-                VoiceId=voice_id,
-                LanguageCode=language_code,
-                OutputFormat='mp3'
-            )
-            audio_data = audio_response['AudioStream'].read()
-            
-            # Then, get speech marks for word timestamps
-            marks_response = polly_client.synthesize_speech(
-                Text=ssml_text,
-                TextType='ssml',
-                VoiceId=voice_id,
-                LanguageCode=language_code,
-                OutputFormat='json',
-                SpeechMarkTypes=['word']
-            )
-            
-            # Parse speech marks
-            speech_marks_data = marks_response['AudioStream'].read().decode('utf-8')
-            speech_marks = []
-            
-            for line in speech_marks_data.strip().split('\n'):
-                if line.strip():
-                    try:
-                        mark = json.loads(line)
-                        speech_marks.append(mark)
-                    except json.JSONDecodeError:
-                        continue
+            # Audio and speech marks (for word timestamps) are independent requests
+            audio_data, speech_marks = await self._polly_audio_and_marks(ssml_text, 'ssml', voice_id, language_code)
             
             logger.info(f"Successfully synthesized speech with {len(speech_marks)} word marks")
             return audio_data, speech_marks
@@ -304,35 +292,7 @@ class TextToSpeechService:
                 logger.warning("SSML failed, trying plain text")
                 try:
                     # Fallback to plain text
-                    audio_response = polly_client.synthesize_speech(
-                        Text=text,
-                        TextType='text',
-                        VoiceId=voice_id,
-                        LanguageCode=language_code,
-                        OutputFormat='mp3'
-                    )
-                    audio_data = audio_response['AudioStream'].read()
-                    
-                    # Get speech marks with plain text
-                    marks_response = polly_client.synthesize_speech(
-                        Text=text,
-                        TextType='text',
-                        VoiceId=voice_id,
-                        LanguageCode=language_code,
-                        OutputFormat='json',
-                        SpeechMarkTypes=['word']
-                    )
-                    
-                    speech_marks_data = marks_response['AudioStream'].read().decode('utf-8')
-                    speech_marks = []
-                    
-                    for line in speech_marks_data.strip().split('\n'):
-                        if line.strip():
-                            try:
-                                mark = json.loads(line)
-                                speech_marks.append(mark)
-                            except json.JSONDecodeError:
-                                continue
+                    audio_data, speech_marks = await self._polly_audio_and_marks(text, 'text', voice_id, language_code)
                     
                     logger.info(f"Fallback successful: synthesized speech with {len(speech_marks)} word marks")
                     return audio_data, speech_marks
@@ -343,6 +303,237 @@ class TextToSpeechService:
             
             raise
 
+    async def _aws_polly_speech_marks(self, text: str, voice_id: str, language_code: str, pitch: float = 1.0, rate: float = 1.0) -> List[Dict]:
+        """Speech marks only (no audio), with the same SSML and plain-text fallback as the full synthesis"""
+        ssml_text = self._create_ssml_with_prosody(text, pitch, rate)
+        try:
+            return await asyncio.to_thread(self._polly_speech_marks, ssml_text, 'ssml', voice_id, language_code)
+        except Exception as e:
+            if "InvalidSsmlException" not in str(e) and "SSML" not in str(e):
+                raise
+            logger.warning("SSML speech marks failed, falling back to plain text")
+            return await asyncio.to_thread(self._polly_speech_marks, text, 'text', voice_id, language_code)
+
+    @staticmethod
+    def _tts_cache_key(text: str, voice_id: str, language_code: str, pitch: float, rate: float) -> str:
+        """Content address of a synthesis: identical inputs always produce identical audio"""
+        payload = json.dumps([text, voice_id, language_code, round(pitch, 3), round(rate, 3)], ensure_ascii=False)
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return f"{CacheKeys.TTS_AUDIO}:{digest}"
+
+    async def _get_cached_entry(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Redis entry for a cached synthesis: speech marks plus the S3 key (or inline audio)"""
+        entry = await async_cache.get(cache_key)
+        return entry if isinstance(entry, dict) else None
+
+    async def _load_cached_audio(self, entry: Dict[str, Any]) -> Optional[bytes]:
+        if entry.get("audio_b64"):
+            return base64.b64decode(entry["audio_b64"])
+        if not storage or not entry.get("s3_url"):
+            return None
+        return await asyncio.to_thread(storage.download_file_content, entry["s3_url"])
+
+    async def _store_cached(self, cache_key: str, audio_data: bytes, speech_marks: Optional[List[Dict]]) -> None:
+        """
+        Store the MP3 in S3 (content-addressed key) and the speech marks + S3 URL in Redis.
+        speech_marks is None when the audio was streamed; they are fetched on first use.
+        """
+        entry: Dict[str, Any] = {"speech_marks": speech_marks, "size": len(audio_data)}
+        try:
+            if storage:
+                s3_key = f"tts_cache/{cache_key.rsplit(':', 1)[-1]}.mp3"
+                entry["s3_url"] = await asyncio.to_thread(
+                    storage.upload_file_content, audio_data, s3_key, "audio/mpeg"
+                )
+            elif len(audio_data) <= settings.CACHE_TTS_INLINE_MAX_BYTES:
+                entry["audio_b64"] = base64.b64encode(audio_data).decode("ascii")
+            else:
+                return
+            await async_cache.set(cache_key, entry, settings.CACHE_TTS_TTL)
+        except Exception as e:
+            # Caching is best effort; the caller already has the audio
+            logger.warning(f"Failed to cache synthesized speech: {str(e)}")
+
+    async def _cached_synthesize_with_marks(self, text: str, voice_id: str, language_code: str, pitch: float = 1.0, rate: float = 1.0) -> Tuple[bytes, List[Dict]]:
+        """
+        _aws_polly_synthesize_with_marks behind a content-addressed cache.
+        A hit costs one Redis lookup (plus one S3 read) instead of two Polly calls.
+        """
+        cache_key = self._tts_cache_key(text, voice_id, language_code, pitch, rate)
+        entry = await self._get_cached_entry(cache_key)
+        if entry:
+            audio_data = await self._load_cached_audio(entry)
+            if audio_data:
+                logger.info(f"TTS cache hit: {cache_key}")
+                speech_marks = entry.get("speech_marks")
+                if speech_marks is None:
+                    # Cached by the streaming endpoint, which only requests audio
+                    speech_marks = await self._aws_polly_speech_marks(text, voice_id, language_code, pitch, rate)
+                    await async_cache.set(cache_key, {**entry, "speech_marks": speech_marks}, settings.CACHE_TTS_TTL)
+                return audio_data, speech_marks
+
+        audio_data, speech_marks = await self._aws_polly_synthesize_with_marks(
+            text, voice_id, language_code, pitch, rate
+        )
+        await self._store_cached(cache_key, audio_data, speech_marks)
+        return audio_data, speech_marks
+
+    @staticmethod
+    def _split_text_for_polly(text: str, max_chars: int) -> List[str]:
+        """
+        Split text into chunks of at most max_chars, breaking at sentence ends where possible,
+        then at whitespace, so no word (or escaped SSML entity) is cut in half.
+        """
+        pieces = []
+        for sentence in re.split(r'(?<=[.!?])\s+|\n{2,}', text.strip()):
+            sentence = sentence.strip()
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                pieces.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+            if sentence:
+                pieces.append(sentence)
+
+        chunks = []
+        current = ""
+        for piece in pieces:
+            if current and len(current) + 1 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _synthesize_long_text_with_marks(self, text: str, voice_id: str, language_code: str, pitch: float = 1.0, rate: float = 1.0) -> Tuple[bytes, List[Dict]]:
+        """
+        Synthesize text longer than one Polly request: chunks are synthesized in parallel
+        (bounded by TTS_MAX_PARALLEL_CHUNKS), their MP3 frames concatenated, and each chunk's
+        speech marks shifted by the real duration of the audio before it. The stitched result is
+        cached under the full-text key too, so get_cached_audio_url can presign it.
+        """
+        cache_key = self._tts_cache_key(text, voice_id, language_code, pitch, rate)
+        entry = await self._get_cached_entry(cache_key)
+        if entry and entry.get("speech_marks") is not None:
+            audio_data = await self._load_cached_audio(entry)
+            if audio_data:
+                logger.info(f"TTS cache hit: {cache_key}")
+                return audio_data, entry["speech_marks"]
+
+        chunks = self._split_text_for_polly(text, settings.TTS_CHUNK_MAX_CHARS)
+        semaphore = asyncio.Semaphore(settings.TTS_MAX_PARALLEL_CHUNKS)
+        logger.info(f"Synthesizing long text in {len(chunks)} chunks")
+
+        async def synthesize(chunk: str) -> Tuple[bytes, List[Dict]]:
+            async with semaphore:
+                return await self._cached_synthesize_with_marks(chunk, voice_id, language_code, pitch, rate)
+
+        results = await asyncio.gather(*(synthesize(chunk) for chunk in chunks))
+
+        speech_marks = []
+        offset_ms = 0
+        for chunk_audio, chunk_marks in results:
+            for mark in chunk_marks:
+                speech_marks.append({**mark, 'time': mark.get('time', 0) + offset_ms})
+            offset_ms += int(round(mp3_duration(chunk_audio) * 1000))
+
+        audio_data = concat_mp3([chunk_audio for chunk_audio, _ in results])
+        await self._store_cached(cache_key, audio_data, speech_marks)
+        return audio_data, speech_marks
+
+    async def _astream_chunk_audio(self, text: str, voice_id: str, language_code: str, pitch: float, rate: float) -> AsyncIterator[bytes]:
+        """
+        Stream the MP3 for text of at most one Polly request: from the S3 cache on a hit,
+        otherwise straight from Polly's AudioStream. Audio up to TTS_STREAM_CACHE_MAX_BYTES
+        is cached once the stream completes.
+        """
+        chunk_size = settings.TTS_STREAM_CHUNK_BYTES
+        cache_key = self._tts_cache_key(text, voice_id, language_code, pitch, rate)
+        entry = await self._get_cached_entry(cache_key)
+
+        if entry and entry.get("audio_b64"):
+            yield base64.b64decode(entry["audio_b64"])
+            return
+        if entry and entry.get("s3_url") and storage:
+            logger.info(f"TTS cache hit (streaming): {cache_key}")
+            async for data in iterate_in_thread(lambda: storage.iter_file_content(entry["s3_url"], chunk_size)):
+                yield data
+            return
+
+        ssml_text = self._create_ssml_with_prosody(text, pitch, rate)
+        buffered: List[bytes] = []
+        size = 0
+        async for data in iterate_in_thread(
+            lambda: self._polly_audio_stream(ssml_text, 'ssml', voice_id, language_code, chunk_size)
+        ):
+            size += len(data)
+            if size <= settings.TTS_STREAM_CACHE_MAX_BYTES:
+                buffered.append(data)
+            elif buffered:
+                buffered = []
+            yield data
+
+        if buffered:
+            await self._store_cached(cache_key, b"".join(buffered), entry.get("speech_marks") if entry else None)
+
+    async def astream_speech(self, text: str, lang: str = "en", pitch: float = 1.0, rate: float = 1.0, voice: str = "alloy") -> AsyncIterator[bytes]:
+        """
+        Yield MP3 bytes as they are synthesized, so playback can start before synthesis ends.
+        Long text is streamed chunk by chunk in order; memory per request stays bounded by a
+        few stream chunks (plus the optional cache buffer). Timestamps come from get_speech_timestamps.
+        """
+        if not text or not text.strip():
+            raise ValueError("Text cannot be empty")
+        if not self.aws_ai_service or not self.aws_ai_service.is_available():
+            raise Exception("AWS Polly service is required but not configured")
+
+        polly_voice = self.VOICE_MAPPING.get(voice.lower(), 'Joanna')
+        language_code = self._normalize_language_code(lang)
+        if len(text) > settings.TTS_CHUNK_MAX_CHARS:
+            chunks = self._split_text_for_polly(text, settings.TTS_CHUNK_MAX_CHARS)
+        else:
+            chunks = [text]
+
+        for chunk in chunks:
+            async for data in self._astream_chunk_audio(chunk, polly_voice, language_code, pitch, rate):
+                yield data
+
+    async def get_speech_timestamps(self, text: str, lang: str = "en", pitch: float = 1.0, rate: float = 1.0, voice: str = "alloy") -> Tuple[List[WordTimestamp], float, str]:
+        """
+        Word timestamps for the audio served by astream_speech, without transferring the audio.
+        Returns (timestamps, duration, voice_used).
+        """
+        if len(text) > settings.TTS_CHUNK_MAX_CHARS:
+            # Chunk offsets need each chunk's real audio duration; this also warms the audio cache
+            _, timestamps, duration, polly_voice = await self.synthesize_speech_with_timestamps(text, lang, pitch, rate, voice)
+            return timestamps, duration, polly_voice
+
+        polly_voice = self.VOICE_MAPPING.get(voice.lower(), 'Joanna')
+        language_code = self._normalize_language_code(lang)
+        cache_key = self._tts_cache_key(text, polly_voice, language_code, pitch, rate)
+        entry = await self._get_cached_entry(cache_key)
+        speech_marks = entry.get("speech_marks") if entry else None
+        if speech_marks is None:
+            speech_marks = await self._aws_polly_speech_marks(text, polly_voice, language_code, pitch, rate)
+            if entry:
+                await async_cache.set(cache_key, {**entry, "speech_marks": speech_marks}, settings.CACHE_TTS_TTL)
+
+        timestamps = self._parse_speech_marks_to_timestamps(speech_marks)
+        duration = timestamps[-1].end if timestamps else self._estimate_duration(text, rate)
+        return timestamps, duration, polly_voice
+
+    async def get_cached_audio_url(self, text: str, lang: str = "en", pitch: float = 1.0, rate: float = 1.0, voice: str = "alloy", expires_in: int = 3600) -> Optional[str]:
+        """Presigned URL for already-synthesized audio, or None if it is not cached in S3"""
+        polly_voice = self.VOICE_MAPPING.get(voice.lower(), 'Joanna')
+        cache_key = self._tts_cache_key(text, polly_voice, self._normalize_language_code(lang), pitch, rate)
+        entry = await self._get_cached_entry(cache_key)
+        if not entry or not entry.get("s3_url") or not storage:
+            return None
+        return storage.generate_presigned_url(entry["s3_url"], expires_in=expires_in)
+
     def _create_ssml_with_prosody(self, text: str, pitch: float = 1.0, rate: float = 1.0) -> str:
         """
         Create SSML with prosody controls for pitch and rate
@@ -446,7 +637,8 @@ class TextToSpeechService:
             else:
                 raise Exception(f"Text-to-speech service error: {error_str}")
 
-    def _normalize_language_code(self, lang_code: str) -> str:
+    @classmethod
+    def _normalize_language_code(cls, lang_code: str) -> str:
         if not lang_code:
             return settings.AWS_POLLY_LANGUAGE_CODE
         
@@ -462,7 +654,7 @@ class TextToSpeechService:
             return lang_code
         
         # Map short codes to full AWS Polly language codes
-        return self.LANGUAGE_CODE_MAPPING.get(lang_code.lower(), "en-US")
+        return cls.LANGUAGE_CODE_MAPPING.get(lang_code.lower(), "en-US")
 
     async def _aws_polly_synthesize(self, text: str, voice_id: str = None, language_code: str = None) -> bytes:
         """
@@ -486,3 +678,133 @@ class TextToSpeechService:
         Not supported: Custom voice creation/voice cloning is not available in AWS Polly.
         """
         raise NotImplementedError("Custom voice creation is not supported in AWS Polly.")
+
+
+class PollyVoiceCatalog:
+    """
+    Polly voice catalog, fetched once per language and shared by every request.
+    The describe_voices result is indexed by voice Id and kept in Redis for POLLY_VOICES_TTL
+    (shared by workers and restarts) and in process memory as ready-built VoiceInfo lists.
+    Entries older than POLLY_VOICES_REFRESH_INTERVAL are still served while a background
+    thread refreshes them, so only a cold start ever waits on AWS.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(language_code: Optional[str]) -> str:
+        return f"{CacheKeys.TTS_VOICES}:{language_code or 'all'}"
+
+    @staticmethod
+    def _fetch(language_code: Optional[str]) -> Dict[str, Dict]:
+        """Blocking describe_voices call (all pages), indexed by voice Id"""
+        from app.services.aws_ai_base import aws_clients
+        polly_client = aws_clients.get('polly', settings.AWS_BEDROCK_REGION)
+
+        params = {'LanguageCode': language_code} if language_code else {}
+        voices: Dict[str, Dict] = {}
+        while True:
+            response = polly_client.describe_voices(**params)
+            for voice in response.get('Voices', []):
+                voices[voice['Id']] = voice
+            if not response.get('NextToken'):
+                return voices
+            params['NextToken'] = response['NextToken']
+
+    @staticmethod
+    def _build(polly_voices: Dict[str, Dict]) -> List[VoiceInfo]:
+        """Convert to our VoiceInfo format: mapped names first, then native voices not in the mapping"""
+        voices = []
+        for mapped_name, polly_name in TextToSpeechService.VOICE_MAPPING.items():
+            polly_voice = polly_voices.get(polly_name)
+            if polly_voice:
+                voices.append(VoiceInfo(
+                    id=mapped_name,
+                    name=f"{mapped_name.title()} ({polly_name})",
+                    language=polly_voice.get('LanguageCode', 'en-US'),
+                    gender=polly_voice.get('Gender', 'Unknown'),
+                    engine=polly_voice.get('SupportedEngines', ['standard'])[0],
+                    description=f"Compatible with {mapped_name} - AWS Polly {polly_name} voice"
+                ))
+
+        mapped_ids = set(TextToSpeechService.VOICE_MAPPING.values())
+        for voice_id, polly_voice in polly_voices.items():
+            if voice_id not in mapped_ids:
+                voices.append(VoiceInfo(
+                    id=voice_id.lower(),
+                    name=voice_id,
+                    language=polly_voice.get('LanguageCode', 'en-US'),
+                    gender=polly_voice.get('Gender', 'Unknown'),
+                    engine=polly_voice.get('SupportedEngines', ['standard'])[0],
+                    description="AWS Polly native voice"
+                ))
+        return voices
+
+    def _install(self, language_code: Optional[str], polly_voices: Dict[str, Dict], fetched_at: float) -> List[VoiceInfo]:
+        voices = self._build(polly_voices)
+        self._entries[language_code or ''] = {"voices": voices, "fetched_at": fetched_at}
+        return voices
+
+    def refresh(self, language_code: Optional[str] = None) -> List[VoiceInfo]:
+        """Blocking: fetch the catalog from Polly and update Redis and process memory"""
+        polly_voices = self._fetch(language_code)
+        fetched_at = time.time()
+        cache.set(
+            self._cache_key(language_code),
+            {"voices": polly_voices, "fetched_at": fetched_at},
+            settings.POLLY_VOICES_TTL
+        )
+        logger.info(f"Polly voice catalog refreshed ({language_code or 'all'}): {len(polly_voices)} voices")
+        return self._install(language_code, polly_voices, fetched_at)
+
+    def _load(self, language_code: Optional[str]) -> List[VoiceInfo]:
+        """Cold miss: Redis, then Polly. Serialized so concurrent first requests fetch once"""
+        with self._fetch_lock:
+            entry = self._entries.get(language_code or '')
+            if entry:
+                return entry["voices"]
+            cached = cache.get(self._cache_key(language_code))
+            if isinstance(cached, dict) and cached.get("voices"):
+                return self._install(language_code, cached["voices"], cached.get("fetched_at", 0))
+            return self.refresh(language_code)
+
+    def refresh_in_background(self, language_code: Optional[str] = None, force: bool = True):
+        """
+        Refresh on a daemon thread; at most one refresh per language runs at a time.
+        With force=False only a cold catalog is loaded (used to warm it at startup).
+        """
+        with self._lock:
+            if language_code in self._refreshing:
+                return
+            self._refreshing.add(language_code)
+
+        def run():
+            try:
+                if force:
+                    self.refresh(language_code)
+                else:
+                    self._load(language_code)
+            except Exception as e:
+                logger.warning(f"Background Polly voice refresh failed ({language_code or 'all'}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(language_code)
+
+        threading.Thread(target=run, name="polly-voices-refresh", daemon=True).start()
+
+    async def get_voices(self, language_code: Optional[str] = None) -> List[VoiceInfo]:
+        """Catalog for a language (None = all); a dict lookup on the hot path"""
+        language_code = TextToSpeechService._normalize_language_code(language_code) if language_code else None
+        entry = self._entries.get(language_code or '')
+        if entry is None:
+            return await asyncio.to_thread(self._load, language_code)
+        if time.time() - entry["fetched_at"] > settings.POLLY_VOICES_REFRESH_INTERVAL:
+            self.refresh_in_background(language_code)
+        return entry["voices"]
+
+
+polly_voice_catalog = PollyVoiceCatalog()
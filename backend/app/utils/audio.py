@@ -0,0 +1,65 @@
+"""
+MP3 helpers for stitching synthesized speech chunks
+"""
+from typing import List
+
+# Layer III bitrates in kbps, indexed by the header's bitrate index
+_MPEG1_BITRATES = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0]
+_MPEG2_BITRATES = [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0]
+
+# Sample rates indexed by [version bits][sample rate index]; version bits 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+
+
+def strip_id3(data: bytes) -> bytes:
+    """Remove a leading ID3v2 tag, leaving only MPEG frames"""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        return data[10 + size:]
+    return data
+
+
+def mp3_duration(data: bytes) -> float:
+    """
+    Exact playback duration of an MPEG Layer III stream in seconds, by walking its frame headers.
+    Used to offset word timestamps when chunks are concatenated.
+    """
+    data = strip_id3(data)
+    total_samples = 0
+    sample_rate = 0
+    i = 0
+    while i + 4 <= len(data):
+        if data[i] != 0xFF or (data[i + 1] & 0xE0) != 0xE0:
+            i += 1
+            continue
+
+        version = (data[i + 1] >> 3) & 0x03
+        layer = (data[i + 1] >> 1) & 0x03
+        bitrate_index = (data[i + 2] >> 4) & 0x0F
+        sample_rate_index = (data[i + 2] >> 2) & 0x03
+        padding = (data[i + 2] >> 1) & 0x01
+
+        # Only Layer III (layer bits 01) with valid version, bitrate and sample rate
+        if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+            i += 1
+            continue
+
+        bitrates = _MPEG1_BITRATES if version == 3 else _MPEG2_BITRATES
+        bitrate = bitrates[bitrate_index] * 1000
+        sample_rate = _SAMPLE_RATES[version][sample_rate_index]
+        samples = 1152 if version == 3 else 576
+        frame_length = (samples // 8) * bitrate // sample_rate + padding
+
+        total_samples += samples
+        i += frame_length
+
+    return total_samples / sample_rate if sample_rate else 0.0
+
+
+def concat_mp3(chunks: List[bytes]) -> bytes:
+    """Join MP3 streams with matching encoding by concatenating their frames"""
+    return b"".join(strip_id3(chunk) for chunk in chunks)
@@ -1,21 +1,82 @@
 import json
 import hashlib
 import logging
-from typing import Any, Optional, Union, Dict, List
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Optional, Union, Dict, List, Tuple
 from functools import wraps
 import redis
+import redis.asyncio as aioredis
 from datetime import datetime, timedelta
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+class LocalLRUCache:
+    """Bounded in-process LRU cache with per-entry TTL, holding serialized values"""
+    
+    def __init__(self, max_entries: int, default_ttl: int):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str, ttl: Optional[int] = None):
+        ttl = min(ttl or self.default_ttl, self.default_ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def delete_many(self, keys: List[str]):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    def delete_matching(self, pattern: str):
+        with self._lock:
+            for key in [key for key in self._entries if fnmatchcase(key, pattern)]:
+                del self._entries[key]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
 class RedisCache:
     """Redis cache service for Dropshapes application"""
     
+    # Lifetime of tag index sets; must exceed the TTL of any tagged entry
+    TAG_TTL = 86400
+    
     def __init__(self):
         self.redis_client = None
         self.enabled = settings.CACHE_ENABLED
+        self.local: Optional[LocalLRUCache] = None
+        # Identifies this process on the invalidation channel so it can skip its own messages
+        self.instance_id = uuid.uuid4().hex
+        self.tier_stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
         
         if self.enabled:
             try:
@@ -37,6 +98,61 @@ class RedisCache:
                 logger.warning(f"Redis cache connection failed: {e}. Caching will be disabled.")
                 self.enabled = False
                 self.redis_client = None
+        
+        if self.enabled and settings.CACHE_L1_ENABLED:
+            self.local = LocalLRUCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL)
+            self._start_invalidation_listener()
+    
+    def _use_local(self, key: str) -> bool:
+        """Whether key is held in the in-process L1 tier"""
+        return self.local is not None and key.startswith(tuple(settings.CACHE_L1_PREFIXES))
+    
+    def _publish_invalidation(self, keys: Optional[List[str]] = None, pattern: Optional[str] = None):
+        """Tell other processes to drop their L1 copies of keys (or of everything matching pattern)"""
+        if self.local is None:
+            return
+        try:
+            message = {"origin": self.instance_id, "keys": keys or [], "pattern": pattern}
+            self.redis_client.publish(settings.CACHE_INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.error(f"Error publishing cache invalidation: {e}")
+    
+    def _handle_invalidation(self, data: str):
+        message = json.loads(data)
+        if message.get("origin") == self.instance_id:
+            return
+        if message.get("keys"):
+            self.local.delete_many(message["keys"])
+        if message.get("pattern"):
+            self.local.delete_matching(message["pattern"])
+    
+    def _start_invalidation_listener(self):
+        """Subscribe to the invalidation channel on a daemon thread"""
+        def listen():
+            while True:
+                try:
+                    pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                    while True:
+                        message = pubsub.get_message(timeout=1.0)
+                        if message and message.get("type") == "message":
+                            self._handle_invalidation(message["data"])
+                except Exception as e:
+                    # Messages may have been missed while disconnected, so drop everything local
+                    logger.warning(f"Cache invalidation listener error: {e}. Reconnecting.")
+                    self.local.clear()
+                    time.sleep(1)
+        
+        threading.Thread(target=listen, name="cache-invalidation", daemon=True).start()
+    
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the in-process (L1) and Redis (L2) tiers"""
+        return {
+            "l1_enabled": self.local is not None,
+            "l1_entries": len(self.local) if self.local is not None else 0,
+            "l1_evictions": self.local.evictions if self.local is not None else 0,
+            **self.tier_stats
+        }
     
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """Generate a cache key from prefix and arguments"""
@@ -60,28 +176,56 @@ class RedisCache:
         return key_string
     
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
+        """Get value from cache, checking the in-process tier first"""
         if not self.enabled or not self.redis_client:
             return None
         
+        use_local = self._use_local(key)
+        if use_local:
+            local_value = self.local.get(key)
+            if local_value is not None:
+                self.tier_stats["l1_hits"] += 1
+                return json.loads(local_value)
+            self.tier_stats["l1_misses"] += 1
+        
         try:
             value = self.redis_client.get(key)
             if value:
+                self.tier_stats["l2_hits"] += 1
+                if use_local:
+                    self.local.set(key, value)
                 return json.loads(value)
+            self.tier_stats["l2_misses"] += 1
             return None
         except Exception as e:
             logger.error(f"Error getting cache key {key}: {e}")
             return None
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Set value in cache with optional TTL"""
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with optional TTL, registering the key under each tag"""
         if not self.enabled or not self.redis_client:
             return False
         
         try:
             ttl = ttl or settings.CACHE_DEFAULT_TTL
             serialized_value = json.dumps(value, default=str)
-            return self.redis_client.setex(key, ttl, serialized_value)
+            if not tags:
+                stored = bool(self.redis_client.setex(key, ttl, serialized_value))
+            else:
+                pipe = self.redis_client.pipeline()
+                pipe.setex(key, ttl, serialized_value)
+                for tag in tags:
+                    tag_key = self._tag_key(tag)
+                    pipe.sadd(tag_key, key)
+                    # Fixed horizon so a short-lived entry never shortens the index of longer-lived ones
+                    pipe.expire(tag_key, max(ttl, self.TAG_TTL))
+                stored = bool(pipe.execute()[0])
+            
+            # Publish only after Redis holds the new value so other workers refill from it
+            if stored and self._use_local(key):
+                self.local.set(key, serialized_value, ttl)
+                self._publish_invalidation(keys=[key])
+            return stored
         except Exception as e:
             logger.error(f"Error setting cache key {key}: {e}")
             return False
@@ -91,22 +235,139 @@ class RedisCache:
         if not self.enabled or not self.redis_client:
             return False
         
+        if self.local is not None:
+            self.local.delete_many([key])
+            self._publish_invalidation(keys=[key])
+        
         try:
             return bool(self.redis_client.delete(key))
         except Exception as e:
             logger.error(f"Error deleting cache key {key}: {e}")
             return False
     
-    def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern"""
-        if not self.enabled or not self.redis_client:
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several keys in one round trip; missing keys are omitted from the result"""
+        if not self.enabled or not self.redis_client or not keys:
+            return {}
+        
+        try:
+            results = {}
+            for key, value in zip(keys, self.redis_client.mget(keys)):
+                if value:
+                    results[key] = json.loads(value)
+            return results
+        except Exception as e:
+            logger.error(f"Error getting cache keys {keys}: {e}")
+            return {}
+    
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> bool:
+        """Set several keys with the same TTL and tags in one pipeline"""
+        if not self.enabled or not self.redis_client or not mapping:
+            return False
+        
+        try:
+            ttl = ttl or settings.CACHE_DEFAULT_TTL
+            pipe = self.redis_client.pipeline()
+            for key, value in mapping.items():
+                pipe.setex(key, ttl, json.dumps(value, default=str))
+            for tag in tags or []:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, *mapping.keys())
+                pipe.expire(tag_key, max(ttl, self.TAG_TTL))
+            pipe.execute()
+            
+            local_keys = [key for key in mapping if self._use_local(key)]
+            if local_keys:
+                self.local.delete_many(local_keys)
+                self._publish_invalidation(keys=local_keys)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting cache keys {list(mapping.keys())}: {e}")
+            return False
+    
+    def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys in one round trip"""
+        if not self.enabled or not self.redis_client or not keys:
             return 0
         
+        if self.local is not None:
+            self.local.delete_many(keys)
+            self._publish_invalidation(keys=keys)
+        
         try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                return self.redis_client.delete(*keys)
+            return self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Error deleting cache keys {keys}: {e}")
             return 0
+    
+    def _tag_key(self, tag: str) -> str:
+        """Redis set holding every cache key registered under a tag"""
+        return f"{CacheKeys.TAG}:{tag}"
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key registered under the given tags, plus the tag indexes.
+        Costs O(entries for those tags) and never scans the keyspace.
+        """
+        if not self.enabled or not self.redis_client or not tags:
+            return 0
+        
+        try:
+            tag_keys = [self._tag_key(tag) for tag in tags]
+            pipe = self.redis_client.pipeline()
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = set()
+            for tag_members in pipe.execute():
+                members.update(tag_members)
+            
+            if self.local is not None and members:
+                self.local.delete_many(list(members))
+                self._publish_invalidation(keys=list(members))
+            
+            deleted = self.redis_client.delete(*members) if members else 0
+            self.redis_client.delete(*tag_keys)
+            return deleted
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags {tags}: {e}")
+            return 0
+    
+    def scan_keys(self, pattern: str, limit: Optional[int] = None) -> List[str]:
+        """List keys matching pattern with incremental SCAN instead of blocking KEYS"""
+        if not self.enabled or not self.redis_client:
+            return []
+        
+        keys = []
+        for key in self.redis_client.scan_iter(match=pattern, count=500):
+            keys.append(key)
+            if limit is not None and len(keys) >= limit:
+                break
+        return keys
+    
+    def delete_pattern(self, pattern: str, batch_size: int = 500) -> int:
+        """
+        Delete all keys matching pattern.
+        Walks the keyspace with SCAN, so reserve it for admin-wide purges;
+        per-user and per-entity invalidation should use invalidate_tags.
+        """
+        if not self.enabled or not self.redis_client:
+            return 0
+        
+        if self.local is not None:
+            self.local.delete_matching(pattern)
+            self._publish_invalidation(pattern=pattern)
+        
+        try:
+            deleted = 0
+            batch = []
+            for key in self.redis_client.scan_iter(match=pattern, count=batch_size):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += self.redis_client.delete(*batch)
+                    batch = []
+            if batch:
+                deleted += self.redis_client.delete(*batch)
+            return deleted
         except Exception as e:
             logger.error(f"Error deleting cache pattern {pattern}: {e}")
             return 0
@@ -158,13 +419,196 @@ class RedisCache:
 # Global cache instance
 cache = RedisCache()
 
+class AsyncRedisCache:
+    """
+    asyncio-native counterpart of RedisCache for use inside async endpoints.
+    Shares the sync cache's L1 tier, tag indexes and enabled state, but talks to
+    Redis over a pooled redis.asyncio client so a slow Redis never blocks the event loop.
+    """
+    
+    # Compare-and-delete so a holder whose lock expired cannot release someone else's
+    RELEASE_LOCK_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+    
+    def __init__(self, sync_cache: RedisCache):
+        self.sync_cache = sync_cache
+        self.redis_client = None
+        
+        if sync_cache.enabled:
+            # Connections are opened lazily on the running loop
+            pool = aioredis.ConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.REDIS_DB,
+                password=settings.REDIS_PASSWORD if settings.REDIS_PASSWORD else None,
+                connection_class=aioredis.SSLConnection if settings.REDIS_USE_SSL else aioredis.Connection,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+                retry_on_timeout=True,
+                max_connections=settings.REDIS_ASYNC_MAX_CONNECTIONS
+            )
+            self.redis_client = aioredis.Redis(connection_pool=pool)
+    
+    @property
+    def enabled(self) -> bool:
+        return self.sync_cache.enabled and self.redis_client is not None
+    
+    async def _publish_invalidation(self, keys: List[str]):
+        if self.sync_cache.local is None or not keys:
+            return
+        try:
+            message = {"origin": self.sync_cache.instance_id, "keys": keys, "pattern": None}
+            await self.redis_client.publish(settings.CACHE_INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.error(f"Error publishing cache invalidation: {e}")
+    
+    async def get(self, key: str) -> Optional[Any]:
+        """Get value from cache, checking the in-process tier first"""
+        return (await self.get_many([key])).get(key)
+    
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several keys with one MGET; missing keys are omitted from the result"""
+        if not self.enabled or not keys:
+            return {}
+        
+        local = self.sync_cache.local
+        stats = self.sync_cache.tier_stats
+        results = {}
+        remote_keys = []
+        for key in keys:
+            if self.sync_cache._use_local(key):
+                local_value = local.get(key)
+                if local_value is not None:
+                    stats["l1_hits"] += 1
+                    results[key] = json.loads(local_value)
+                    continue
+                stats["l1_misses"] += 1
+            remote_keys.append(key)
+        
+        if not remote_keys:
+            return results
+        
+        try:
+            for key, value in zip(remote_keys, await self.redis_client.mget(remote_keys)):
+                if value:
+                    stats["l2_hits"] += 1
+                    if self.sync_cache._use_local(key):
+                        local.set(key, value)
+                    results[key] = json.loads(value)
+                else:
+                    stats["l2_misses"] += 1
+        except Exception as e:
+            logger.error(f"Error getting cache keys {remote_keys}: {e}")
+        return results
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> bool:
+        """Set value in cache with optional TTL, registering the key under each tag"""
+        return await self.set_many({key: value}, ttl, tags)
+    
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None, tags: Optional[List[str]] = None) -> bool:
+        """Set several keys with the same TTL and tags in one pipeline"""
+        if not self.enabled or not mapping:
+            return False
+        
+        try:
+            ttl = ttl or settings.CACHE_DEFAULT_TTL
+            serialized = {key: json.dumps(value, default=str) for key, value in mapping.items()}
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, serialized_value in serialized.items():
+                    pipe.setex(key, ttl, serialized_value)
+                for tag in tags or []:
+                    tag_key = self.sync_cache._tag_key(tag)
+                    pipe.sadd(tag_key, *serialized.keys())
+                    pipe.expire(tag_key, max(ttl, RedisCache.TAG_TTL))
+                await pipe.execute()
+            
+            # Same as RedisCache.set_many: drop L1 copies everywhere and let the next read refill them
+            local_keys = [key for key in serialized if self.sync_cache._use_local(key)]
+            if local_keys:
+                self.sync_cache.local.delete_many(local_keys)
+                await self._publish_invalidation(local_keys)
+            return True
+        except Exception as e:
+            logger.error(f"Error setting cache keys {list(mapping.keys())}: {e}")
+            return False
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from cache"""
+        return bool(await self.delete_many([key]))
+    
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys in one round trip"""
+        if not self.enabled or not keys:
+            return 0
+        
+        if self.sync_cache.local is not None:
+            self.sync_cache.local.delete_many(keys)
+            await self._publish_invalidation(keys)
+        
+        try:
+            return await self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Error deleting cache keys {keys}: {e}")
+            return 0
+    
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Delete every key registered under the given tags, plus the tag indexes"""
+        if not self.enabled or not tags:
+            return 0
+        
+        try:
+            tag_keys = [self.sync_cache._tag_key(tag) for tag in tags]
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                tag_members = await pipe.execute()
+            members = list(set().union(*tag_members))
+            
+            deleted = await self.delete_many(members) if members else 0
+            await self.redis_client.delete(*tag_keys)
+            return deleted
+        except Exception as e:
+            logger.error(f"Error invalidating cache tags {tags}: {e}")
+            return 0
+    
+    async def acquire_lock(self, name: str, ttl: int) -> Optional[str]:
+        """
+        Try to take a short-lived distributed lock.
+        Returns a release token, or None if another holder has it. When Redis is
+        unavailable the lock is treated as acquired so callers still make progress.
+        """
+        token = uuid.uuid4().hex
+        if not self.enabled:
+            return token
+        
+        try:
+            acquired = await self.redis_client.set(f"{CacheKeys.LOCK}:{name}", token, nx=True, ex=ttl)
+            return token if acquired else None
+        except Exception as e:
+            logger.error(f"Error acquiring lock {name}: {e}")
+            return token
+    
+    async def release_lock(self, name: str, token: str) -> bool:
+        """Release a lock taken with acquire_lock, only if it is still ours"""
+        if not self.enabled:
+            return False
+        
+        try:
+            return bool(await self.redis_client.eval(self.RELEASE_LOCK_SCRIPT, 1, f"{CacheKeys.LOCK}:{name}", token))
+        except Exception as e:
+            logger.error(f"Error releasing lock {name}: {e}")
+            return False
+
+# Global asyncio cache instance, for use from async def code paths
+async_cache = AsyncRedisCache(cache)
+
 # Cache decorators
 def cached(prefix: str, ttl: Optional[int] = None, key_func=None):
     """Decorator to cache function results"""
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            if not cache.enabled:
+            if not async_cache.enabled:
                 return await func(*args, **kwargs)
             
             # Generate cache key
@@ -173,15 +617,15 @@ def cached(prefix: str, ttl: Optional[int] = None, key_func=None):
             else:
                 cache_key = cache._generate_key(prefix, *args, **kwargs)
             
-            # Try to get from cache
-            cached_result = cache.get(cache_key)
+            # Try to get from cache without blocking the event loop
+            cached_result = await async_cache.get(cache_key)
             if cached_result is not None:
                 logger.debug(f"Cache hit for key: {cache_key}")
                 return cached_result
             
             # Execute function and cache result
             result = await func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
+            await async_cache.set(cache_key, result, ttl)
             logger.debug(f"Cache miss for key: {cache_key}, stored result")
             
             return result
@@ -230,10 +674,44 @@ class CacheKeys:
     GRAMMAR_CHECK = "grammar:check"
     PDF_ANALYSIS = "pdf:analysis"
     TTS_AUDIO = "tts:audio"
+    TTS_VOICES = "tts:voices"
+    ADMIN_DASHBOARD = "admin:dashboard"
+    AUTH_PRINCIPAL = "auth:principal"
+    AUTH_REVOKED = "auth:revoked"
+    AUTH_LOGINS = "auth:logins"
     DISCUSSION = "discussion"
     RESOURCE = "resource"
     MODULE = "module"
     UNIT = "unit"
+    TAG = "tag"
+    LOCK = "lock"
+
+class CacheTags:
+    """Invalidation tags; each tag indexes the cache keys that depend on one owner or entity"""
+    
+    @staticmethod
+    def user(user_id: int) -> str:
+        return f"user:{user_id}"
+    
+    @staticmethod
+    def resume(resume_id: int) -> str:
+        return f"{CacheKeys.RESUME}:{resume_id}"
+    
+    @staticmethod
+    def resume_list(user_id: int) -> str:
+        return f"{CacheKeys.RESUME}:user:{user_id}:list"
+    
+    @staticmethod
+    def cover_letter(cover_letter_id: int) -> str:
+        return f"{CacheKeys.COVER_LETTER}:{cover_letter_id}"
+    
+    @staticmethod
+    def modules() -> str:
+        return CacheKeys.MODULE
+    
+    @staticmethod
+    def course_units() -> str:
+        return CacheKeys.UNIT
 
 def cache_user_profile(user_id: int, ttl: Optional[int] = None):
     """Cache user profile data"""
@@ -294,50 +772,44 @@ def cache_tts_audio(text_hash: str, voice_id: str, ttl: Optional[int] = None):
 # Utility functions for cache management
 def clear_user_cache(user_id: int):
     """Clear all cache entries for a specific user"""
-    patterns = [
-        f"{CacheKeys.USER_PROFILE}:{user_id}",
-        f"{CacheKeys.USER_SUBSCRIPTION}:{user_id}",
-        f"{CacheKeys.RESUME}:*:user:{user_id}",
-        f"{CacheKeys.COVER_LETTER}:*:user:{user_id}"
-    ]
-    
     total_deleted = 0
-    for pattern in patterns:
-        total_deleted += cache.delete_pattern(pattern)
+    total_deleted += int(cache.delete(f"{CacheKeys.USER_PROFILE}:{user_id}"))
+    total_deleted += int(cache.delete(f"{CacheKeys.USER_SUBSCRIPTION}:{user_id}"))
+    total_deleted += cache.invalidate_tags(CacheTags.user(user_id), CacheTags.resume_list(user_id))
     
     logger.info(f"Cleared {total_deleted} cache entries for user {user_id}")
     return total_deleted
 
+def clear_user_resume_list_cache(user_id: int):
+    """Clear the cached resume list pages for a user"""
+    return cache.invalidate_tags(CacheTags.resume_list(user_id))
+
 def clear_resume_cache(resume_id: int):
     """Clear cache for a specific resume"""
-    patterns = [
-        f"{CacheKeys.RESUME}:{resume_id}",
-        f"{CacheKeys.RESUME}:{resume_id}:*"
-    ]
-    
-    total_deleted = 0
-    for pattern in patterns:
-        total_deleted += cache.delete_pattern(pattern)
+    total_deleted = int(cache.delete(f"{CacheKeys.RESUME}:{resume_id}"))
+    total_deleted += cache.invalidate_tags(CacheTags.resume(resume_id))
     
     logger.info(f"Cleared {total_deleted} cache entries for resume {resume_id}")
     return total_deleted
 
 def clear_cover_letter_cache(cover_letter_id: int):
     """Clear cache for a specific cover letter"""
-    patterns = [
-        f"{CacheKeys.COVER_LETTER}:{cover_letter_id}",
-        f"{CacheKeys.COVER_LETTER}:{cover_letter_id}:*"
-    ]
-    
-    total_deleted = 0
-    for pattern in patterns:
-        total_deleted += cache.delete_pattern(pattern)
+    total_deleted = int(cache.delete(f"{CacheKeys.COVER_LETTER}:{cover_letter_id}"))
+    total_deleted += cache.invalidate_tags(CacheTags.cover_letter(cover_letter_id))
     
     logger.info(f"Cleared {total_deleted} cache entries for cover letter {cover_letter_id}")
     return total_deleted
 
+def clear_module_cache():
+    """Clear the cached module catalog"""
+    return cache.invalidate_tags(CacheTags.modules())
+
+def clear_course_unit_cache():
+    """Clear the cached course unit catalog"""
+    return cache.invalidate_tags(CacheTags.course_units())
+
 def clear_ai_cache():
-    """Clear all AI-related cache"""
+    """Clear all AI-related cache (admin-wide purge, uses SCAN)"""
     patterns = [
         f"{CacheKeys.AI_RESPONSE}:*",
         f"{CacheKeys.GRAMMAR_CHECK}:*",
@@ -367,7 +839,8 @@ def get_cache_stats() -> Dict[str, Any]:
             "total_commands_processed": info.get("total_commands_processed", 0),
             "keyspace_hits": info.get("keyspace_hits", 0),
             "keyspace_misses": info.get("keyspace_misses", 0),
-            "uptime_in_seconds": info.get("uptime_in_seconds", 0)
+            "uptime_in_seconds": info.get("uptime_in_seconds", 0),
+            "tiers": cache.get_tier_stats()
         }
     except Exception as e:
         logger.error(f"Error getting cache stats: {e}")
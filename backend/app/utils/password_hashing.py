@@ -0,0 +1,39 @@
+"""
+bcrypt work run inside the password hashing worker processes.
+
+Kept free of app settings, database and Redis imports so that spawning a worker only
+loads passlib; the cost factor is passed in with every call.
+"""
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.utils.warnings import with_suppressed_warnings
+
+_contexts: Dict[int, CryptContext] = {}
+
+
+def _context(rounds: int) -> CryptContext:
+    context = _contexts.get(rounds)
+    if context is None:
+        context = CryptContext(
+            schemes=["bcrypt"],
+            bcrypt__default_rounds=rounds,
+            # Hashes made with any other cost are reported as needing an update
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+            deprecated="auto"
+        )
+        _contexts[rounds] = context
+    return context
+
+
+@with_suppressed_warnings
+def hash_password(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+@with_suppressed_warnings
+def verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    """(matches, new hash) - new hash is set when the stored one uses a different cost"""
+    return _context(rounds).verify_and_update(password, hashed_password)
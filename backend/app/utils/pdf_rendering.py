@@ -0,0 +1,259 @@
+"""
+ReportLab resume rendering, run inside the PDF render worker processes.
+
+Style sheets and font metrics are built once per worker (see init_worker) and reused by
+every render; each PDF is written to an in-memory buffer and returned as bytes.
+Imports only ReportLab, so spawning a worker stays cheap.
+
+Benchmark (PDFs per second, in one process and across a pool):
+    python -m app.utils.pdf_rendering --count 200 --workers 4
+"""
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+# Standard fonts used by the styles below
+FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique")
+
+_styles: Optional[StyleSheet1] = None
+
+
+def _build_styles() -> StyleSheet1:
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        textColor=colors.darkblue,
+        alignment=TA_CENTER,
+        spaceAfter=12
+    ))
+    styles.add(ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.darkblue,
+        spaceBefore=12,
+        spaceAfter=6
+    ))
+    styles.add(ParagraphStyle(
+        'Contact',
+        parent=styles['Normal'],
+        alignment=TA_CENTER,
+        spaceAfter=12
+    ))
+    return styles
+
+
+def get_styles() -> StyleSheet1:
+    global _styles
+    if _styles is None:
+        _styles = _build_styles()
+    return _styles
+
+
+def init_worker():
+    """Pool initializer: build the style sheet and load font metrics before the first render"""
+    get_styles()
+    for font in FONTS:
+        pdfmetrics.getFont(font)
+
+
+def render_resume_pdf(content: Dict[str, Any]) -> bytes:
+    """Render structured resume content (see PDFService._parse_content) to PDF bytes"""
+    styles = get_styles()
+    title_style = styles['CustomTitle']
+    heading_style = styles['CustomHeading']
+    normal_style = styles['Normal']
+    story = []
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=72)
+
+    # Add personal info
+    personal_info = content.get('personal_info', {})
+    name = personal_info.get('name', 'Resume')
+    story.append(Paragraph(name, title_style))
+
+    # Contact information
+    contact_info = []
+    if personal_info.get('email'):
+        contact_info.append(personal_info['email'])
+    if personal_info.get('phone'):
+        contact_info.append(personal_info['phone'])
+    if personal_info.get('address'):
+        contact_info.append(personal_info['address'])
+
+    if contact_info:
+        story.append(Paragraph(' | '.join(contact_info), styles['Contact']))
+
+    story.append(Spacer(1, 12))
+
+    # Professional Summary
+    summary = content.get('professional_summary', '')
+    if summary:
+        story.append(Paragraph('Professional Summary', heading_style))
+        story.append(Paragraph(summary, normal_style))
+        story.append(Spacer(1, 12))
+
+    # Work Experience
+    work_experience = content.get('work_experience', [])
+    if work_experience:
+        story.append(Paragraph('Work Experience', heading_style))
+        for exp in work_experience:
+            if isinstance(exp, dict):
+                # Job title and company
+                job_title = f"<b>{exp.get('position', 'Position')}</b> at {exp.get('company', 'Company')}"
+                story.append(Paragraph(job_title, normal_style))
+
+                # Duration and location
+                duration = exp.get('duration', '')
+                location = exp.get('location', '')
+                if duration or location:
+                    duration_text = f"{duration}"
+                    if location:
+                        duration_text += f" | {location}"
+                    story.append(Paragraph(duration_text, normal_style))
+
+                # Responsibilities
+                responsibilities = exp.get('responsibilities', [])
+                if responsibilities:
+                    if isinstance(responsibilities, list):
+                        for resp in responsibilities:
+                            story.append(Paragraph(f"• {resp}", normal_style))
+                    else:
+                        story.append(Paragraph(f"• {responsibilities}", normal_style))
+
+                story.append(Spacer(1, 8))
+
+    # Education
+    education = content.get('education', [])
+    if education:
+        story.append(Paragraph('Education', heading_style))
+        for edu in education:
+            if isinstance(edu, dict):
+                degree_text = f"<b>{edu.get('degree', 'Degree')}</b> in {edu.get('field', 'Field')}"
+                story.append(Paragraph(degree_text, normal_style))
+                institution = edu.get('institution', 'Institution')
+                year = edu.get('year', '')
+                if year:
+                    institution += f" | {year}"
+                story.append(Paragraph(institution, normal_style))
+                story.append(Spacer(1, 8))
+
+    # Skills
+    skills = content.get('skills', [])
+    if skills:
+        story.append(Paragraph('Skills', heading_style))
+        if isinstance(skills, list):
+            skills_text = ', '.join(skills)
+        else:
+            skills_text = str(skills)
+        story.append(Paragraph(skills_text, normal_style))
+        story.append(Spacer(1, 8))
+
+    # Certifications
+    certifications = content.get('certifications', [])
+    if certifications:
+        story.append(Paragraph('Certifications', heading_style))
+        for cert in certifications:
+            if isinstance(cert, dict):
+                cert_text = f"<b>{cert.get('name', 'Certification')}</b>"
+                issuer = cert.get('issuer', cert.get('organization', ''))
+                year = cert.get('year', cert.get('endDate', ''))
+                if issuer:
+                    cert_text += f" - {issuer}"
+                if year:
+                    cert_text += f" ({year})"
+                story.append(Paragraph(cert_text, normal_style))
+            elif isinstance(cert, str):
+                story.append(Paragraph(cert, normal_style))
+            story.append(Spacer(1, 4))
+
+    # Additional content if available
+    if content.get('generated_content'):
+        story.append(Paragraph('Additional Information', heading_style))
+        story.append(Paragraph(content['generated_content'], normal_style))
+
+    # Build PDF
+    doc.build(story)
+    return buffer.getvalue()
+
+
+SAMPLE_RESUME = {
+    "personal_info": {
+        "name": "Jordan Example",
+        "email": "jordan@example.com",
+        "phone": "+1 555 0100",
+        "address": "Austin, TX"
+    },
+    "professional_summary": "Backend engineer with eight years of experience building APIs, "
+                            "data pipelines and internal tooling for growing product teams.",
+    "work_experience": [
+        {
+            "company": f"Company {i}",
+            "position": "Senior Software Engineer",
+            "duration": f"{2016 + i} - {2017 + i}",
+            "responsibilities": [
+                "Designed and shipped a service handling 2,000 requests per second",
+                "Cut p95 latency by 40% by reworking the caching layer",
+                "Mentored four engineers and led the on-call rotation"
+            ]
+        }
+        for i in range(4)
+    ],
+    "education": [
+        {"institution": "State University", "degree": "B.Sc.", "field": "Computer Science", "year": "2015"}
+    ],
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Redis", "AWS", "Docker"],
+    "certifications": [
+        {"name": "AWS Certified Developer", "issuer": "Amazon Web Services", "year": "2021"}
+    ]
+}
+
+
+def benchmark(count: int, workers: int) -> Dict[str, float]:
+    """Render `count` sample resumes in this process, then across `workers` processes"""
+    init_worker()
+    render_resume_pdf(SAMPLE_RESUME)
+
+    started = time.perf_counter()
+    for _ in range(count):
+        render_resume_pdf(SAMPLE_RESUME)
+    single_rate = count / (time.perf_counter() - started)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        # Start every worker before timing
+        list(executor.map(render_resume_pdf, [SAMPLE_RESUME] * workers))
+        started = time.perf_counter()
+        list(executor.map(render_resume_pdf, [SAMPLE_RESUME] * count, chunksize=4))
+        pool_rate = count / (time.perf_counter() - started)
+
+    return {
+        "pdf_bytes": len(render_resume_pdf(SAMPLE_RESUME)),
+        "single_process_pdfs_per_second": round(single_rate, 1),
+        "pool_workers": workers,
+        "pool_pdfs_per_second": round(pool_rate, 1),
+        "pool_pdfs_per_second_per_core": round(pool_rate / workers, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark resume PDF rendering")
+    parser.add_argument("--count", type=int, default=200, help="PDFs to render per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size for the parallel run")
+    args = parser.parse_args()
+    for name, value in benchmark(args.count, args.workers).items():
+        print(f"{name}: {value}")
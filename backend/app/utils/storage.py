@@ -2,7 +2,8 @@ import os
 import uuid
 import boto3
 from fastapi import UploadFile, HTTPException
-from typing import Optional
+from typing import Iterator, Optional
+from boto3.exceptions import S3UploadFailedError
 from botocore.exceptions import ClientError
 
 from app.core.config import settings
@@ -94,6 +95,22 @@ class S3Storage:
             print(f"Access Key ID: {settings.AWS_ACCESS_KEY_ID[:5]}...")  # Only print first 5 chars for security
             raise HTTPException(status_code=500, detail="Failed to upload file")
 
+    def upload_fileobj(self, file_obj, key: str, content_type: str = "application/pdf") -> str:
+        """Stream a file-like object to S3 (multipart for large bodies) and return the URL"""
+        try:
+            self.s3_client.upload_fileobj(
+                file_obj,
+                self.bucket_name,
+                key,
+                ExtraArgs={"ContentType": content_type},
+            )
+            url = f"https://{self.bucket_name}.s3.{settings.AWS_S3_REGION}.amazonaws.com/{key}"
+            return url
+        except (ClientError, S3UploadFailedError) as e:
+            print(f"Error uploading to S3: {e}")
+            print(f"Using bucket: {self.bucket_name}, region: {settings.AWS_S3_REGION}")
+            raise HTTPException(status_code=500, detail="Failed to upload file")
+
     def delete_file(self, file_url: str) -> bool:
         """Delete a file from S3"""
         try:
@@ -109,6 +126,30 @@ class S3Storage:
             print(f"Error deleting from S3: {e}")
             return False
 
+    def download_file_content(self, file_url: str) -> Optional[bytes]:
+        """Read an object from our bucket by URL. Returns None if not our S3 URL or on error."""
+        key = _s3_key_from_url(file_url)
+        if not key:
+            return None
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+            return response["Body"].read()
+        except ClientError as e:
+            print(f"Error downloading from S3: {e}")
+            return None
+
+    def iter_file_content(self, file_url: str, chunk_size: int = 16384) -> Iterator[bytes]:
+        """Stream an object from our bucket by URL in chunks, without loading it into memory"""
+        key = _s3_key_from_url(file_url)
+        if not key:
+            raise ValueError(f"Not a URL in bucket {self.bucket_name}: {file_url}")
+        body = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)["Body"]
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
     def generate_presigned_url(self, file_url: str, expires_in: int = 3600) -> Optional[str]:
         """Generate a presigned GET URL for private S3 object. Returns None if URL is not our S3 URL."""
         key = _s3_key_from_url(file_url)
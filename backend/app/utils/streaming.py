@@ -0,0 +1,174 @@
+import asyncio
+import concurrent.futures
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Headers for server-sent event responses; X-Accel-Buffering stops nginx from buffering the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
+# Sentinel pushed by the pump thread when the iterator is exhausted
+_ITER_END = object()
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format a single server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def iterate_in_thread(make_iterator: Callable[[], Iterator[Any]], max_buffered: int = 4) -> AsyncIterator[Any]:
+    """
+    Drain a blocking iterator (e.g. a boto3 StreamingBody) on a worker thread.
+    At most max_buffered items wait in memory: the thread blocks until the consumer
+    catches up, so a slow client never makes the server buffer the whole stream.
+    Stopping early (client disconnected) closes the underlying iterator.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:
+            # Event loop already closed
+            return False
+        while True:
+            try:
+                future.result(timeout=0.5)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stop.is_set():
+                    future.cancel()
+                    return False
+
+    def pump():
+        iterator = None
+        try:
+            iterator = make_iterator()
+            for item in iterator:
+                if stop.is_set() or not put((item, None)):
+                    return
+            put((_ITER_END, None))
+        except Exception as e:
+            put((_ITER_END, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close:
+                close()
+
+    loop.run_in_executor(None, pump)
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _ITER_END:
+                if error is not None:
+                    raise error
+                break
+            yield item
+    finally:
+        stop.set()
+
+
+class IncrementalJSONObjectParser:
+    """
+    Incremental parser for a JSON object that arrives in chunks.
+    feed() returns each top-level (key, value) pair as soon as its value closes,
+    so callers can act on finished sections before the whole object has arrived.
+    Text before the opening brace (e.g. a markdown fence) is ignored.
+    """
+
+    def __init__(self, fixer: Optional[Callable[[str], str]] = None):
+        self.fixer = fixer
+        self.finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member: List[str] = []
+        self._seen_colon = False
+        self._emitted = False
+
+    def _reset_member(self):
+        self._member = []
+        self._seen_colon = False
+        self._emitted = False
+
+    def _emit(self, completed: List[Tuple[str, Any]]):
+        """Parse the current top-level member and append it to completed"""
+        if self._emitted or not self._seen_colon:
+            return
+
+        member_text = "{" + "".join(self._member).strip() + "}"
+        try:
+            parsed = json.loads(member_text, strict=False)
+        except ValueError:
+            if not self.fixer:
+                return
+            try:
+                parsed = json.loads(self.fixer(member_text), strict=False)
+            except ValueError:
+                # Leave it to the final full-document parse
+                logger.debug(f"Could not parse streamed member: {member_text[:100]}")
+                return
+
+        if isinstance(parsed, dict):
+            completed.extend(parsed.items())
+            self._emitted = True
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk of text and return the top-level members it completed"""
+        completed: List[Tuple[str, Any]] = []
+
+        for char in chunk:
+            if self.finished:
+                break
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    # A string value directly under the root is complete once its quote closes
+                    if self._depth == 1 and self._seen_colon:
+                        self._emit(completed)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._member.append(char)
+            elif char in "{[":
+                self._depth += 1
+                self._member.append(char)
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(completed)
+                    self.finished = True
+                else:
+                    self._member.append(char)
+                    if self._depth == 1:
+                        self._emit(completed)
+            elif char == "," and self._depth == 1:
+                self._emit(completed)
+                self._reset_member()
+            else:
+                if char == ":" and self._depth == 1:
+                    self._seen_colon = True
+                self._member.append(char)
+
+        return completed
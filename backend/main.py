@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from fastapi.openapi.utils import get_openapi
 from datetime import datetime
+import asyncio
 
 from app.api.api import api_router
 from app.core.config import settings
@@ -126,6 +127,18 @@ async def startup_db_client():
         print("Database tables created successfully")
     except Exception as e:
         print(f"Error initializing database: {e}")
+    
+    if settings.BEDROCK_PROBE_ON_STARTUP and settings.USE_AWS_AI:
+        from app.services.aws_ai_base import AWSBaseAIService
+        AWSBaseAIService().start_background_probe()
+    
+    if settings.USE_AWS_AI:
+        from app.services.text_to_speech_service import polly_voice_catalog
+        polly_voice_catalog.refresh_in_background(force=False)
+    
+    if settings.ADMIN_ROLLUP_SCHEDULER_ENABLED:
+        from app.services.admin_rollup_service import run_rollup_scheduler
+        app.state.admin_rollup_task = asyncio.create_task(run_rollup_scheduler())
 
 # Custom Swagger UI
 @app.get("/docs", include_in_schema=False)